@@ -2,10 +2,28 @@
 AI Agent models for Nora - Persistent conversation context
 """
 
+from contextlib import contextmanager
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import User
 from apps.core.models import BaseModel
 
+# Contexts are cached between requests only when the cache is shared by all
+# workers; a per-process cache would serve other workers' stale writes
+NORA_CONTEXT_CACHE_TIMEOUT = 300  # 5 minutes
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def shared_cache_configured() -> bool:
+    """True if the default cache is shared across worker processes"""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    return backend not in PROCESS_LOCAL_CACHE_BACKENDS
+
 
 class NoraContext(BaseModel):
     """
@@ -118,6 +136,69 @@ class NoraContext(BaseModel):
     def __str__(self):
         return f"Nora Context: {self.user.email} @ {self.organization.name}"
 
+    @staticmethod
+    def cache_key(user_id, organization_id) -> str:
+        return f"noractx:{user_id}:{organization_id}"
+
+    @classmethod
+    def get_cached(cls, user: User, organization) -> "NoraContext":
+        """
+        Get or create the context for user + organization, from cache if possible.
+
+        Saves write through to the cache, so a hit is as fresh as the last
+        save. Falls back to get_or_create when no shared cache is configured.
+        """
+        if not shared_cache_configured():
+            return cls.objects.get_or_create(user=user, organization=organization)[0]
+
+        key = cls.cache_key(user.pk, organization.pk)
+        context = cache.get(key)
+
+        if context is None:
+            context, _ = cls.objects.get_or_create(user=user, organization=organization)
+            cache.set(key, context, NORA_CONTEXT_CACHE_TIMEOUT)
+
+        return context
+
+    def save(self, *args, **kwargs):
+        """Save, or only mark the context dirty inside batch_saves()"""
+        if getattr(self, "_batching_saves", False):
+            self._save_pending = True
+            return
+
+        super().save(*args, **kwargs)
+
+        if shared_cache_configured():
+            cache.set(
+                self.cache_key(self.user_id, self.organization_id), self, NORA_CONTEXT_CACHE_TIMEOUT
+            )
+
+    def delete(self, *args, **kwargs):
+        cache.delete(self.cache_key(self.user_id, self.organization_id))
+        return super().delete(*args, **kwargs)
+
+    @contextmanager
+    def batch_saves(self):
+        """
+        Collapse every save() inside the block into one UPDATE on exit.
+
+        A message turn touches the context several times (add_message,
+        update_task_state, save); this writes it once, even if the turn
+        raises. Nested blocks defer to the outermost one.
+        """
+        if getattr(self, "_batching_saves", False):
+            yield self
+            return
+
+        self._batching_saves = True
+        self._save_pending = False
+        try:
+            yield self
+        finally:
+            self._batching_saves = False
+            if self._save_pending:
+                self.save()
+
     def add_message(self, role: str, content: str):
         """Add message to conversation history"""
         from django.utils import timezone
@@ -140,6 +221,10 @@ class NoraContext(BaseModel):
         self.last_interaction_at = timezone.now()
         self.save()
 
+    async def aadd_message(self, role: str, content: str):
+        """Async add_message (runs the save in Django's sync thread)"""
+        await sync_to_async(self.add_message)(role=role, content=content)
+
     def add_action(self, action: str, details: dict):
         """Add action to recent actions (keep last 10)"""
         from django.utils import timezone
@@ -171,16 +256,17 @@ class NoraContext(BaseModel):
         self.save()
 
     def complete_task(self):
-        """Mark current task as complete"""
-        if self.active_task:
-            self.add_action(
-                action=f"completed_{self.active_task}",
-                details=self.task_state
-            )
+        """Mark current task as complete (one UPDATE, including the action log)"""
+        with self.batch_saves():
+            if self.active_task:
+                self.add_action(
+                    action=f"completed_{self.active_task}",
+                    details=self.task_state
+                )
 
-        self.active_task = None
-        self.task_state = {}
-        self.save()
+            self.active_task = None
+            self.task_state = {}
+            self.save()
 
     def get_recent_conversation(self, limit: int = 10) -> list:
         """Get recent conversation messages"""
@@ -57,6 +57,21 @@ class OnboardingEngine:
         ],
     }
 
+    # Question Nora asks for each required field
+    FIELD_QUESTIONS = {
+        "hotel_name": "What's your hotel called?",
+        "city": "Which city is your hotel in?",
+        "country": "Which country is your hotel in?",
+        "contact_email": "What's your email address?",
+        "room_types": "How many different types of rooms do you have?",
+        "deposit_amount": "What's your payment policy? (e.g., 50% deposit at booking)",
+        "deposit_timing": "When is the deposit due? (e.g., at booking)",
+        "cancellation_policy": "What's your cancellation policy?",
+        "checkin_time": "What time is check-in?",
+        "checkout_time": "What time is check-out?",
+        "review_confirmed": "Does everything in the preview look right?",
+    }
+
     # Progress percentages for each state
     STATE_PROGRESS = {
         OnboardingState.HOTEL_BASICS: 0,
@@ -248,6 +263,18 @@ class OnboardingEngine:
 
         return missing
 
+    def get_next_question_text(self) -> Optional[str]:
+        """
+        Get the question for the first missing field of the current state.
+
+        Returns:
+            Question text, or None if nothing is missing
+        """
+        for field in self.get_missing_fields():
+            if field in self.FIELD_QUESTIONS:
+                return self.FIELD_QUESTIONS[field]
+        return None
+
     def update_field(self, field: str, value) -> bool:
         """
         Update a field in task_state.
@@ -264,6 +291,22 @@ class OnboardingEngine:
 
         return self.is_state_complete(self.current_state)
 
+    def update_fields(self, fields: Dict) -> bool:
+        """
+        Update several task_state fields at once.
+
+        Args:
+            fields: Field name -> new value
+
+        Returns:
+            True if the current state is complete afterwards
+        """
+        if fields:
+            self.task_state.update(fields)
+            self.task_state["last_update_at"] = timezone.now().isoformat()
+
+        return self.is_state_complete(self.current_state)
+
     def get_state_summary(self) -> Dict:
         """
         Get summary of current onboarding status.
@@ -2,7 +2,7 @@
 Data Extractor - Website Scraping and Data Extraction
 
 Extracts hotel information from user's own website using:
-1. BeautifulSoup for HTML parsing
+1. lxml for HTML parsing
 2. GPT-4o for intelligent data extraction and cleanup
 3. Smart defaults based on location data
 
@@ -10,16 +10,230 @@ IMPORTANT: Only scrapes user's own website (ethical boundary)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import json
 import logging
-from bs4 import BeautifulSoup
-from typing import Dict, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+from lxml import etree
+from typing import Dict, List, Optional
 import re
-from urllib.parse import urlparse
+from urllib.parse import urldefrag, urljoin, urlparse
 
 from .openai_config import get_openai_client, GPT4O_CONFIG
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Parses straight into lxml's C tree; comments are dropped while parsing.
+# Bytes input (see extract_clean_text) lets pages with an XML encoding
+# declaration parse too.
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+# Tags whose content is never readable page text
+NON_CONTENT_TAGS = ('script', 'style', 'meta', 'link', 'noscript')
+
+MAX_TEXT_CHARS = 8000  # keep the GPT-4o prompt well under token limits
+
+# Sub-pages that usually hold what a homepage lacks (contact details,
+# address, room types), matched against link paths and link text
+SUBPAGE_PATTERN = re.compile(
+    r'about|contact|room|suite|accommodation|location|directions|find[- ]us',
+    re.IGNORECASE
+)
+MAX_SUBPAGES = 3
+SUBPAGE_TIMEOUT = 5  # seconds; a slow sub-page shouldn't hold up extraction
+
+# Shared HTTP session (created lazily, see get_http_session)
+http_session = None
+
+# Fetches sub-pages of one site concurrently. Shared and bounded so several
+# extractions at once can't open unlimited connections.
+PAGE_FETCH_WORKERS = 8
+page_fetch_executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS, thread_name_prefix="nora-crawl")
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get or create the shared HTTP session for website fetches.
+
+    Keep-alive pool, so a site's sub-pages (fetched right after its
+    homepage) reuse the homepage's TCP + TLS connection.
+    """
+    global http_session
+
+    if http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=PAGE_FETCH_WORKERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        http_session = session
+
+    return http_session
+
+
+def parse_html(html_content: str):
+    """lxml tree for an HTML page, or None if it has no parseable markup"""
+    try:
+        return lxml.html.fromstring(html_content.encode('utf-8'), parser=HTML_PARSER)
+    except etree.ParserError:  # empty or whitespace-only document
+        return None
+
+
+def site_host(url: str) -> str:
+    """Host of a URL, ignoring case and a leading "www." """
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def find_subpage_urls(tree, page_url: str, limit: int = MAX_SUBPAGES) -> List[str]:
+    """
+    Same-site links likely to hold hotel details, in page order.
+
+    Args:
+        tree: Parsed page (from parse_html)
+        page_url: Absolute URL of the page, for resolving relative links
+        limit: Maximum number of URLs to return
+    """
+    host = site_host(page_url)
+    seen = {urldefrag(page_url).url.rstrip('/')}
+    urls = []
+
+    for link in tree.iter('a'):
+        href = (link.get('href') or '').strip()
+        if not href or href.startswith(('mailto:', 'tel:', 'javascript:')):
+            continue
+
+        url = urldefrag(urljoin(page_url, href)).url
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or site_host(url) != host:
+            continue
+
+        key = url.rstrip('/')
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if SUBPAGE_PATTERN.search(parsed.path) or SUBPAGE_PATTERN.search(link.text_content()):
+            urls.append(url)
+            if len(urls) >= limit:
+                break
+
+    return urls
+
+
+def extract_clean_text(html_content: str, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """
+    Readable text of an HTML page, one stripped line per line of text.
+
+    Args:
+        html_content: Raw HTML
+        max_chars: Truncate longer text (with a marker) to this length
+
+    Returns:
+        Clean text content, or "" if the page has no parseable markup
+    """
+    tree = parse_html(html_content)
+    if tree is None:
+        return ""
+
+    return page_text(tree, max_chars)
+
+
+def page_text(tree, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Clean text of a parsed page (see extract_clean_text). Modifies the tree."""
+    # Remove script, style, and other non-content tags (keeping the text after them)
+    etree.strip_elements(tree, *NON_CONTENT_TAGS, with_tail=False)
+
+    text = '\n'.join(node.strip() for node in tree.itertext() if node.strip())
+
+    # Clean up whitespace inside multi-line text nodes
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    text = '\n'.join(lines)
+
+    if len(text) > max_chars:
+        text = text[:max_chars] + "\n\n[Content truncated...]"
+
+    return text
+
+
+# Static instructions and examples for website extraction. Kept as the
+# system message (the per-site URL and content go in the user turn) so every
+# request shares this prefix for OpenAI prompt caching.
+WEBSITE_EXTRACTION_PROMPT = """You are a precise data extraction assistant. You always respond with valid JSON.
+
+You are extracting hotel information from the website content in the user message.
+
+Extract ONLY information that is explicitly stated. Do not guess or infer.
+
+REQUIRED FIELDS:
+1. hotel_name - The name of the hotel (look in <title>, <h1>, or header)
+2. address - Full street address (number, street, city, state/province, zip, country)
+3. city - City name only
+4. state - State or province (2-letter code if US/Canada, full name otherwise)
+5. country - Full country name
+6. phone - Phone number in any format
+7. email - Contact email address
+
+OPTIONAL FIELDS:
+8. description - Brief hotel description (1-2 sentences, from About or homepage)
+9. amenities - List of hotel amenities (pool, wifi, parking, etc.)
+10. room_types - Names of room categories mentioned (e.g., "Deluxe Suite", "Ocean View")
+
+IMPORTANT RULES:
+- If a field is not found, set it to null
+- For address: Look for "Address", "Location", "Visit Us", footer
+- For phone: Look for "Contact", "Call", "Reservations", phone icon
+- For email: Look for "Contact", "Email", "Reservations", email icon
+- For room_types: Look for "Rooms", "Accommodations", "Suites", "Stay"
+- For amenities: Look for "Amenities", "Features", "Facilities"
+- Extract EXACTLY as written on the website (don't reformat)
+- For US addresses: Extract state as 2-letter code (e.g., "FL", "CA", "NY")
+- For US/Canada: Country should be "United States" or "Canada" (not "US" or "USA")
+- Set confidence to 0.9 if all required fields found
+- Set confidence to 0.5 if 50% of required fields found
+- Set confidence to 0.0 if <50% of required fields found
+
+EXAMPLES:
+
+Example 1 - Complete data:
+{
+    "hotel_name": "Sunset Villa Resort",
+    "address": "123 Ocean Drive, Miami Beach, FL 33139, United States",
+    "city": "Miami Beach",
+    "state": "FL",
+    "country": "United States",
+    "phone": "(305) 555-1234",
+    "email": "info@sunsetvilla.com",
+    "description": "Luxury beachfront resort offering stunning ocean views and world-class amenities.",
+    "amenities": ["Pool", "Spa", "Restaurant", "Free WiFi", "Parking"],
+    "room_types": ["Ocean View Suite", "Deluxe King", "Standard Queen"],
+    "confidence": 0.9
+}
+
+Example 2 - Partial data:
+{
+    "hotel_name": "Mountain Lodge",
+    "address": null,
+    "city": "Denver",
+    "state": "CO",
+    "country": "United States",
+    "phone": null,
+    "email": null,
+    "description": null,
+    "amenities": ["Free Breakfast", "Parking"],
+    "room_types": null,
+    "confidence": 0.5
+}
+
+Respond with ONLY valid JSON (no markdown, no extra text).
+"""
+
 
 class DataExtractor:
     """
@@ -54,8 +268,9 @@ class DataExtractor:
 
             logger.info(f"Successfully fetched HTML ({len(html_content)} chars)")
 
-            # Step 2: Extract clean text
-            clean_text = self._extract_clean_text(html_content)
+            # Step 2: Extract clean text, adding the sub-pages most likely to
+            # hold contact and room details (fetched concurrently)
+            clean_text = self._extract_site_text(url, html_content)
             if not clean_text or len(clean_text) < 100:
                 logger.warning(f"Insufficient text content from {url} ({len(clean_text) if clean_text else 0} chars)")
                 return {"error": "Website has no readable content", "confidence": 0.0}
@@ -115,7 +330,7 @@ class DataExtractor:
                 'User-Agent': 'Stayfull Hotel Setup Bot/1.0 (Website data extraction for hotel onboarding)'
             }
 
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = get_http_session().get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
 
             return response.text
@@ -133,35 +348,50 @@ class DataExtractor:
             logger.error(f"Request error fetching {url}: {str(e)}")
             return None
 
-    def _extract_clean_text(self, html_content: str) -> str:
+    def _extract_site_text(self, url: str, html_content: str) -> str:
         """
-        Extract clean text from HTML.
+        Clean text of a homepage plus its most relevant sub-pages.
+
+        Sub-pages are fetched concurrently, so the crawl costs about one
+        extra round trip. Each page gets an equal share of the text budget.
 
         Args:
-            html_content: Raw HTML
+            url: Homepage URL
+            html_content: Homepage HTML
 
         Returns:
-            Clean text content
+            Combined clean text, homepage first
         """
-        soup = BeautifulSoup(html_content, 'lxml')
+        tree = parse_html(html_content)
+        if tree is None:
+            return ""
 
-        # Remove script, style, and other non-content tags
-        for element in soup(['script', 'style', 'meta', 'link', 'noscript']):
-            element.decompose()
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
 
-        # Get text
-        text = soup.get_text(separator='\n', strip=True)
+        subpage_urls = find_subpage_urls(tree, url)
+        pages = [(url, tree)]
 
-        # Clean up whitespace
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        text = '\n'.join(lines)
+        if subpage_urls:
+            logger.info(f"Fetching {len(subpage_urls)} sub-pages: {', '.join(subpage_urls)}")
+            fetch = functools.partial(self._fetch_html, timeout=SUBPAGE_TIMEOUT)
 
-        # Limit to reasonable length for GPT-4o (avoid token limits)
-        max_chars = 8000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "\n\n[Content truncated...]"
+            for subpage_url, subpage_html in zip(subpage_urls, page_fetch_executor.map(fetch, subpage_urls)):
+                subpage_tree = parse_html(subpage_html) if subpage_html else None
+                if subpage_tree is not None:
+                    pages.append((subpage_url, subpage_tree))
 
-        return text
+        if len(pages) == 1:
+            return page_text(tree)
+
+        budget = MAX_TEXT_CHARS // len(pages)
+        sections = [page_text(tree, budget)]
+        for subpage_url, subpage_tree in pages[1:]:
+            text = page_text(subpage_tree, budget)
+            if text:
+                sections.append(f"PAGE: {subpage_url}\n{text}")
+
+        return '\n\n'.join(sections)
 
     def _extract_with_gpt(self, text: str, url: str) -> Dict:
         """
@@ -174,78 +404,10 @@ class DataExtractor:
         Returns:
             Dict with extracted hotel data
         """
-        prompt = f"""
-You are extracting hotel information from this website HTML.
-
-WEBSITE URL: {url}
+        prompt = f"""WEBSITE URL: {url}
 
 WEBSITE CONTENT:
 {text}
-
-Extract ONLY information that is explicitly stated. Do not guess or infer.
-
-REQUIRED FIELDS:
-1. hotel_name - The name of the hotel (look in <title>, <h1>, or header)
-2. address - Full street address (number, street, city, state/province, zip, country)
-3. city - City name only
-4. state - State or province (2-letter code if US/Canada, full name otherwise)
-5. country - Full country name
-6. phone - Phone number in any format
-7. email - Contact email address
-
-OPTIONAL FIELDS:
-8. description - Brief hotel description (1-2 sentences, from About or homepage)
-9. amenities - List of hotel amenities (pool, wifi, parking, etc.)
-10. room_types - Names of room categories mentioned (e.g., "Deluxe Suite", "Ocean View")
-
-IMPORTANT RULES:
-- If a field is not found, set it to null
-- For address: Look for "Address", "Location", "Visit Us", footer
-- For phone: Look for "Contact", "Call", "Reservations", phone icon
-- For email: Look for "Contact", "Email", "Reservations", email icon
-- For room_types: Look for "Rooms", "Accommodations", "Suites", "Stay"
-- For amenities: Look for "Amenities", "Features", "Facilities"
-- Extract EXACTLY as written on the website (don't reformat)
-- For US addresses: Extract state as 2-letter code (e.g., "FL", "CA", "NY")
-- For US/Canada: Country should be "United States" or "Canada" (not "US" or "USA")
-- Set confidence to 0.9 if all required fields found
-- Set confidence to 0.5 if 50% of required fields found
-- Set confidence to 0.0 if <50% of required fields found
-
-EXAMPLES:
-
-Example 1 - Complete data:
-{{
-    "hotel_name": "Sunset Villa Resort",
-    "address": "123 Ocean Drive, Miami Beach, FL 33139, United States",
-    "city": "Miami Beach",
-    "state": "FL",
-    "country": "United States",
-    "phone": "(305) 555-1234",
-    "email": "info@sunsetvilla.com",
-    "description": "Luxury beachfront resort offering stunning ocean views and world-class amenities.",
-    "amenities": ["Pool", "Spa", "Restaurant", "Free WiFi", "Parking"],
-    "room_types": ["Ocean View Suite", "Deluxe King", "Standard Queen"],
-    "confidence": 0.9
-}}
-
-Example 2 - Partial data:
-{{
-    "hotel_name": "Mountain Lodge",
-    "address": null,
-    "city": "Denver",
-    "state": "CO",
-    "country": "United States",
-    "phone": null,
-    "email": null,
-    "description": null,
-    "amenities": ["Free Breakfast", "Parking"],
-    "room_types": null,
-    "confidence": 0.5
-}}
-
-Now extract from the actual website content above.
-Respond with ONLY valid JSON (no markdown, no extra text):
 """
 
         try:
@@ -254,7 +416,7 @@ Respond with ONLY valid JSON (no markdown, no extra text):
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a precise data extraction assistant. You always respond with valid JSON."
+                        "content": WEBSITE_EXTRACTION_PROMPT
                     },
                     {
                         "role": "user",
@@ -263,12 +425,12 @@ Respond with ONLY valid JSON (no markdown, no extra text):
                 ],
                 temperature=0.1,  # Low temperature for consistent extraction
                 max_tokens=1000,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                prompt_cache_key="nora:website-extraction"
             )
 
             # Parse JSON response
-            import json
-            extracted = json.loads(response.choices[0].message.content)
+            extracted = json_loads(response.choices[0].message.content)
 
             # Ensure required fields exist
             extracted.setdefault("hotel_name", None)
@@ -451,3 +613,16 @@ Respond with ONLY valid JSON (no markdown, no extra text):
             "tax_rate": tax_rate,  # As percentage (13.0 = 13%)
             "language": "en"  # Default English for MVP
         }
+
+
+shared_data_extractor = None
+
+
+def get_data_extractor() -> DataExtractor:
+    """Get or create the process-wide DataExtractor (it holds no per-request state)."""
+    global shared_data_extractor
+
+    if shared_data_extractor is None:
+        shared_data_extractor = DataExtractor()
+
+    return shared_data_extractor
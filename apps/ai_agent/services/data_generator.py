@@ -10,6 +10,7 @@ Converts onboarding session data into operational F-001 models:
 This is the final step in onboarding: session → production-ready hotel.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from django.db import transaction
 from django.utils import timezone
 from apps.core.models import Organization
@@ -22,6 +23,14 @@ from .content_formatter import ContentFormatter
 
 logger = logging.getLogger(__name__)
 
+# Free-text list separators: "WiFi; TV, Mini Fridge | Safe"
+AMENITY_SPLIT_PATTERN = re.compile(r'\s*[,;|]\s*')
+
+# Runs the GPT copywriting calls for one generation concurrently (hotel
+# description plus one call per room type). Shared and bounded so several
+# onboardings finishing at once can't open unlimited OpenAI connections.
+copywriting_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="nora-copywriting")
+
 
 class DataGenerator:
     """
@@ -32,6 +41,8 @@ class DataGenerator:
     collected during onboarding and creates all necessary database records.
     """
 
+    __slots__ = ('user', 'organization', 'content_formatter')
+
     def __init__(self, user, organization: Organization):
         self.user = user
         self.organization = organization
@@ -113,16 +124,23 @@ class DataGenerator:
         rooms = []
 
         try:
-            with transaction.atomic():
+            # GPT copywriting is the slow part of generation. Run every call
+            # concurrently before the transaction opens, so the request waits
+            # for roughly one call and no row locks are held meanwhile.
+            hotel_description, room_descriptions = self._write_descriptions(field_values)
+
+            # Outermost transaction: durable skips savepoint creation and
+            # fails loudly if a caller ever nests this inside another atomic
+            with transaction.atomic(durable=True):
                 # 1. Create Hotel
-                hotel = self._create_hotel(field_values)
+                hotel = self._create_hotel(field_values, hotel_description)
 
                 if not hotel:
                     errors.append("Failed to create hotel")
                     return {"success": False, "errors": errors}
 
                 # 2. Create RoomTypes
-                room_types = self._create_room_types(hotel, field_values)
+                room_types = self._create_room_types(hotel, field_values, room_descriptions)
 
                 if not room_types:
                     errors.append("Failed to create room types")
@@ -131,11 +149,16 @@ class DataGenerator:
                 # 3. Create Rooms (bulk)
                 rooms = self._create_rooms(hotel, room_types, field_values)
 
-                # 4. Mark onboarding complete
-                context.active_task = 'completed_onboarding'
-                context.task_state['onboarding_completed_at'] = timezone.now().isoformat()
-                context.task_state['hotel_id'] = str(hotel.id)  # UUID to string for JSON
-                context.save()
+                # 4. Mark onboarding complete once the hotel rows are committed.
+                # The context update is a state-machine change, not part of the
+                # hotel invariant, so it runs outside the row-locking window.
+                completion_state = {
+                    'onboarding_completed_at': timezone.now().isoformat(),
+                    'hotel_id': str(hotel.id),  # UUID to string for JSON
+                }
+                transaction.on_commit(
+                    lambda: self._mark_onboarding_complete(context, completion_state)
+                )
 
                 logger.info(
                     f"Successfully generated hotel '{hotel.name}' with "
@@ -167,7 +190,95 @@ class DataGenerator:
                 "rooms": rooms
             }
 
-    def _create_hotel(self, field_values: dict) -> Hotel:
+    def _mark_onboarding_complete(self, context: NoraContext, completion_state: dict):
+        """Flag the context as completed after the hotel transaction commits."""
+        context.active_task = 'completed_onboarding'
+        context.task_state.update(completion_state)
+        context.save(update_fields=['active_task', 'task_state', 'updated_at'])
+
+    def _write_descriptions(self, field_values: dict) -> tuple:
+        """
+        Generate the hotel and room type descriptions concurrently.
+
+        Returns:
+            (hotel description, [room type description, ...]) with room
+            descriptions in the order _create_room_types builds the types
+        """
+        get = field_values.get
+
+        hotel_future = None
+        hotel_description = get('description', get('hotel_description'))
+
+        if not hotel_description or len(hotel_description.strip()) < 20:
+            # Generate AI description from hotel name + location
+            logger.info(f"Generating hotel description for {get('hotel_name', 'Unnamed Hotel')}...")
+            hotel_future = copywriting_executor.submit(
+                self.content_formatter.generate_hotel_description,
+                hotel_name=get('hotel_name', 'Unnamed Hotel'),
+                city=get('city', ''),
+                state=get('state', ''),
+                country=get('country', 'United States')
+            )
+
+        room_futures = [
+            copywriting_executor.submit(self.content_formatter.enhance_room_description, **request)
+            for request in self._room_description_requests(field_values)
+        ]
+
+        if hotel_future is not None:
+            hotel_description = hotel_future.result()
+            logger.info(f"Generated description: {hotel_description[:100]}...")
+
+        return hotel_description, [future.result() for future in room_futures]
+
+    def _room_description_requests(self, field_values: dict) -> list:
+        """enhance_room_description() arguments for each room type, in creation order"""
+        get = field_values.get
+        hotel_name = get('hotel_name', 'Unnamed Hotel')
+        city = get('city', '')
+
+        room_requests = []
+        room_types_data = get('room_types', [])
+
+        if room_types_data and isinstance(room_types_data, list):
+            for idx, room_data in enumerate(room_types_data, 1):
+                name = room_data.get('type', room_data.get('name', f'Room Type {idx}'))
+                basic_description = room_data.get('description', f'{name} at {hotel_name}')
+                amenities = room_data.get('amenities', [])
+                max_occupancy = room_data.get('occupancy', room_data.get('max_occupancy', 2))
+                room_requests.append((basic_description, name, amenities, max_occupancy))
+        else:
+            for i in range(1, int(get('num_room_types', 1)) + 1):
+                name = get(f'room_type_{i}_name', f'Room Type {i}')
+                basic_description = get(f'room_type_{i}_description', f'{name} at {hotel_name}')
+                amenities = self._room_type_amenities(field_values, i)
+                max_occupancy = int(get(f'room_type_{i}_max_occupancy', 2))
+                room_requests.append((basic_description, name, amenities, max_occupancy))
+
+        logger.info(f"Enhancing descriptions for {len(room_requests)} room types...")
+
+        return [
+            {
+                'basic_description': basic_description,
+                'room_type_name': name,
+                'context': {
+                    'hotel_name': hotel_name,
+                    'city': city,
+                    'amenities': amenities,
+                    'max_occupancy': max_occupancy
+                }
+            }
+            for basic_description, name, amenities, max_occupancy in room_requests
+        ]
+
+    def _room_type_amenities(self, field_values: dict, index: int) -> list:
+        """Amenities for an old-format room type, splitting free-text lists"""
+        amenities = field_values.get(f'room_type_{index}_amenities', [])
+        if isinstance(amenities, str):
+            amenities = [a for a in AMENITY_SPLIT_PATTERN.split(amenities.strip()) if a]
+        return amenities
+
+    def _create_hotel(self, field_values: dict, hotel_description: str) -> Hotel:
         """
         Create Hotel record from onboarding data.
 
@@ -180,8 +291,10 @@ class DataGenerator:
         """
         from django.utils.text import slugify
 
+        get = field_values.get
+
         # Extract hotel data (use actual onboarding field names)
-        hotel_name = field_values.get('hotel_name', 'Unnamed Hotel')
+        hotel_name = get('hotel_name', 'Unnamed Hotel')
 
         # Create slug from name (ensure uniqueness)
         base_slug = slugify(hotel_name)
@@ -193,39 +306,39 @@ class DataGenerator:
 
         # Address (JSONField) - map from onboarding field names
         address = {
-            'street': field_values.get('street_address', field_values.get('full_address', '')),
-            'city': field_values.get('city', ''),
-            'state': field_values.get('state', ''),
-            'postal_code': field_values.get('postal_code', field_values.get('zip_code', '')),
-            'country': field_values.get('country', 'United States')
+            'street': get('street_address', get('full_address', '')),
+            'city': get('city', ''),
+            'state': get('state', ''),
+            'postal_code': get('postal_code', get('zip_code', '')),
+            'country': get('country', 'United States')
         }
 
         # Contact (JSONField) - map from onboarding field names
         contact = {
-            'phone': field_values.get('phone', ''),
-            'email': field_values.get('contact_email', field_values.get('email', '')),
-            'website': field_values.get('website', field_values.get('website_url', ''))
+            'phone': get('phone', ''),
+            'email': get('contact_email', get('email', '')),
+            'website': get('website', get('website_url', ''))
         }
 
         # Policies - parse times from natural language ("3 PM") to time objects
-        check_in_time_str = field_values.get('checkin_time', field_values.get('check_in_time', '3 PM'))
-        check_out_time_str = field_values.get('checkout_time', field_values.get('check_out_time', '11 AM'))
+        check_in_time_str = get('checkin_time', get('check_in_time', '3 PM'))
+        check_out_time_str = get('checkout_time', get('check_out_time', '11 AM'))
 
         check_in_time = self._parse_time(check_in_time_str)
         check_out_time = self._parse_time(check_out_time_str)
 
         # Timezone (inferred during onboarding)
-        timezone_str = field_values.get('timezone', 'America/New_York')
+        timezone_str = get('timezone', 'America/New_York')
 
         # Languages (required field)
-        languages = field_values.get('languages', ['en'])
+        languages = get('languages', ['en'])
 
         # Hotel type
-        hotel_type = field_values.get('hotel_type', 'independent')
+        hotel_type = get('hotel_type', 'independent')
 
         # Total rooms (calculate from room_types list OR old format)
         total_rooms_count = 0
-        room_types = field_values.get('room_types', [])
+        room_types = get('room_types', [])
 
         if room_types and isinstance(room_types, list):
             # New format: room_types is a list of dicts
@@ -233,25 +346,11 @@ class DataGenerator:
             total_rooms_count = len(room_types) * 10
         else:
             # Old format: room_type_1_quantity, room_type_2_quantity, etc.
-            num_types = int(field_values.get('num_room_types', 1))
+            num_types = int(get('num_room_types', 1))
             for i in range(1, num_types + 1):
-                qty = int(field_values.get(f'room_type_{i}_quantity', 0))
+                qty = int(get(f'room_type_{i}_quantity', 0))
                 total_rooms_count += qty
 
-        # Hotel description - generate if not provided
-        hotel_description = field_values.get('description', field_values.get('hotel_description'))
-
-        if not hotel_description or len(hotel_description.strip()) < 20:
-            # Generate AI description from hotel name + location
-            logger.info(f"Generating hotel description for {hotel_name}...")
-            hotel_description = self.content_formatter.generate_hotel_description(
-                hotel_name=hotel_name,
-                city=address['city'],
-                state=address['state'],
-                country=address['country']
-            )
-            logger.info(f"Generated description: {hotel_description[:100]}...")
-
         # Create Hotel
         hotel = Hotel.objects.create(
             organization=self.organization,
@@ -262,7 +361,7 @@ class DataGenerator:
             address=address,
             contact=contact,
             timezone=timezone_str,
-            currency=field_values.get('currency', 'USD'),
+            currency=get('currency', 'USD'),
             languages=languages,
             check_in_time=check_in_time,
             check_out_time=check_out_time,
@@ -272,18 +371,27 @@ class DataGenerator:
         logger.info(f"Created hotel: {hotel.name} (slug: {hotel.slug})")
         return hotel
 
-    def _create_room_types(self, hotel: Hotel, field_values: dict) -> list:
+    def _create_room_types(self, hotel: Hotel, field_values: dict, descriptions: list) -> list:
         """
         Create RoomType records for the hotel.
 
         Supports two formats:
         1. NEW FORMAT (list): room_types: [{type: "Standard Queen", price: 150}, ...]
         2. OLD FORMAT (numbered): room_type_1_name, room_type_1_price, etc.
+
+        descriptions are the AI-enhanced room descriptions from
+        _write_descriptions(), one per room type in order.
         """
         from django.utils.text import slugify
 
+        get = field_values.get
+
         room_types = []
-        room_types_data = field_values.get('room_types', [])
+        room_types_data = get('room_types', [])
+
+        # Codes are unique per hotel; track them in memory since the
+        # room types are inserted together at the end
+        used_codes = set(RoomType.objects.filter(hotel=hotel).values_list('code', flat=True))
 
         # NEW FORMAT: room_types is a list of dicts
         if room_types_data and isinstance(room_types_data, list):
@@ -291,32 +399,17 @@ class DataGenerator:
                 # Simple format from conversation: {type: "Standard Queen", price: 150}
                 name = room_data.get('type', room_data.get('name', f'Room Type {idx}'))
                 base_price = float(room_data.get('price', room_data.get('base_price', 100.00)))
-
-                # Get or generate room description
-                description = room_data.get('description', f'{name} at {hotel.name}')
-
-                # AI-enhance room description
-                logger.info(f"Enhancing description for {name}...")
-                enhanced_description = self.content_formatter.enhance_room_description(
-                    basic_description=description,
-                    room_type_name=name,
-                    context={
-                        'hotel_name': hotel.name,
-                        'city': hotel.address.get('city', ''),
-                        'amenities': room_data.get('amenities', []),
-                        'max_occupancy': room_data.get('occupancy', room_data.get('max_occupancy', 2))
-                    }
-                )
-                description = enhanced_description
+                description = descriptions[idx - 1]
 
                 max_occupancy = room_data.get('occupancy', room_data.get('max_occupancy', 2))
 
                 # Code (short code like 'STD', 'DLX', 'SUI')
                 code = name[:3].upper() if len(name) >= 3 else name.upper()
                 counter = 1
-                while RoomType.objects.filter(hotel=hotel, code=code).exists():
+                while code in used_codes:
                     code = f"{name[:3].upper()}{counter}"
                     counter += 1
+                used_codes.add(code)
 
                 # Bed configuration - infer from name
                 bed_type = "1 Queen"  # Default
@@ -330,8 +423,8 @@ class DataGenerator:
                     'description': bed_type
                 }
 
-                # Create RoomType
-                room_type = RoomType.objects.create(
+                # Build RoomType (inserted in bulk below)
+                room_type = RoomType(
                     hotel=hotel,
                     name=name,
                     code=code,
@@ -346,48 +439,33 @@ class DataGenerator:
                 )
 
                 room_types.append(room_type)
-                logger.info(f"Created room type: {room_type.name} (${base_price}/night)")
 
         # OLD FORMAT: room_type_1_name, room_type_2_name, etc.
         else:
-            num_types = int(field_values.get('num_room_types', 1))
+            num_types = int(get('num_room_types', 1))
 
             for i in range(1, num_types + 1):
-                name = field_values.get(f'room_type_{i}_name', f'Room Type {i}')
-                basic_description = field_values.get(f'room_type_{i}_description', f'{name} at {hotel.name}')
-                base_price = float(field_values.get(f'room_type_{i}_base_price', 100.00))
-                max_occupancy = int(field_values.get(f'room_type_{i}_max_occupancy', 2))
-
-                # AI-enhance room description
-                amenities = field_values.get(f'room_type_{i}_amenities', [])
-                if isinstance(amenities, str):
-                    amenities = [a.strip() for a in amenities.split(',')]
-
-                logger.info(f"Enhancing description for {name}...")
-                description = self.content_formatter.enhance_room_description(
-                    basic_description=basic_description,
-                    room_type_name=name,
-                    context={
-                        'hotel_name': hotel.name,
-                        'city': hotel.address.get('city', ''),
-                        'amenities': amenities,
-                        'max_occupancy': max_occupancy
-                    }
-                )
-                bed_type = field_values.get(f'room_type_{i}_beds', '1 Queen')
+                name = get(f'room_type_{i}_name', f'Room Type {i}')
+                description = descriptions[i - 1]
+                base_price = float(get(f'room_type_{i}_base_price', 100.00))
+                max_occupancy = int(get(f'room_type_{i}_max_occupancy', 2))
+                amenities = self._room_type_amenities(field_values, i)
+
+                bed_type = get(f'room_type_{i}_beds', '1 Queen')
 
                 code = name[:3].upper() if len(name) >= 3 else name.upper()
                 counter = 1
-                while RoomType.objects.filter(hotel=hotel, code=code).exists():
+                while code in used_codes:
                     code = f"{name[:3].upper()}{counter}"
                     counter += 1
+                used_codes.add(code)
 
                 bed_configuration = {
                     'type': bed_type,
                     'description': bed_type
                 }
 
-                room_type = RoomType.objects.create(
+                room_type = RoomType(
                     hotel=hotel,
                     name=name,
                     code=code,
@@ -402,7 +480,13 @@ class DataGenerator:
                 )
 
                 room_types.append(room_type)
-                logger.info(f"Created room type: {room_type.name} (${base_price}/night)")
+
+        # Bulk create (performance optimization). UUID primary keys are
+        # assigned client-side, so no RETURNING round-trip is needed before
+        # _create_rooms references them.
+        RoomType.objects.bulk_create(room_types, batch_size=500)
+        for room_type in room_types:
+            logger.info(f"Created room type: {room_type.name} (${room_type.base_price}/night)")
 
         return room_types
 
@@ -417,13 +501,15 @@ class DataGenerator:
         Creates rooms like: 101, 102, 103, ..., 120 for first type,
                             121, 122, ..., 135 for second type, etc.
         """
-        room_number_start = int(field_values.get('room_number_start', 101))
+        get = field_values.get
+
+        room_number_start = int(get('room_number_start', 101))
         current_number = room_number_start
 
         rooms_to_create = []
 
         # Check format
-        room_types_array = field_values.get('room_types', [])
+        room_types_array = get('room_types', [])
         if room_types_array and isinstance(room_types_array, list):
             # NEW FORMAT: array of room type objects
             for idx, (room_type, room_data) in enumerate(zip(room_types, room_types_array)):
@@ -452,7 +538,7 @@ class DataGenerator:
                 # Find the index (room_type_1, room_type_2, etc.)
                 type_index = None
                 for i in range(1, 100):  # Max 100 types
-                    if field_values.get(f'room_type_{i}_name') == room_type.name:
+                    if get(f'room_type_{i}_name') == room_type.name:
                         type_index = i
                         break
 
@@ -460,7 +546,7 @@ class DataGenerator:
                     logger.warning(f"Could not find quantity for room type {room_type.name}")
                     continue
 
-                quantity = int(field_values.get(f'room_type_{type_index}_quantity', 10))
+                quantity = int(get(f'room_type_{type_index}_quantity', 10))
 
                 # Create rooms for this type
                 for _ in range(quantity):
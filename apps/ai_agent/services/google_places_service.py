@@ -10,15 +10,231 @@ Provides:
 Used by NoraAgent to automatically enrich hotel data during onboarding.
 """
 
+import io
 import os
+import time
+import random
+import asyncio
 import logging
+import hashlib
+import functools
+import importlib.util
+import httpx
 import requests
 import googlemaps
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
 from django.conf import settings
+from django.core.cache import cache
+
+try:
+    from timezonefinder import TimezoneFinder
+except ImportError:  # optional; timezones then come from the Google Timezone API
+    TimezoneFinder = None
 
 logger = logging.getLogger(__name__)
 
+# Google API statuses / HTTP codes worth retrying (transient, not auth or quota exhaustion)
+RETRYABLE_API_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+# The googlemaps client retries 5xx and OVER_QUERY_LIMIT itself for up to
+# retry_timeout (60s by default) before raising Timeout, which
+# retry_with_backoff would retry again. Keep its own window to about one
+# attempt so retry_with_backoff is the retry layer, and bound each request.
+PLACES_CLIENT_RETRY_TIMEOUT = 1  # seconds
+PLACES_CLIENT_TIMEOUT = 10  # seconds per request
+
+# Timezone lookups are cached on coordinates rounded to 2 decimals (~1 km),
+# well inside any timezone boundary for hotels in the same city
+TIMEZONE_CACHE_PRECISION = 2
+TIMEZONE_CACHE_TIMEOUT = 86400  # 24 hours
+
+# Search query → place_id is stable; place details change more often
+PLACE_ID_CACHE_TIMEOUT = 7 * 86400  # 7 days
+PLACE_DETAILS_CACHE_TIMEOUT = 86400  # 24 hours
+
+# Place Details fields grouped by billing SKU tier. Each extra tier requested
+# is billed on top of Basic, and every field adds to the response payload.
+BASIC_FIELDS = ["name", "formatted_address", "geometry", "photo", "business_status", "type"]
+CONTACT_FIELDS = ["international_phone_number", "website", "opening_hours"]
+ATMOSPHERE_FIELDS = ["rating", "user_ratings_total"]
+
+# What onboarding needs: basics + phone/website (no ratings or hours)
+DEFAULT_PLACE_FIELDS = BASIC_FIELDS + ["international_phone_number", "website"]
+
+# Places web service endpoints, called directly by the async pipeline
+PLACES_TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+
+# Photo downloads are streamed in chunks and aborted past this size
+PHOTO_MAX_BYTES = 4 * 1024 * 1024  # 4 MB
+PHOTO_CHUNK_SIZE = 64 * 1024
+
+# Concurrent photo downloads per download_photos() call, whatever the caller
+# asks for, to respect Places QPS limits
+PHOTO_MAX_WORKERS = 8
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Return True for transient Google/network errors, False for hard failures."""
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return error.status in RETRYABLE_API_STATUSES
+    if isinstance(error, googlemaps.exceptions.HTTPError):
+        return error.status_code in RETRYABLE_HTTP_STATUSES
+    if isinstance(error, (googlemaps.exceptions.Timeout, googlemaps.exceptions.TransportError)):
+        return True
+    if isinstance(error, (requests.HTTPError, httpx.HTTPStatusError)):
+        return error.response is not None and error.response.status_code in RETRYABLE_HTTP_STATUSES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError))
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read a Retry-After header (in seconds) from an HTTP error, if present."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_with_backoff(
+    max_retries: int = 3, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5
+):
+    """
+    Retry a Google API call with exponential backoff on transient errors.
+
+    Sleeps min(cap, base * 2**attempt) * (1 + uniform(0, jitter)) between
+    attempts, honoring Retry-After when the server sends one. Non-retryable
+    errors (bad request, denied key, etc.) are raised immediately.
+    Coroutine functions are retried with asyncio.sleep instead of time.sleep.
+    """
+    def next_delay(func, error: Exception, attempt: int) -> float:
+        if attempt >= max_retries or not _is_retryable(error):
+            raise error
+
+        delay = _retry_after_seconds(error)
+        if delay is None:
+            delay = base * 2 ** attempt * (1 + random.uniform(0, jitter))
+        delay = min(cap, delay)
+
+        logger.warning(
+            f"{func.__name__} failed ({error}); retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+        )
+        return delay
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                attempt = 0
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = next_delay(func, e, attempt)
+                        attempt += 1
+                        await asyncio.sleep(delay)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            attempt = 0
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    delay = next_delay(func, e, attempt)
+                    attempt += 1
+                    time.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
+# Process-wide clients (created lazily, reused across service instances)
+http_session = None
+places_client = None
+timezone_finder = None
+async_http_client = None
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get or create the shared HTTP session for Google requests.
+
+    Keep-alive connection pool so photo/timezone/search calls skip
+    the TCP + TLS handshake after the first request.
+    Retries are handled by retry_with_backoff, not the adapter.
+    """
+    global http_session
+
+    if http_session is None:
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0),
+        )
+        http_session = session
+
+    return http_session
+
+
+def get_places_client(api_key: str) -> googlemaps.Client:
+    """Get or create the shared googlemaps client (uses the shared HTTP session)."""
+    global places_client
+
+    if places_client is None or places_client.key != api_key:
+        places_client = googlemaps.Client(
+            key=api_key,
+            requests_session=get_http_session(),
+            timeout=PLACES_CLIENT_TIMEOUT,
+            retry_timeout=PLACES_CLIENT_RETRY_TIMEOUT,
+            retry_over_query_limit=False,
+        )
+
+    return places_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared async HTTP client for Google requests.
+
+    Used by async_search_hotel under ASGI so Places round-trips don't block
+    the event loop. HTTP/2 is enabled when the optional h2 package is installed.
+    """
+    global async_http_client
+
+    if async_http_client is None or async_http_client.is_closed:
+        async_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=15,
+        )
+
+    return async_http_client
+
+
+def get_timezone_finder() -> Optional["TimezoneFinder"]:
+    """
+    Get or create the shared offline timezone finder.
+
+    Loads the timezone polygons into memory once per process (~100 ms,
+    ~50 MB) so lookups take microseconds. Returns None if timezonefinder
+    is not installed.
+    """
+    global timezone_finder
+
+    if timezone_finder is None and TimezoneFinder is not None:
+        timezone_finder = TimezoneFinder(in_memory=True)
+
+    return timezone_finder
+
 
 class GooglePlacesService:
     """
@@ -42,10 +258,68 @@ class GooglePlacesService:
             )
             self.client = None
         else:
-            self.client = googlemaps.Client(key=api_key)
+            self.client = get_places_client(api_key)
+
+        # Shared HTTP session so photo downloads reuse TCP/TLS connections
+        self.session = get_http_session()
+
+    @retry_with_backoff()
+    def _text_search(self, query: str) -> Dict:
+        """Places text search, restricted to lodging."""
+        return self.client.places(query=query, type="lodging")
+
+    @retry_with_backoff()
+    def _place_details(self, place_id: str, fields: List[str]) -> Dict:
+        """Place details for a single place_id."""
+        return self.client.place(place_id=place_id, fields=fields)
+
+    @retry_with_backoff()
+    def _timezone_lookup(self, lat: float, lng: float) -> Dict:
+        """Timezone API lookup for coordinates."""
+        return self.client.timezone(location=(lat, lng))
+
+    @retry_with_backoff()
+    async def _async_places_request(self, url: str, params: Dict) -> Dict:
+        """
+        Raw async Places web service request.
+
+        Non-OK statuses are raised as googlemaps ApiError so retries and
+        error handling match the sync client.
+        """
+        response = await get_async_http_client().get(
+            url, params={**params, "key": self.client.key}
+        )
+        response.raise_for_status()
+
+        body = response.json()
+        status = body.get("status")
+        if status not in ("OK", "ZERO_RESULTS"):
+            raise googlemaps.exceptions.ApiError(status, body.get("error_message"))
+
+        return body
+
+    @retry_with_backoff()
+    def _fetch_photo(self, url: str, params: Dict, max_bytes: int) -> Optional[bytes]:
+        """
+        Raw photo request (googlemaps has no photo method).
+
+        Streams the body in chunks; returns None if it exceeds max_bytes.
+        """
+        with self.session.get(url, params=params, stream=True, timeout=15) as response:
+            response.raise_for_status()
+
+            buffer = io.BytesIO()
+            total = 0
+            for chunk in response.iter_content(PHOTO_CHUNK_SIZE):
+                total += len(chunk)
+                if total > max_bytes:
+                    return None
+                buffer.write(chunk)
+
+            return buffer.getvalue()
 
     def search_hotel(
-        self, hotel_name: str, city: str, state: str = None
+        self, hotel_name: str, city: str, state: str = None, fields: List[str] = None
     ) -> Optional[Dict]:
         """
         Search for hotel on Google Places.
@@ -54,6 +328,9 @@ class GooglePlacesService:
             hotel_name: "Sunset Villa"
             city: "Miami"
             state: "FL" (optional, improves accuracy)
+            fields: Place Details fields to request (default DEFAULT_PLACE_FIELDS).
+                Opt into ATMOSPHERE_FIELDS / CONTACT_FIELDS only when needed;
+                keys for fields not requested come back empty.
 
         Returns:
             {
@@ -80,76 +357,106 @@ class GooglePlacesService:
             logger.warning("Google Places client not initialized. Skipping search.")
             return None
 
-        # Build search query
-        query = f"{hotel_name}, {city}"
-        if state:
-            query += f", {state}"
+        query = self._build_query(hotel_name, city, state)
+        query_key = self._query_cache_key(query)
 
         try:
-            logger.info(f"Searching Google Places for: {query}")
+            place_id = cache.get(query_key)
 
-            # Text search for the hotel
-            result = self.client.places(query=query, type="lodging")
+            if place_id:
+                logger.info(f"Place cache hit for: {query} ({place_id})")
+            else:
+                logger.info(f"Searching Google Places for: {query}")
 
-            if not result.get("results"):
-                logger.info(f"No results found for: {query}")
-                return None
+                # Text search for the hotel
+                result = self._text_search(query)
 
-            # Get first result (most relevant)
-            place = result["results"][0]
-            place_id = place["place_id"]
-
-            logger.info(f"Found place_id: {place_id}")
-
-            # Get detailed information
-            details = self.client.place(
-                place_id=place_id,
-                fields=[
-                    "name",
-                    "formatted_address",
-                    "international_phone_number",
-                    "website",
-                    "geometry",
-                    "photo",
-                    "rating",
-                    "user_ratings_total",
-                    "business_status",
-                    "type",
-                    "opening_hours",
-                ],
-            )
+                if not result.get("results"):
+                    logger.info(f"No results found for: {query}")
+                    return None
 
-            place_details = details.get("result", {})
-
-            # Extract photo references
-            photos = []
-            if place_details.get("photos"):
-                photos = [
-                    p["photo_reference"]
-                    for p in place_details.get("photos", [])[:10]
-                ]
-
-            enriched_data = {
-                "place_id": place_id,
-                "name": place_details.get("name"),
-                "address": place_details.get("formatted_address"),
-                "phone": place_details.get("international_phone_number"),
-                "website": place_details.get("website"),
-                "location": place_details.get("geometry", {}).get("location", {}),
-                "photos": photos,
-                "rating": place_details.get("rating"),
-                "user_ratings_total": place_details.get("user_ratings_total"),
-                "business_status": place_details.get("business_status"),
-                "types": place_details.get("types", []),
-                "opening_hours": place_details.get("opening_hours", {}),
-            }
+                # Get first result (most relevant)
+                place = result["results"][0]
+                place_id = place["place_id"]
+                cache.set(query_key, place_id, PLACE_ID_CACHE_TIMEOUT)
+
+                logger.info(f"Found place_id: {place_id}")
+
+            # Get detailed information (photo references are cached, photo bytes are not)
+            fields = fields or DEFAULT_PLACE_FIELDS
+            details_key = self._details_cache_key(place_id, fields)
+            place_details = cache.get(details_key)
 
-            logger.info(
-                f"Successfully enriched hotel data: {enriched_data.get('name')} - "
-                f"{enriched_data.get('address')}"
+            if place_details is None:
+                details = self._place_details(place_id, fields=fields)
+
+                place_details = details.get("result", {})
+                if place_details:
+                    cache.set(details_key, place_details, PLACE_DETAILS_CACHE_TIMEOUT)
+
+            return self._build_place_data(place_id, place_details)
+
+        except googlemaps.exceptions.ApiError as e:
+            logger.error(f"Google Places API error: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(
+                f"Unexpected error searching Google Places: {str(e)}", exc_info=True
             )
+            return None
 
-            return enriched_data
+    async def async_search_hotel(
+        self, hotel_name: str, city: str, state: str = None, fields: List[str] = None
+    ) -> Optional[Dict]:
+        """
+        Async variant of search_hotel for ASGI deployments.
+
+        Calls the Places web service endpoints through the shared
+        httpx.AsyncClient, so the event loop is free during network I/O.
+        Shares search_hotel's caches and returns the same structure.
+        """
+        if not self.client:
+            logger.warning("Google Places client not initialized. Skipping search.")
+            return None
+
+        query = self._build_query(hotel_name, city, state)
+        query_key = self._query_cache_key(query)
+
+        try:
+            place_id = await cache.aget(query_key)
+
+            if place_id:
+                logger.info(f"Place cache hit for: {query} ({place_id})")
+            else:
+                logger.info(f"Searching Google Places for: {query}")
+
+                result = await self._async_places_request(
+                    PLACES_TEXT_SEARCH_URL, {"query": query, "type": "lodging"}
+                )
+
+                if not result.get("results"):
+                    logger.info(f"No results found for: {query}")
+                    return None
+
+                place_id = result["results"][0]["place_id"]
+                await cache.aset(query_key, place_id, PLACE_ID_CACHE_TIMEOUT)
+
+                logger.info(f"Found place_id: {place_id}")
+
+            fields = fields or DEFAULT_PLACE_FIELDS
+            details_key = self._details_cache_key(place_id, fields)
+            place_details = await cache.aget(details_key)
+
+            if place_details is None:
+                details = await self._async_places_request(
+                    PLACES_DETAILS_URL, {"place_id": place_id, "fields": ",".join(fields)}
+                )
+
+                place_details = details.get("result", {})
+                if place_details:
+                    await cache.aset(details_key, place_details, PLACE_DETAILS_CACHE_TIMEOUT)
+
+            return self._build_place_data(place_id, place_details)
 
         except googlemaps.exceptions.ApiError as e:
             logger.error(f"Google Places API error: {str(e)}")
@@ -160,10 +467,112 @@ class GooglePlacesService:
             )
             return None
 
+    @staticmethod
+    def _build_query(hotel_name: str, city: str, state: str = None) -> str:
+        """Text search query: "name, city[, state]"."""
+        query = f"{hotel_name}, {city}"
+        if state:
+            query += f", {state}"
+        return query
+
+    @staticmethod
+    def _query_cache_key(query: str) -> str:
+        """Cache key for normalized query → place_id."""
+        return "gp:q:" + hashlib.sha1(query.lower().encode()).hexdigest()
+
+    @staticmethod
+    def _details_cache_key(place_id: str, fields: List[str]) -> str:
+        """Cache key for place_id + requested fields → place details."""
+        fields_hash = hashlib.sha1(",".join(sorted(fields)).encode()).hexdigest()[:12]
+        return f"gp:d:{place_id}:{fields_hash}"
+
+    @staticmethod
+    def _build_place_data(place_id: str, place_details: Dict) -> Dict:
+        """Flatten a Place Details result into the search_hotel structure."""
+        # Extract photo references
+        photos = []
+        if place_details.get("photos"):
+            photos = [
+                p["photo_reference"]
+                for p in place_details.get("photos", [])[:10]
+            ]
+
+        enriched_data = {
+            "place_id": place_id,
+            "name": place_details.get("name"),
+            "address": place_details.get("formatted_address"),
+            "phone": place_details.get("international_phone_number"),
+            "website": place_details.get("website"),
+            "location": place_details.get("geometry", {}).get("location", {}),
+            "photos": photos,
+            "rating": place_details.get("rating"),
+            "user_ratings_total": place_details.get("user_ratings_total"),
+            "business_status": place_details.get("business_status"),
+            "types": place_details.get("types", []),
+            "opening_hours": place_details.get("opening_hours", {}),
+        }
+
+        logger.info(
+            f"Successfully enriched hotel data: {enriched_data.get('name')} - "
+            f"{enriched_data.get('address')}"
+        )
+
+        return enriched_data
+
+    def enrich_hotel(
+        self, hotel_name: str, city: str, state: str = None, num_photos: int = 5
+    ) -> Optional[Dict]:
+        """
+        Search for a hotel, then fetch its timezone and top photos concurrently.
+
+        The timezone lookup and photo downloads are independent once the
+        place details are known, so they run in parallel on a thread pool.
+
+        Args:
+            hotel_name: "Sunset Villa"
+            city: "Miami"
+            state: "FL" (optional, improves accuracy)
+            num_photos: How many photos to download (default 5)
+
+        Returns:
+            search_hotel() result plus:
+            {
+                "timezone": "America/New_York",  # None if no coordinates
+                "photo_data": [b"...", None, ...],  # bytes per photo, None if failed
+            }
+
+            Returns None if the hotel is not found.
+        """
+        enriched_data = self.search_hotel(hotel_name, city, state)
+        if not enriched_data:
+            return None
+
+        location = enriched_data.get("location") or {}
+        lat, lng = location.get("lat"), location.get("lng")
+        photo_references = enriched_data.get("photos", [])[:num_photos]
+
+        with ThreadPoolExecutor(max_workers=min(8, 1 + len(photo_references))) as executor:
+            timezone_future = None
+            if lat is not None and lng is not None:
+                timezone_future = executor.submit(self.infer_timezone_from_location, lat, lng)
+
+            photo_futures = [
+                executor.submit(self.download_photo, ref) for ref in photo_references
+            ]
+
+            enriched_data["timezone"] = timezone_future.result() if timezone_future else None
+            enriched_data["photo_data"] = [future.result() for future in photo_futures]
+
+        return enriched_data
+
     def infer_timezone_from_location(self, lat: float, lng: float) -> str:
         """
         Get timezone from GPS coordinates.
 
+        Resolved offline with timezonefinder when installed; the Google
+        Timezone API is only called when that finds nothing (e.g. open ocean)
+        or the package is missing.
+
         Args:
             lat: Latitude (e.g., 25.7617)
             lng: Longitude (e.g., -80.1918)
@@ -172,15 +581,36 @@ class GooglePlacesService:
             Timezone ID (e.g., "America/New_York")
             Defaults to "America/New_York" if API fails
         """
+        finder = get_timezone_finder()
+        if finder is not None:
+            timezone_id = finder.timezone_at(lat=lat, lng=lng)
+            if timezone_id:
+                return timezone_id
+
         if not self.client:
             logger.warning("Google Places client not initialized. Using default timezone.")
             return "America/New_York"
 
+        # Shared Django cache so every worker process benefits from a lookup
+        cache_key = (
+            f"gp:tz:{round(lat, TIMEZONE_CACHE_PRECISION)}:"
+            f"{round(lng, TIMEZONE_CACHE_PRECISION)}"
+        )
+        timezone_id = cache.get(cache_key)
+        if timezone_id:
+            logger.info(f"Timezone cache hit: {timezone_id}")
+            return timezone_id
+
         try:
             logger.info(f"Looking up timezone for coordinates: {lat}, {lng}")
 
-            result = self.client.timezone(location=(lat, lng))
-            timezone_id = result.get("timeZoneId", "America/New_York")
+            result = self._timezone_lookup(lat, lng)
+            timezone_id = result.get("timeZoneId")
+
+            if not timezone_id:
+                return "America/New_York"
+
+            cache.set(cache_key, timezone_id, TIMEZONE_CACHE_TIMEOUT)
 
             logger.info(f"Timezone found: {timezone_id}")
 
@@ -190,13 +620,16 @@ class GooglePlacesService:
             logger.error(f"Timezone lookup error: {str(e)}")
             return "America/New_York"  # Sensible default
 
-    def download_photo(self, photo_reference: str, max_width: int = 1200) -> Optional[bytes]:
+    def download_photo(
+        self, photo_reference: str, max_width: int = 1200, max_bytes: int = PHOTO_MAX_BYTES
+    ) -> Optional[bytes]:
         """
         Download a photo from Google Places.
 
         Args:
             photo_reference: Photo reference from search_hotel() results
             max_width: Maximum width in pixels (default 1200)
+            max_bytes: Abort and return None if the image is larger (default 4 MB)
 
         Returns:
             Image bytes (JPEG) or None if download fails
@@ -218,12 +651,15 @@ class GooglePlacesService:
 
             logger.info(f"Downloading photo: {photo_reference[:20]}...")
 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            content = self._fetch_photo(url, params, max_bytes)
 
-            logger.info(f"Photo downloaded successfully ({len(response.content)} bytes)")
+            if content is None:
+                logger.warning(f"Photo exceeds {max_bytes} bytes, skipped: {photo_reference[:20]}...")
+                return None
+
+            logger.info(f"Photo downloaded successfully ({len(content)} bytes)")
 
-            return response.content
+            return content
 
         except requests.RequestException as e:
             logger.error(f"Photo download error: {str(e)}")
@@ -231,3 +667,38 @@ class GooglePlacesService:
         except Exception as e:
             logger.error(f"Unexpected error downloading photo: {str(e)}", exc_info=True)
             return None
+
+    def download_photos(
+        self, photo_references: List[str], max_width: int = 1200, max_workers: int = PHOTO_MAX_WORKERS
+    ) -> List[Optional[bytes]]:
+        """
+        Download several photos from Google Places concurrently.
+
+        Args:
+            photo_references: Photo references from search_hotel() results
+            max_width: Maximum width in pixels (default 1200)
+            max_workers: Concurrent downloads (capped at PHOTO_MAX_WORKERS to respect Places QPS limits)
+
+        Returns:
+            Image bytes per reference, in the same order as photo_references.
+            Failed downloads are None.
+        """
+        if not photo_references:
+            return []
+
+        if not self.client:
+            logger.warning("Google Places client not initialized. Cannot download photos.")
+            return [None] * len(photo_references)
+
+        workers = min(max_workers, PHOTO_MAX_WORKERS, len(photo_references))
+
+        logger.info(f"Downloading {len(photo_references)} photos ({workers} workers)")
+
+        # executor.map preserves input order, so results line up with references
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    lambda ref: self.download_photo(ref, max_width=max_width),
+                    photo_references,
+                )
+            )
@@ -15,10 +15,24 @@ Intents:
 """
 
 from enum import Enum
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
+import json
+import hashlib
+import logging
+from django.core.cache import cache
 from .openai_config import get_openai_client
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# GPT classifications are memoized per (message, onboarding step, pending field)
+CLASSIFICATION_CACHE_TIMEOUT = 86400  # 24 hours
+
 
 class Intent(Enum):
     """User message intents"""
@@ -33,6 +47,16 @@ class Intent(Enum):
     UNCLEAR = "unclear"
 
 
+def _index_phrases(rules) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Map each phrase's first word to the (group, phrase) pairs it starts."""
+    index = {}
+    for group, _, phrases in rules:
+        for phrase in phrases:
+            first_word = phrase.split()[0]
+            index[first_word] = index.get(first_word, ()) + ((group, phrase),)
+    return index
+
+
 class IntentDetector:
     """
     Detect user intent from messages.
@@ -42,50 +66,88 @@ class IntentDetector:
     2. GPT-4o classification (for ambiguous cases)
     """
 
-    # URL regex pattern
+    # URL regex pattern (case-insensitive, so it runs on the raw message).
+    # Scheme-less "www." addresses count too; the fetch adds https://.
     URL_PATTERN = re.compile(
-        r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b'
-        r'(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)'
+        r'(?:https?://(?:www\.)?|\bwww\.)[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b'
+        r'(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)',
+        re.IGNORECASE
     )
 
-    # Confirmation patterns
-    CONFIRM_PATTERNS = [
-        r'\byes\b', r'\byep\b', r'\byeah\b', r'\bsure\b',
-        r'\bok\b', r'\bokay\b', r'\bcorrect\b', r'\bright\b',
-        r'\bagree\b', r'\bconfirm\b', r'\bapprove\b',
-        r'^✓', r'^👍'
-    ]
-
-    # Rejection patterns
-    REJECT_PATTERNS = [
-        r'\bno\b', r'\bnope\b', r'\bnah\b', r'\bnot\b',
-        r'\bwrong\b', r'\bincorrect\b', r'\bdisagree\b',
-        r'\bcancel\b', r'\bskip\b',
-        r'^✗', r'^❌', r'^👎'
-    ]
-
-    # Question patterns
-    QUESTION_PATTERNS = [
-        r'\?$',  # Ends with ?
-        r'\bwhat\b', r'\bwhy\b', r'\bhow\b', r'\bwhen\b',
-        r'\bwhere\b', r'\bwho\b', r'\bwhich\b',
-        r'\bcan i\b', r'\bcan you\b', r'\bshould i\b'
-    ]
+    # Single-word patterns are whole-word membership tests, so they are
+    # matched as token sets (a \w+ token equals a \bword\b regex match).
+    # '?' is a pseudo-token added when the message ends with a question mark.
+    CONFIRM_WORDS = frozenset({
+        'yes', 'yep', 'yup', 'yeah', 'sure', 'ok', 'okay', 'correct', 'right',
+        'agree', 'confirm', 'approve', 'exactly', 'absolutely', 'definitely',
+        'perfect',
+    })
+    REJECT_WORDS = frozenset({
+        'no', 'nope', 'nah', 'not', 'wrong', 'incorrect', 'disagree',
+        'cancel', 'skip',
+    })
+    QUESTION_WORDS = frozenset({'?', 'what', 'why', 'how', 'when', 'where', 'who', 'which'})
+    EDIT_WORDS = frozenset({'change', 'edit', 'update', 'modify', 'fix', 'correct', 'redo'})
+    HELP_WORDS = frozenset({'help', 'stuck', 'confused', 'explain'})
+
+    WORD_RE = re.compile(r'\w+')
+
+    # Leading emoji replies, checked by set membership on the first character
+    CONFIRM_EMOJIS = frozenset('✓👍')
+    REJECT_EMOJIS = frozenset('✗❌👎')
+
+    # Multi-word phrases, matched as substrings of the space-joined token
+    # stream (padded, so each phrase starts and ends on a word boundary).
+    # "don't" tokenizes to "don t".
+    CONFIRM_PHRASES = (' sounds good ', ' looks good ')
+    QUESTION_PHRASES = (' can i ', ' can you ', ' should i ')
+    EDIT_PHRASES = (' go back ',)
+    HELP_PHRASES = (' don t understand ',)
+
+    # Intent categories in precedence order, with their tokens and phrases
+    INTENT_RULES = (
+        ('confirm', CONFIRM_WORDS, CONFIRM_PHRASES),
+        ('reject', REJECT_WORDS, ()),
+        ('question', QUESTION_WORDS, QUESTION_PHRASES),
+        ('edit', EDIT_WORDS, EDIT_PHRASES),
+        ('help', HELP_WORDS, HELP_PHRASES),
+    )
 
-    # Edit request patterns
-    EDIT_PATTERNS = [
-        r'\bchange\b', r'\bedit\b', r'\bupdate\b', r'\bmodify\b',
-        r'\bfix\b', r'\bcorrect\b', r'\bredo\b', r'\bgo back\b'
-    ]
+    # First word → (group, phrase); only phrases whose first word is in the
+    # message are substring-checked
+    PHRASE_INDEX = _index_phrases(INTENT_RULES)
+
+    # Named group → (Intent, confidence)
+    GROUP_INTENTS = {
+        'confirm': (Intent.CONFIRM, 0.90),
+        'reject': (Intent.REJECT, 0.90),
+        'question': (Intent.ASK_QUESTION, 0.85),
+        'edit': (Intent.EDIT_REQUEST, 0.85),
+        'help': (Intent.REQUEST_HELP, 0.90),
+    }
+
+    # Intent options offered to GPT-4o (shared by single and batch prompts)
+    INTENT_OPTIONS = """1. provide_data - User is providing requested information (hotel name, address, etc.)
+2. ask_question - User is asking for clarification or help
+3. confirm - User is agreeing/confirming
+4. reject - User is disagreeing/declining
+5. edit_request - User wants to change something
+6. navigate - User wants to go to different step
+7. unclear - Cannot determine intent"""
 
-    # Help request patterns
-    HELP_PATTERNS = [
-        r'\bhelp\b', r'\bstuck\b', r'\bconfused\b',
-        r'\bdon\'t understand\b', r'\bexplain\b'
-    ]
+    # Data-looking replies (addresses, phones, emails, "45 rooms, 3 types")
+    DATA_HINT_RE = re.compile(r'[\d@,]')
+    DATA_MAX_LENGTH = 80
 
-    def __init__(self):
+    def __init__(self, gpt_fallback_enabled: bool = True):
+        """
+        Args:
+            gpt_fallback_enabled: Classify unmatched messages with GPT-4o.
+                When False, they default to PROVIDE_DATA (used to pin
+                behavior in tests).
+        """
         self.client = get_openai_client()
+        self.gpt_fallback_enabled = gpt_fallback_enabled
 
     def detect_intent(
         self,
@@ -105,58 +167,218 @@ class IntentDetector:
         Returns:
             Tuple of (Intent, confidence 0-1)
         """
-        message_lower = message.lower().strip()
+        # Fast pattern matching / heuristics first
+        fast_result = self._fast_classify(message.strip())
+        if fast_result:
+            return fast_result
 
-        # Fast pattern matching first
-        pattern_result = self._pattern_match(message_lower)
-        if pattern_result:
-            return pattern_result
+        if not self.gpt_fallback_enabled:
+            return (Intent.PROVIDE_DATA, 0.5)
 
         # Fall back to GPT-4o for ambiguous cases
         return self._classify_with_gpt(message, context or {})
 
-    def _pattern_match(self, message: str) -> Tuple[Intent, float]:
+    def needs_gpt(self, message: str) -> bool:
+        """True if detect_intent() would have to call GPT for this message."""
+        return self.gpt_fallback_enabled and self._fast_classify(message.strip()) is None
+
+    def classify_batch(
+        self,
+        messages: List[str],
+        contexts: List[Dict] = None
+    ) -> List[Tuple[Intent, float]]:
         """
-        Fast pattern-based intent detection.
+        Detect intents for several messages with at most ONE GPT-4o call.
+
+        Messages resolved by pattern matching never reach GPT; the rest
+        are packed into a single prompt so the instructions are sent once.
+        Messages missing from the batch response (or a failed batch) fall
+        back to per-message classification.
 
         Args:
-            message: Lowercase message text
+            messages: User message texts
+            contexts: Optional per-message contexts (same keys as detect_intent)
 
         Returns:
-            Tuple of (Intent, confidence) or None if no match
+            List of (Intent, confidence), aligned with messages
         """
-        # Check for URL
+        contexts = contexts or [{}] * len(messages)
+        results: List[Optional[Tuple[Intent, float]]] = [
+            self._fast_classify(message.strip()) for message in messages
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if not pending:
+            return results
+
+        if not self.gpt_fallback_enabled:
+            for i in pending:
+                results[i] = (Intent.PROVIDE_DATA, 0.5)
+            return results
+
+        # Reuse memoized GPT classifications
+        cache_keys = {
+            i: self._classification_cache_key(messages[i], contexts[i] or {})
+            for i in pending
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+        for i, key in cache_keys.items():
+            if key in cached:
+                intent_value, confidence = cached[key]
+                results[i] = (Intent(intent_value), confidence)
+        pending = [i for i in pending if results[i] is None]
+
+        if not pending:
+            return results
+
+        batch = [
+            {
+                "id": i,
+                "message": messages[i],
+                "current_state": (contexts[i] or {}).get('current_state', 'unknown'),
+                "waiting_for": (contexts[i] or {}).get('pending_field', 'user response'),
+            }
+            for i in pending
+        ]
+
+        prompt = f"""
+Classify the user's intent for EACH message below.
+
+MESSAGES:
+{json.dumps(batch, ensure_ascii=False)}
+
+POSSIBLE INTENTS:
+{self.INTENT_OPTIONS}
+
+Respond with JSON:
+{{
+    "results": [
+        {{"id": <message id>, "intent": "one of the intents above", "confidence": 0.0-1.0}}
+    ]
+}}
+"""
+
+        by_id = {}
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an intent classification assistant. Always respond with valid JSON."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.1,  # Low for consistent classification
+                max_tokens=40 * len(pending) + 50,
+                response_format={"type": "json_object"}
+            )
+
+            parsed = json_loads(response.choices[0].message.content)
+            by_id = {
+                item.get("id"): item
+                for item in parsed.get("results", [])
+                if isinstance(item, dict)
+            }
+        except Exception:
+            logger.error("GPT batch classification error", exc_info=True)
+
+        for i in pending:
+            item = by_id.get(i)
+            if item is None:
+                results[i] = self._classify_with_gpt(messages[i], contexts[i] or {})
+            else:
+                results[i] = (
+                    self._to_intent(item.get("intent", "unclear")),
+                    item.get("confidence", 0.5)
+                )
+                cache.set(
+                    cache_keys[i],
+                    (results[i][0].value, results[i][1]),
+                    CLASSIFICATION_CACHE_TIMEOUT
+                )
+
+        return results
+
+    def _fast_classify(self, message: str) -> Optional[Tuple[Intent, float]]:
+        """
+        Classify without GPT: URL, patterns, then the data heuristic.
+
+        Args:
+            message: Stripped message text (original case)
+
+        Returns:
+            Tuple of (Intent, confidence) or None if GPT is needed
+        """
+        # URL check runs on the raw text, so URL replies skip case folding
         if self.URL_PATTERN.search(message):
             return (Intent.PROVIDE_URL, 0.95)
 
-        # Check for confirmation
-        for pattern in self.CONFIRM_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                return (Intent.CONFIRM, 0.90)
+        pattern_result = self._pattern_match(message.casefold())
+        if pattern_result:
+            return pattern_result
 
-        # Check for rejection
-        for pattern in self.REJECT_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                return (Intent.REJECT, 0.90)
+        # Short data-looking replies don't need an LLM round-trip
+        if self._looks_like_data(message):
+            return (Intent.PROVIDE_DATA, 0.7)
 
-        # Check for questions
-        for pattern in self.QUESTION_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                return (Intent.ASK_QUESTION, 0.85)
+        return None
 
-        # Check for edit requests
-        for pattern in self.EDIT_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                return (Intent.EDIT_REQUEST, 0.85)
+    def _pattern_match(self, message: str) -> Tuple[Intent, float]:
+        """
+        Fast pattern-based intent detection (URLs are checked by the caller).
 
-        # Check for help
-        for pattern in self.HELP_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                return (Intent.REQUEST_HELP, 0.90)
+        Args:
+            message: Casefolded message text
+
+        Returns:
+            Tuple of (Intent, confidence) or None if no match
+        """
+        # A leading ✓/👍 or ✗/❌/👎 is an explicit answer
+        if message:
+            if message[0] in self.CONFIRM_EMOJIS:
+                return (Intent.CONFIRM, 0.95)
+            if message[0] in self.REJECT_EMOJIS:
+                return (Intent.REJECT, 0.95)
+
+        words = self.WORD_RE.findall(message)
+        tokens = set(words)
+        if message.endswith('?'):
+            tokens.add('?')
+
+        phrase_groups = set()
+        phrase_words = tokens.intersection(self.PHRASE_INDEX)
+        if phrase_words:
+            token_text = f" {' '.join(words)} "
+            for word in phrase_words:
+                for group, phrase in self.PHRASE_INDEX[word]:
+                    if phrase in token_text:
+                        phrase_groups.add(group)
+
+        # First category (in precedence order) hit by a token or a phrase
+        for group, group_words, _ in self.INTENT_RULES:
+            if group in phrase_groups or not tokens.isdisjoint(group_words):
+                return self.GROUP_INTENTS[group]
 
         # No pattern match
         return None
 
+    def _looks_like_data(self, message: str) -> bool:
+        """
+        Heuristic for messages that are plainly answers, not questions.
+
+        True for short messages without a question mark that contain
+        a digit, "@" or a comma (addresses, phone numbers, emails, lists).
+        """
+        return (
+            len(message) < self.DATA_MAX_LENGTH
+            and '?' not in message
+            and self.DATA_HINT_RE.search(message) is not None
+        )
+
     def _classify_with_gpt(self, message: str, context: Dict) -> Tuple[Intent, float]:
         """
         Use GPT-4o to classify intent for ambiguous messages.
@@ -168,6 +390,12 @@ class IntentDetector:
         Returns:
             Tuple of (Intent, confidence)
         """
+        cache_key = self._classification_cache_key(message, context)
+        cached = cache.get(cache_key)
+        if cached:
+            intent_value, confidence = cached
+            return (Intent(intent_value), confidence)
+
         prompt = f"""
 Classify the user's intent from this message.
 
@@ -179,13 +407,7 @@ CONTEXT:
 - Waiting for: {context.get('pending_field', 'user response')}
 
 POSSIBLE INTENTS:
-1. provide_data - User is providing requested information (hotel name, address, etc.)
-2. ask_question - User is asking for clarification or help
-3. confirm - User is agreeing/confirming
-4. reject - User is disagreeing/declining
-5. edit_request - User wants to change something
-6. navigate - User wants to go to different step
-7. unclear - Cannot determine intent
+{self.INTENT_OPTIONS}
 
 Respond with JSON:
 {{
@@ -213,26 +435,38 @@ Respond with JSON:
                 response_format={"type": "json_object"}
             )
 
-            import json
-            result = json.loads(response.choices[0].message.content)
+            result = json_loads(response.choices[0].message.content)
 
             # Map string to enum
-            intent_str = result.get("intent", "unclear")
+            intent = self._to_intent(result.get("intent", "unclear"))
             confidence = result.get("confidence", 0.5)
 
-            try:
-                intent = Intent(intent_str)
-            except ValueError:
-                intent = Intent.UNCLEAR
+            cache.set(cache_key, (intent.value, confidence), CLASSIFICATION_CACHE_TIMEOUT)
 
             return (intent, confidence)
 
-        except Exception as e:
-            print(f"GPT classification error: {e}")
+        except Exception:
+            logger.error("GPT classification error", exc_info=True)
             # Default to PROVIDE_DATA for unknown messages
             # (assume user is answering the question)
             return (Intent.PROVIDE_DATA, 0.5)
 
+    def _classification_cache_key(self, message: str, context: Dict) -> str:
+        """Cache key for a GPT classification of message in this context."""
+        raw = "|".join([
+            message.lower().strip(),
+            str(context.get('current_state', '')),
+            str(context.get('pending_field', '')),
+        ])
+        return "intent:" + hashlib.sha1(raw.encode()).hexdigest()
+
+    def _to_intent(self, intent_str: str) -> Intent:
+        """Map GPT's intent string to Intent (UNCLEAR if unknown)."""
+        try:
+            return Intent(intent_str)
+        except ValueError:
+            return Intent.UNCLEAR
+
     def extract_url_from_message(self, message: str) -> str:
         """
         Extract URL from message if present.
@@ -247,3 +481,21 @@ Respond with JSON:
         if match:
             return match.group(0)
         return None
+
+
+shared_intent_detector = None
+
+
+def get_intent_detector() -> IntentDetector:
+    """
+    Get or create the process-wide IntentDetector.
+
+    It holds no per-request state, so one instance (and its OpenAI client)
+    serves every NoraAgent.
+    """
+    global shared_intent_detector
+
+    if shared_intent_detector is None:
+        shared_intent_detector = IntentDetector()
+
+    return shared_intent_detector
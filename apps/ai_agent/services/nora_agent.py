@@ -2,19 +2,304 @@
 Main Nora Agent service - orchestrates all AI interactions
 """
 
+import re
 import asyncio
 import json
-from typing import Dict, Optional
+import logging
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+from asgiref.sync import sync_to_async, async_to_sync
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
 from apps.ai_agent.models import NoraContext
 from apps.core.models import Organization
-from .openai_config import get_openai_client, NORA_SYSTEM_PROMPT, GPT4O_CONFIG
+from .openai_config import (
+    get_openai_client, get_async_openai_client, get_classifier_model,
+    get_token_encoding, estimate_tokens, nora_system_message, create_chat_completion,
+    NORA_SYSTEM_PROMPT, EXTRACTION_SYSTEM_PROMPT, GPT4O_CONFIG
+)
 from .conversation_engine import OnboardingEngine, OnboardingState
-from .intent_detector import IntentDetector, Intent
-from .data_extractor import DataExtractor
+from .intent_detector import IntentDetector, Intent, get_intent_detector
+from .data_extractor import get_data_extractor
 from .content_formatter import ContentFormatter
 from .google_places_service import GooglePlacesService
 from .research_orchestrator import ResearchOrchestrator
+from .perplexity_service import get_perplexity_service
+from .data_generator import DataGenerator
+from .semantic_cache import SemanticCache, semantic_cache_enabled
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Runs data extraction speculatively alongside GPT intent classification.
+# Bounded so a burst can't fan out into unlimited wasted extraction calls.
+speculation_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="nora-speculate")
+
+# Runs Perplexity research started before the turn that needs it (see
+# NoraAgent.prefetch_hotel_information). In-flight futures are tracked by
+# research_cache_key; finished results move to the cache so any worker can use them.
+research_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nora-research")
+research_futures: Dict[str, Future] = {}
+RESEARCH_CACHE_TIMEOUT = 60 * 30
+RESEARCH_WAIT_TIMEOUT = 30  # seconds to wait on research still in flight
+
+# Address confirmation replies are almost always one or two words, so they
+# are classified locally; GPT is only asked when neither vocabulary matches.
+# Denials are checked first ("not right" contains "right").
+ADDRESS_DENY_RE = re.compile(
+    r"\b(no|nope|nah|wrong|incorrect|not\s+(?:right|correct|it)|isn'?t)\b", re.IGNORECASE
+)
+ADDRESS_CONFIRM_RE = re.compile(
+    r"\b(yes|yeah|yep|yup|correct|right|confirm(?:ed)?|ok|okay|sure|exactly)\b", re.IGNORECASE
+)
+
+# Static system prompts. All per-call content goes in the user message, after
+# this prefix, so the prefix is identical across calls for OpenAI prompt caching.
+ADDRESS_CLASSIFIER_PROMPT = (
+    "You are analyzing user responses to determine if they are confirming or denying. "
+    "The user was asked if an address is correct. Confirming means yes/correct/right, "
+    "denying means no/wrong/incorrect. Respond with a single letter: "
+    "C (confirming), D (denying) or U (unclear)."
+)
+
+# Single-letter classifier answers
+ADDRESS_REPLY_LABELS = {"C": "CONFIRM", "D": "DENY", "U": "UNCLEAR"}
+address_label_bias: Optional[Dict[str, int]] = None  # see address_label_logit_bias
+
+# One call for an ambiguous address-confirmation reply that may also carry
+# the details still missing ("no, it's 12 Main St, Concord NH")
+CONFIRM_AND_EXTRACT_PROMPT = (
+    "The user was asked if an address is correct. Their reply may also contain hotel details.\n"
+    "Return JSON with two keys:\n"
+    '- "confirmation": "CONFIRM", "DENY" or "UNCLEAR" '
+    "(confirming means yes/correct/right, denying means no/wrong/incorrect)\n"
+    '- "extracted": an object with the fields below (null for anything not mentioned)\n\n'
+    + EXTRACTION_SYSTEM_PROMPT
+)
+
+# Fields the extraction call can return. Sent as a strict function tool, so
+# OpenAI constrains decoding to this schema and the arguments always parse.
+EXTRACTED_FIELDS = (
+    "hotel_name", "city", "state", "country", "contact_email", "phone", "website",
+)
+
+EXTRACT_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_hotel_data",
+        "description": "Record the hotel details found in the user message (null for anything not mentioned).",
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "properties": {field: {"type": ["string", "null"]} for field in EXTRACTED_FIELDS},
+            "required": list(EXTRACTED_FIELDS),
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Contact details that parse deterministically, without an extraction call
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"\+?\d(?:[\s\-().]*\d){6,}")
+
+US_STATES = frozenset({
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL',
+    'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT',
+    'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI',
+    'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+})
+
+# Field names as Nora asks for them
+HUMAN_FRIENDLY_FIELDS = {
+    'contact_email': 'your email address',
+    'hotel_name': 'your hotel name',
+    'city': 'the city',
+    'state': 'the state/province',
+    'country': 'the country',
+    'phone': 'a phone number',
+    'website': 'your website',
+    'street_address': 'the street address',
+    'full_address': 'the full address',
+}
+
+# Follow-ups for fields still missing after a data reply, keyed by
+# (anything updated this turn, exactly one field missing)
+MISSING_FIELDS_TEMPLATES = {
+    (True, True): "Perfect! One more thing - what's {}?",
+    (True, False): "Great! I still need {}. Can you share those with me?",
+    (False, True): "What's {}?",
+    (False, False): "I need a few more details: {}. Can you help me with those?",
+}
+
+# Fields with their own wording when they are the only one missing,
+# indexed by whether anything was updated this turn
+SINGLE_FIELD_FOLLOWUPS = {
+    'contact_email': {
+        True: "Perfect! Last thing - what's your email address?",
+        False: "What's your email address?",
+    },
+    'phone': {
+        True: "Perfect! Last thing - what's your phone number?",
+        False: "What's your phone number?",
+    },
+}
+
+
+def missing_fields_message(missing: list, updated: bool) -> str:
+    """
+    Ask for the fields still missing after a data reply.
+
+    Args:
+        missing: Missing field names (non-empty)
+        updated: Whether this reply filled in any field
+    """
+    updated = bool(updated)
+
+    if len(missing) == 1 and missing[0] in SINGLE_FIELD_FOLLOWUPS:
+        return SINGLE_FIELD_FOLLOWUPS[missing[0]][updated]
+
+    friendly = [HUMAN_FRIENDLY_FIELDS.get(field, field.replace('_', ' ')) for field in missing]
+
+    if len(friendly) == 1:
+        names = friendly[0]
+    elif not updated:
+        names = ', '.join(friendly)
+    elif len(friendly) == 2:
+        names = ' and '.join(friendly)
+    else:
+        names = ', '.join(friendly[:-1]) + ', and ' + friendly[-1]
+
+    return MISSING_FIELDS_TEMPLATES[(updated, len(friendly) == 1)].format(names)
+
+
+def address_label_logit_bias() -> Dict[str, int]:
+    """
+    logit_bias restricting the classifier to the C/D/U label tokens.
+
+    Empty without tiktoken (token ids unknown); the one-token limit and
+    label parsing still apply. Only a bias built from the encoding is kept,
+    so it is picked up once an encoding that failed to load becomes available.
+    """
+    global address_label_bias
+
+    if address_label_bias is not None:
+        return address_label_bias
+
+    encoding = get_token_encoding()
+    if encoding is None:
+        return {}
+
+    bias = {}
+    for label in ADDRESS_REPLY_LABELS:
+        for text in (label, f" {label}"):
+            tokens = encoding.encode(text)
+            if len(tokens) == 1:
+                bias[str(tokens[0])] = 100
+
+    address_label_bias = bias
+    return bias
+
+
+def present_fields(extracted: Dict) -> Dict:
+    """
+    Drop fields the extractor left empty.
+
+    None, blank strings and the literal "null" some GPT replies use are
+    skipped; any other value is kept as-is.
+    """
+    return {
+        key: value
+        for key, value in extracted.items()
+        if (value.strip() and value != "null" if isinstance(value, str) else value is not None)
+    }
+
+
+def research_cache_key(context_id: int, hotel_name: Optional[str], location: Optional[str]) -> str:
+    """
+    Cache key for a NoraContext's prefetched Perplexity research.
+
+    Covers the searched hotel, so research for one hotel is never served
+    after the user searches for another.
+    """
+    query = "|".join((part or "").strip().lower() for part in (hotel_name, location))
+    return f"nora:research:{context_id}:" + hashlib.sha256(query.encode()).hexdigest()
+
+
+def classify_address_reply(user_message: str) -> Optional[str]:
+    """
+    Classify a reply to "is this address correct?" without calling GPT.
+
+    Returns:
+        "CONFIRM", "DENY", or None if the reply is ambiguous
+    """
+    message = user_message.strip()
+    if ADDRESS_DENY_RE.search(message):
+        return "DENY"
+    if ADDRESS_CONFIRM_RE.search(message):
+        return "CONFIRM"
+    return None
+
+
+def extract_contact_fields(user_message: str) -> Dict:
+    """
+    Parse contact_email, phone, website and a bare US state code locally.
+
+    Returns:
+        Dict with only the fields that were found
+    """
+    fields = {}
+
+    email = EMAIL_RE.search(user_message)
+    if email:
+        fields["contact_email"] = email.group(0)
+
+    url = IntentDetector.URL_PATTERN.search(user_message)
+    if url:
+        fields["website"] = url.group(0)
+
+    # Drop emails/URLs first so their digits aren't read as a phone number
+    remainder = EMAIL_RE.sub(" ", IntentDetector.URL_PATTERN.sub(" ", user_message))
+    phone = PHONE_RE.search(remainder)
+    if phone:
+        fields["phone"] = phone.group(0)
+
+    # Only a message that is nothing but a state code ("NH") is unambiguous
+    state_code = user_message.strip().upper()
+    if state_code in US_STATES:
+        fields["state"] = state_code
+
+    return fields
+
+
+def trim_history_to_budget(conversation_history: list, budget: int) -> list:
+    """
+    Newest messages of a conversation that fit in a token budget.
+
+    Walks back from the newest message; the newest is always kept. Each
+    message's token count is stored on it under "tokens", so history saved
+    with the context isn't re-encoded on every turn.
+    """
+    kept = []
+    used = 0
+
+    for msg in reversed(conversation_history):
+        tokens = msg.get("tokens")
+        if tokens is None:
+            tokens = msg["tokens"] = estimate_tokens(msg["content"])
+
+        used += tokens
+        if kept and used > budget:
+            break
+        kept.append(msg)
+
+    kept.reverse()
+    return kept
 
 
 class NoraAgent:
@@ -33,18 +318,85 @@ class NoraAgent:
         self.organization = organization
         self.client = get_openai_client()
 
-        # Get or create Nora context
-        self.context, created = NoraContext.objects.get_or_create(
-            user=user,
-            organization=organization
-        )
+        # Get or create Nora context (cached between requests when possible)
+        self.context = NoraContext.get_cached(user=user, organization=organization)
 
         # Initialize service components
-        self.intent_detector = IntentDetector()
-        self.data_extractor = DataExtractor()
+        self.intent_detector = get_intent_detector()
+        self.data_extractor = get_data_extractor()
         self.content_formatter = ContentFormatter()
         self.google_places = GooglePlacesService()
 
+        # Routes this organization's requests to the same prompt-cache shard
+        self._prompt_cache_key = f"nora:{organization.id}"
+
+        # Reuses general conversation replies for near-duplicate questions
+        self.semantic_cache = (
+            SemanticCache(organization.id, NORA_SYSTEM_PROMPT) if semantic_cache_enabled() else None
+        )
+
+        # Onboarding engine over context.task_state (see get_engine)
+        self._engine = None
+
+        # Context writes still running after an async reply was returned
+        self._pending_writes = set()
+
+    def get_engine(self) -> OnboardingEngine:
+        """
+        Get the OnboardingEngine for the current task_state.
+
+        Reused across handlers; rebuilt only when task_state is replaced
+        (set_active_task / complete_task) or its step changes outside the engine.
+        """
+        task_state = self.context.task_state
+
+        if (
+            self._engine is None
+            or self._engine.task_state is not task_state
+            or self._engine.task_state.get("step", "hotel_basics") != self._engine.current_state.value
+        ):
+            self._engine = OnboardingEngine(task_state)
+
+        return self._engine
+
+    @classmethod
+    async def acreate(cls, user: User, organization: Organization) -> "NoraAgent":
+        """Create an agent from async code (loads NoraContext in a worker thread)."""
+        return await sync_to_async(cls)(user, organization)
+
+    async def aprocess_message(self, user_message: str) -> Dict:
+        """
+        Async variant of process_message for ASGI callers.
+
+        General conversation awaits the AsyncOpenAI client while the user
+        message is saved, so the DB write overlaps the OpenAI round-trip.
+        Address confirmation and onboarding run the sync handlers via
+        sync_to_async. Await aclose() before the event loop ends so the
+        background context writes finish.
+        """
+        # The previous turn's writes must land before history is read again
+        await self.aclose()
+
+        if (
+            self.context.task_state.get("_awaiting_address_confirmation")
+            or self.context.active_task == "onboarding"
+        ):
+            return await sync_to_async(self.process_message)(user_message)
+
+        return await self._ahandle_general_message(user_message)
+
+    async def aclose(self):
+        """Wait for background context writes started by aprocess_message"""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+
+    def _track_write(self, coro) -> asyncio.Task:
+        """Run a context write in the background, tracked until it finishes"""
+        task = asyncio.create_task(coro)
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+        return task
+
     def process_message(self, user_message: str) -> Dict:
         """
         Process a user message and return Nora's response.
@@ -59,7 +411,21 @@ class NoraAgent:
                 "action": "...",  # Optional action to take (e.g., "show_preview")
             }
         """
-
+        # AI-First research publishes progress through context saves as it
+        # runs, so those turns can't be collapsed into one write
+        if (
+            self.context.active_task == "onboarding"
+            and self.context.task_state.get("ai_first_mode")
+            and not self.context.task_state.get("_awaiting_address_confirmation")
+        ):
+            return self._route_message(user_message)
+
+        # One context UPDATE per turn instead of one per mutation
+        with self.context.batch_saves():
+            return self._route_message(user_message)
+
+    def _route_message(self, user_message: str) -> Dict:
+        """Record the user message and dispatch it to the matching handler"""
         # Add user message to context
         self.context.add_message(role="user", content=user_message)
 
@@ -74,6 +440,29 @@ class NoraAgent:
         # Otherwise, general conversation
         return self._handle_general_message(user_message)
 
+    def process_message_stream(self, user_message: str) -> Iterator[Dict]:
+        """
+        Process a user message, streaming Nora's reply as it is generated.
+
+        General conversation streams GPT-4o tokens; address confirmation and
+        onboarding replies are produced whole, as one delta.
+
+        Yields:
+            {"type": "delta", "content": "text chunk"} events, then one
+            {"type": "done", "message": ..., "data": ..., "action": ...}
+        """
+        if (
+            self.context.task_state.get("_awaiting_address_confirmation")
+            or self.context.active_task == "onboarding"
+        ):
+            response = self.process_message(user_message)
+            yield {"type": "delta", "content": response["message"]}
+            yield {"type": "done", **response}
+            return
+
+        self.context.add_message(role="user", content=user_message)
+        yield from self._handle_general_message_stream()
+
     def _handle_address_confirmation(self, user_message: str) -> Dict:
         """
         Handle user's response to address confirmation.
@@ -81,36 +470,51 @@ class NoraAgent:
         If user confirms (yes, correct, that's right, etc.), show Perplexity data.
         If user denies (no, wrong, incorrect), ask for correct address.
         """
-        import logging
-        logger = logging.getLogger(__name__)
 
-        # Use GPT-4o to detect if this is a confirmation or denial
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are analyzing user responses to determine if they are confirming or denying. Respond with only 'CONFIRM' or 'DENY' or 'UNCLEAR'."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"User was asked if an address is correct. They responded: '{user_message}'. Are they confirming (yes/correct/right) or denying (no/wrong/incorrect)?"
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=10
-            )
+            engine = self.get_engine()
+            missing_fields = engine.get_missing_fields()
+
+            # Keyword match first; use the classifier model only for ambiguous replies
+            intent = classify_address_reply(user_message)
+
+            if intent is None and missing_fields:
+                # Classify and pick up any missing details in one round-trip
+                intent, extracted = self._combined_classify_and_extract(
+                    user_message, missing_fields
+                )
+                engine.update_fields(present_fields(extracted))
+
+            elif intent is None:
+                # One-token answer, biased onto the three label tokens
+                logit_bias = address_label_logit_bias()
+                response = create_chat_completion(
+                    self.client,
+                    model=get_classifier_model(),
+                    messages=[
+                        {"role": "system", "content": ADDRESS_CLASSIFIER_PROMPT},
+                        {"role": "user", "content": f"They responded: '{user_message}'"}
+                    ],
+                    temperature=0.1,
+                    max_tokens=1,
+                    prompt_cache_key=self._prompt_cache_key,
+                    **({"logit_bias": logit_bias} if logit_bias else {})
+                )
+
+                label = (response.choices[0].message.content or "").strip().upper()[:1]
+                intent = ADDRESS_REPLY_LABELS.get(label, "UNCLEAR")
 
-            intent = response.choices[0].message.content.strip().upper()
             logger.info(f"Address confirmation intent: {intent}")
 
             if "CONFIRM" in intent:
                 # User confirmed! Clear flag and show Perplexity description
                 self.context.task_state["_awaiting_address_confirmation"] = False
 
-                # Get Perplexity data
-                perplexity_data = self.context.task_state.get("_perplexity_pending", {})
+                # Get Perplexity data (usually prefetched while the user read the address)
+                perplexity_data = (
+                    self.context.task_state.pop("_perplexity_pending", None)
+                    or self._take_prefetched_research()
+                )
 
                 # Move Perplexity data from pending to confirmed
                 if perplexity_data:
@@ -123,7 +527,6 @@ class NoraAgent:
                         "hotel_style": perplexity_data.get("hotel_style"),
                         "notable_facts": perplexity_data.get("notable_facts"),
                     })
-                    del self.context.task_state["_perplexity_pending"]
 
                 self.context.save()
 
@@ -135,24 +538,12 @@ class NoraAgent:
                 message = f"Perfect! Based on my research, here's what I found: {general_info}\n\nKey amenities include: {amenities_str}."
 
                 # Check what's missing for hotel basics
-                from apps.ai_agent.services.conversation_engine import OnboardingEngine
-                engine = OnboardingEngine(self.context.task_state)
                 missing = engine.get_missing_fields()
 
-                # Human-friendly field names
-                human_friendly = {
-                    'contact_email': 'your email address',
-                    'phone': 'a phone number',
-                    'website': 'your website',
-                    'state': 'the state/province',
-                    'country': 'the country',
-                    'full_address': 'the full address',
-                }
-
                 if missing and 'contact_email' in missing:
                     message += f"\n\nLast thing I need for your property info - what's the best email to reach you at?"
                 elif missing:
-                    missing_friendly = [human_friendly.get(field, field.replace('_', ' ')) for field in missing]
+                    missing_friendly = [HUMAN_FRIENDLY_FIELDS.get(field, field.replace('_', ' ')) for field in missing]
                     message += f"\n\nI still need {', '.join(missing_friendly)}. Can you share those with me?"
                 else:
                     message += "\n\nPerfect! Now let's set up your room types. How many different types of rooms do you have?"
@@ -166,8 +557,9 @@ class NoraAgent:
                 }
 
             elif "DENY" in intent:
-                # User denied - ask for correction
+                # User denied - ask for correction, dropping research for the wrong hotel
                 self.context.task_state["_awaiting_address_confirmation"] = False
+                self._discard_prefetched_research()
                 self.context.save()
 
                 message = "No worries! Can you give me the correct address?"
@@ -195,6 +587,97 @@ class NoraAgent:
             # Fallback to general message handling
             return self._handle_general_message(user_message)
 
+    def prefetch_hotel_information(self, hotel_name: str, location: Optional[str] = None):
+        """
+        Start Perplexity research in the background.
+
+        The result is only needed once the user confirms the address, so the
+        2-5s call runs while they read the confirmation question. Collected
+        by _take_prefetched_research(); the caller saves the context.
+        """
+        # Research from an earlier search is for another hotel (or is stale)
+        self._discard_prefetched_research()
+
+        key = research_cache_key(self.context.id, hotel_name, location)
+        self.context.task_state["_perplexity_query"] = {"hotel_name": hotel_name, "location": location}
+
+        def cache_result(future: Future):
+            if not future.cancelled() and future.exception() is None:
+                cache.set(key, future.result(), RESEARCH_CACHE_TIMEOUT)
+            # A newer prefetch of the same hotel may have replaced this one
+            if research_futures.get(key) is future:
+                research_futures.pop(key, None)
+
+        future = research_executor.submit(
+            get_perplexity_service().get_hotel_information, hotel_name=hotel_name, location=location
+        )
+        research_futures[key] = future
+        future.add_done_callback(cache_result)
+
+    def _discard_prefetched_research(self):
+        """Forget the pending prefetch query and its cached research (caller saves the context)"""
+        query = self.context.task_state.pop("_perplexity_query", None)
+        if query is not None:
+            cache.delete(research_cache_key(self.context.id, **query))
+
+    def _take_prefetched_research(self) -> Dict:
+        """
+        Collect research started by prefetch_hotel_information().
+
+        Waits on research still in flight in this process, then checks the
+        cache, and only calls Perplexity directly if neither has it.
+
+        Returns:
+            Perplexity hotel information, or {} if none/failed
+        """
+        query = self.context.task_state.pop("_perplexity_query", None)
+        if query is None:
+            return {}
+
+        key = research_cache_key(self.context.id, **query)
+        future = research_futures.get(key)
+
+        try:
+            if future is not None:
+                hotel_info = future.result(timeout=RESEARCH_WAIT_TIMEOUT)
+            else:
+                hotel_info = cache.get(key) or get_perplexity_service().get_hotel_information(**query)
+        except Exception as e:
+            logger.error(f"Error collecting prefetched research: {str(e)}")
+            return {}
+
+        return {} if "error" in hotel_info else hotel_info
+
+    def _combined_classify_and_extract(
+        self, user_message: str, missing_fields: list
+    ) -> Tuple[str, Dict]:
+        """
+        Classify an address-confirmation reply and extract data in one GPT call.
+
+        Returns:
+            Tuple of ("CONFIRM" | "DENY" | "UNCLEAR", extracted fields dict)
+        """
+        response = create_chat_completion(
+            self.client,
+            model=get_classifier_model(),
+            messages=[
+                {"role": "system", "content": CONFIRM_AND_EXTRACT_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"MISSING FIELDS: {', '.join(missing_fields)}\n\nUSER MESSAGE: \"{user_message}\"",
+                },
+            ],
+            temperature=0.1,
+            max_tokens=300,
+            response_format={"type": "json_object"},
+            prompt_cache_key=self._prompt_cache_key
+        )
+
+        result = json_loads(response.choices[0].message.content)
+        confirmation = str(result.get("confirmation") or "UNCLEAR").upper()
+
+        return confirmation, result.get("extracted") or {}
+
     def _handle_onboarding_message(self, user_message: str) -> Dict:
         """
         Handle message during onboarding flow.
@@ -213,8 +696,17 @@ class NoraAgent:
                 return self.process_message_ai_first(user_message)
 
             # Traditional Q&A flow (fallback)
-            # Initialize onboarding engine with current state
-            engine = OnboardingEngine(self.context.task_state)
+            # Onboarding engine over the current state
+            engine = self.get_engine()
+
+            # If intent needs a GPT call, start extraction alongside it: most
+            # onboarding replies are data, so this usually saves a round-trip
+            extraction = None
+            missing_fields = engine.get_missing_fields()
+            if missing_fields and self.intent_detector.needs_gpt(user_message):
+                extraction = speculation_executor.submit(
+                    self._extract_data, user_message, engine.current_state, missing_fields
+                )
 
             # Detect intent
             intent, confidence = self.intent_detector.detect_intent(
@@ -225,12 +717,16 @@ class NoraAgent:
                 }
             )
 
+            # Not data after all: drop the speculative extraction if still queued
+            if extraction and intent != Intent.PROVIDE_DATA:
+                extraction.cancel()
+
             # Handle based on intent and current state
             if intent == Intent.PROVIDE_URL:
                 return self._handle_website_url(user_message, engine)
 
             elif intent == Intent.PROVIDE_DATA:
-                return self._handle_data_provision(user_message, engine)
+                return self._handle_data_provision(user_message, engine, extraction)
 
             elif intent == Intent.ASK_QUESTION:
                 return self._handle_question(user_message, engine)
@@ -254,8 +750,6 @@ class NoraAgent:
                 return self._handle_unclear(user_message, engine)
 
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error in onboarding message handler: {str(e)}", exc_info=True)
             return {
                 "message": "I'm having trouble processing that. Let's try again - what would you like to tell me?",
@@ -287,18 +781,19 @@ class NoraAgent:
             }
 
         # Success! Save extracted data to task_state
-        for key, value in extracted_data.items():
-            if value and key != "error" and key != "confidence":
-                engine.update_field(key, value)
-
-        # Enrich with Google Places (GPS, timezone, photos)
+        engine.update_fields({
+            key: value for key, value in extracted_data.items()
+            if value and key != "error" and key != "confidence"
+        })
+
+        # Enrich with Google Places (GPS, timezone, photos). The search needs
+        # the name and city extracted above, so it can't overlap extraction;
+        # smart defaults below are a local lookup.
         hotel_name = extracted_data.get("hotel_name")
         city = extracted_data.get("city")
         state = extracted_data.get("state")
 
         if hotel_name and city and self.google_places.client:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.info(f"Enriching {hotel_name}, {city} with Google Places data...")
 
             places_data = self.google_places.search_hotel(hotel_name, city, state)
@@ -333,9 +828,7 @@ class NoraAgent:
                 state=state,
                 city=city
             )
-            for key, value in defaults.items():
-                if value:
-                    engine.update_field(key, value)
+            engine.update_fields({key: value for key, value in defaults.items() if value})
 
         self.context.update_task_state(self.context.task_state)
 
@@ -365,86 +858,87 @@ class NoraAgent:
             "action": "show_extracted_data"
         }
 
-    def _handle_data_provision(self, user_message: str, engine: OnboardingEngine) -> Dict:
-        """Handle when user is providing data (answering questions)"""
-        # Use GPT-4o to extract structured data from message
-        missing_fields = engine.get_missing_fields()
+    def _extract_data(
+        self, user_message: str, current_state: OnboardingState, missing_fields: list
+    ) -> Dict:
+        """
+        Extract structured hotel data from a message.
 
-        prompt = f"""
-Extract hotel information from this user message.
+        Emails, phones, URLs and state codes parse locally; GPT is only
+        called when they don't cover every missing field. No DB access, so
+        it is safe to run on the speculation executor.
+        """
+        local_fields = extract_contact_fields(user_message)
 
-USER MESSAGE: "{user_message}"
+        if local_fields and set(missing_fields) <= local_fields.keys():
+            return local_fields
 
-CURRENT ONBOARDING STEP: {engine.current_state.value}
+        prompt = f"""CURRENT ONBOARDING STEP: {current_state.value}
 MISSING FIELDS: {', '.join(missing_fields)}
 
-Extract any relevant data and return as JSON. Focus especially on the missing fields.
-
-Important:
-- For emails: Look for any email address pattern (user@domain.com)
-- For phone: Look for any phone number pattern
-- For addresses: Extract city, state/province, and country separately
-- State codes like "NH", "CA", "NY" are US states, not countries
-- If user provides just an email, extract it as contact_email
-- If user provides just a phone, extract it as phone
-- Always include the field even if it seems short (e.g., just "john@hotel.com")
-
-Return JSON with these possible fields:
-{{
-    "hotel_name": "name if mentioned or null",
-    "city": "city if mentioned or null",
-    "state": "state or province if mentioned or null",
-    "country": "country if mentioned or null",
-    "contact_email": "email if mentioned or null",
-    "phone": "phone if mentioned or null",
-    "website": "website URL if mentioned or null"
-}}
-
-CRITICAL: If the message contains an email address, you MUST extract it as contact_email.
-CRITICAL: Do NOT confuse US states (NH, NY, CA, etc.) with countries. Extract them as "state".
-CRITICAL: Use null (not "null" string) for missing data.
+USER MESSAGE: "{user_message}"
 """
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a precise data extraction assistant. Extract emails and data accurately. Respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=300,
-                response_format={"type": "json_object"}
-            )
+        response = create_chat_completion(
+            self.client,
+            model=get_classifier_model(),
+            messages=[
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            tools=[EXTRACT_TOOL],
+            tool_choice={"type": "function", "function": {"name": "record_hotel_data"}},
+            temperature=0.1,
+            max_tokens=300,
+            prompt_cache_key=self._prompt_cache_key
+        )
+
+        # Arguments are schema-validated JSON; locally parsed values win over
+        # the model's for the same field
+        arguments = response.choices[0].message.tool_calls[0].function.arguments
+        return {**json_loads(arguments), **local_fields}
+
+    def _handle_data_provision(
+        self, user_message: str, engine: OnboardingEngine, extraction: Optional[Future] = None
+    ) -> Dict:
+        """
+        Handle when user is providing data (answering questions)
 
-            import json
-            import logging
-            logger = logging.getLogger(__name__)
+        Args:
+            extraction: Speculative _extract_data() future started during
+                intent detection, if any
+        """
+        try:
+            # Nothing left to collect in this state: skip extraction and move on
+            missing_fields = engine.get_missing_fields()
+            if not missing_fields:
+                if extraction is not None:
+                    extraction.cancel()
+                return self._advance_state(engine)
+
+            if extraction is not None:
+                extracted = extraction.result()
+            else:
+                extracted = self._extract_data(user_message, engine.current_state, missing_fields)
 
-            extracted = json.loads(response.choices[0].message.content)
             logger.info(f"📧 Extracted data from '{user_message}': {extracted}")
 
             # Update task_state with extracted data
-            updated_count = 0
-            updated_fields = []
-            for key, value in extracted.items():
-                # More robust null checking
-                if value is not None and value != "null" and value != "" and str(value).strip():
-                    engine.update_field(key, value)
-                    updated_count += 1
-                    updated_fields.append(f"{key}={value}")
-                    logger.info(f"✅ Updated field: {key} = {value}")
-                else:
-                    logger.info(f"⏭️ Skipped field: {key} (value was: {value})")
+            updated = present_fields(extracted)
+            engine.update_fields(updated)
+            updated_count = len(updated)
+            updated_fields = [f"{key}={value}" for key, value in updated.items()]
+
+            skipped = extracted.keys() - updated.keys()
+            if skipped:
+                logger.info(f"⏭️ Skipped empty fields: {', '.join(sorted(skipped))}")
 
             # Auto-infer country if state is a US state and country is missing
             if extracted.get('state') and not self.context.task_state.get('country'):
-                us_states = ['AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY']
                 state_value = str(extracted.get('state', '')).upper()
 
-                if state_value in us_states or len(state_value) == 2:  # 2-letter state code
-                    engine.update_field('country', 'United States')
-                    engine.update_field('country_code', 'US')
+                if state_value in US_STATES or len(state_value) == 2:  # 2-letter state code
+                    engine.update_fields({'country': 'United States', 'country_code': 'US'})
                     updated_count += 1
                     logger.info(f"✅ Auto-inferred country: United States (from state: {state_value})")
 
@@ -453,73 +947,14 @@ CRITICAL: Use null (not "null" string) for missing data.
 
             # Check if state is complete
             if engine.is_state_complete(engine.current_state):
-                # Move to next state
-                next_state, progress = engine.transition_to_next_state()
-                self.context.update_task_state(self.context.task_state)
-                logger.info(f"🎉 State complete! Moving to: {next_state.value} ({progress}%)")
-
-                message = f"Perfect! ✓ {progress}% complete. "
-
-                if next_state == OnboardingState.ROOM_TYPES:
-                    message += "Now let's set up your room types. How many different types of rooms do you have?"
-                elif next_state == OnboardingState.POLICIES:
-                    message += "Nice! Now for your policies. What's your payment policy? (e.g., 50% deposit at booking)"
-                elif next_state == OnboardingState.REVIEW:
-                    message += "Almost done! Let me show you a preview of everything."
-                elif next_state == OnboardingState.COMPLETE:
-                    return self._complete_onboarding()
-
-                self.context.add_message(role="assistant", content=message)
-
-                return {
-                    "message": message,
-                    "data": {"state": next_state.value, "progress": progress},
-                    "action": "update_progress"
-                }
+                return self._advance_state(engine)
             else:
                 # Still missing fields in current state
                 missing = engine.get_missing_fields()
                 logger.warning(f"⚠️ Still missing fields: {missing}")
 
-                # Convert technical field names to human-friendly names
-                human_friendly = {
-                    'contact_email': 'your email address',
-                    'hotel_name': 'your hotel name',
-                    'city': 'the city',
-                    'state': 'the state/province',
-                    'country': 'the country',
-                    'phone': 'a phone number',
-                    'website': 'your website',
-                    'street_address': 'the street address',
-                    'full_address': 'the full address',
-                }
-
-                # Convert missing field names
-                missing_friendly = [human_friendly.get(field, field.replace('_', ' ')) for field in missing]
-
                 # Give more helpful, conversational feedback
-                if updated_count > 0:
-                    if len(missing_friendly) == 1:
-                        # Special cases for common fields
-                        if 'email' in missing_friendly[0]:
-                            message = "Perfect! Last thing - what's your email address?"
-                        elif 'phone' in missing_friendly[0]:
-                            message = "Perfect! Last thing - what's your phone number?"
-                        else:
-                            message = f"Perfect! One more thing - what's {missing_friendly[0]}?"
-                    else:
-                        message = f"Great! I still need {' and '.join(missing_friendly) if len(missing_friendly) == 2 else ', '.join(missing_friendly[:-1]) + ', and ' + missing_friendly[-1]}. Can you share those with me?"
-                else:
-                    if len(missing_friendly) == 1:
-                        # Special cases for common fields
-                        if 'email' in missing_friendly[0]:
-                            message = "What's your email address?"
-                        elif 'phone' in missing_friendly[0]:
-                            message = "What's your phone number?"
-                        else:
-                            message = f"What's {missing_friendly[0]}?"
-                    else:
-                        message = f"I need a few more details: {', '.join(missing_friendly)}. Can you help me with those?"
+                message = missing_fields_message(missing, updated_count > 0)
 
                 self.context.add_message(role="assistant", content=message)
 
@@ -530,8 +965,6 @@ CRITICAL: Use null (not "null" string) for missing data.
                 }
 
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"❌ Error in data extraction: {str(e)}", exc_info=True)
 
             # More specific error message
@@ -549,6 +982,30 @@ CRITICAL: Use null (not "null" string) for missing data.
                 "action": None
             }
 
+    def _advance_state(self, engine: OnboardingEngine) -> Dict:
+        """Move a completed onboarding state on to the next one"""
+        next_state, progress = engine.transition_to_next_state()
+        logger.info(f"🎉 State complete! Moving to: {next_state.value} ({progress}%)")
+
+        message = f"Perfect! ✓ {progress}% complete. "
+
+        if next_state == OnboardingState.ROOM_TYPES:
+            message += "Now let's set up your room types. How many different types of rooms do you have?"
+        elif next_state == OnboardingState.POLICIES:
+            message += "Nice! Now for your policies. What's your payment policy? (e.g., 50% deposit at booking)"
+        elif next_state == OnboardingState.REVIEW:
+            message += "Almost done! Let me show you a preview of everything."
+        elif next_state == OnboardingState.COMPLETE:
+            return self._complete_onboarding()
+
+        self.context.add_message(role="assistant", content=message)
+
+        return {
+            "message": message,
+            "data": {"state": next_state.value, "progress": progress},
+            "action": "update_progress"
+        }
+
     def _handle_question(self, user_message: str, engine: OnboardingEngine) -> Dict:
         """Handle when user asks a question"""
         return self._handle_general_message(user_message)
@@ -565,8 +1022,22 @@ CRITICAL: Use null (not "null" string) for missing data.
         }
 
     def _handle_unclear(self, user_message: str, engine: OnboardingEngine) -> Dict:
-        """Handle unclear intent - ask GPT-4o to respond"""
-        return self._handle_general_message(user_message)
+        """
+        Handle unclear intent - repeat the pending onboarding question.
+
+        Only asks GPT-4o to respond when nothing is pending.
+        """
+        question = engine.get_next_question_text()
+        if question is None:
+            return self._handle_general_message(user_message)
+
+        self.context.add_message(role="assistant", content=question)
+
+        return {
+            "message": question,
+            "data": {"state": engine.current_state.value},
+            "action": None
+        }
 
     def _complete_onboarding(self) -> Dict:
         """
@@ -574,9 +1045,6 @@ CRITICAL: Use null (not "null" string) for missing data.
 
         Generates the hotel directly from the onboarding data.
         """
-        from .data_generator import DataGenerator
-        from django.utils import timezone
-
         # Log the completion action WITH the data (before it's cleared)
         self.context.add_action("onboarding_completed", self.context.task_state.copy())
 
@@ -622,8 +1090,6 @@ CRITICAL: Use null (not "null" string) for missing data.
             }
 
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error completing onboarding: {str(e)}", exc_info=True)
 
             error_msg = "I encountered an unexpected error creating your hotel. Please try again."
@@ -637,36 +1103,41 @@ CRITICAL: Use null (not "null" string) for missing data.
         """
         Handle general conversation (not onboarding-specific).
 
-        Uses GPT-4o with conversation history.
+        Uses GPT-4o with conversation history, unless the semantic cache
+        already has a reply for a near-identical question in the same context.
         """
-        # Get recent conversation history
-        conversation_history = self.context.get_recent_conversation(limit=10)
-
-        # Build messages for GPT-4o
-        messages = [
-            {"role": "system", "content": NORA_SYSTEM_PROMPT}
-        ]
+        cached_reply, cache_query = self._lookup_cached_reply()
+        if cached_reply is not None:
+            self.context.add_message(role="assistant", content=cached_reply)
+            return {
+                "message": cached_reply,
+                "data": {"cached": True},
+                "action": None
+            }
 
-        # Add conversation history
-        for msg in conversation_history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        # Most recent conversation history that fits the token budget
+        conversation_history = trim_history_to_budget(
+            self.context.conversation_history, GPT4O_CONFIG["history_token_budget"]
+        )
+        messages = self._build_chat_messages(conversation_history)
 
         try:
             # Call GPT-4o
-            response = self.client.chat.completions.create(
+            response = create_chat_completion(
+                self.client,
                 model=GPT4O_CONFIG["model"],
                 messages=messages,
                 temperature=GPT4O_CONFIG["temperature"],
-                max_tokens=GPT4O_CONFIG["max_tokens"]
+                max_tokens=GPT4O_CONFIG["max_tokens"],
+                prompt_cache_key=self._prompt_cache_key
             )
 
             assistant_message = response.choices[0].message.content
 
             # Save assistant's response to context
             self.context.add_message(role="assistant", content=assistant_message)
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(cache_query, assistant_message)
 
             return {
                 "message": assistant_message,
@@ -683,6 +1154,139 @@ CRITICAL: Use null (not "null" string) for missing data.
                 "action": "show_error"
             }
 
+    def _handle_general_message_stream(self) -> Iterator[Dict]:
+        """
+        Streaming general conversation (see process_message_stream).
+
+        The assistant message is saved once the stream completes. A semantic
+        cache hit is sent as a single delta.
+        """
+        cached_reply, cache_query = self._lookup_cached_reply()
+        if cached_reply is not None:
+            self.context.add_message(role="assistant", content=cached_reply)
+            yield {"type": "delta", "content": cached_reply}
+            yield {"type": "done", "message": cached_reply, "data": {"cached": True}, "action": None}
+            return
+
+        conversation_history = trim_history_to_budget(
+            self.context.conversation_history, GPT4O_CONFIG["history_token_budget"]
+        )
+        messages = self._build_chat_messages(conversation_history)
+
+        chunks = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=GPT4O_CONFIG["model"],
+                messages=messages,
+                temperature=GPT4O_CONFIG["temperature"],
+                max_tokens=GPT4O_CONFIG["max_tokens"],
+                prompt_cache_key=self._prompt_cache_key,
+                stream=True
+            )
+
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield {"type": "delta", "content": delta}
+
+        except Exception as e:
+            logger.error(f"Error streaming general message: {str(e)}", exc_info=True)
+            yield {
+                "type": "done",
+                "message": "I'm having trouble connecting right now. Your progress is saved - let's continue in a moment.",
+                "data": {"error": str(e)},
+                "action": "show_error"
+            }
+            return
+
+        assistant_message = "".join(chunks)
+        self.context.add_message(role="assistant", content=assistant_message)
+        if self.semantic_cache is not None:
+            self.semantic_cache.store(cache_query, assistant_message)
+
+        yield {"type": "done", "message": assistant_message, "data": {}, "action": None}
+
+    async def _ahandle_general_message(self, user_message: str) -> Dict:
+        """
+        Async general conversation: save the user message during the GPT-4o call.
+
+        The prompt is built from in-memory history before the write starts, so
+        the two don't race on conversation_history. The reply is returned
+        without waiting for the assistant message to be saved.
+        """
+        conversation_history = trim_history_to_budget(
+            self.context.conversation_history + [{"role": "user", "content": user_message}],
+            GPT4O_CONFIG["history_token_budget"]
+        )
+        messages = self._build_chat_messages(conversation_history)
+
+        save_user_message = self._track_write(
+            self.context.aadd_message(role="user", content=user_message)
+        )
+
+        try:
+            response = await get_async_openai_client().chat.completions.create(
+                model=GPT4O_CONFIG["model"],
+                messages=messages,
+                temperature=GPT4O_CONFIG["temperature"],
+                max_tokens=GPT4O_CONFIG["max_tokens"],
+                prompt_cache_key=self._prompt_cache_key
+            )
+        except Exception as e:
+            error_message = "I'm having trouble connecting right now. Your progress is saved - let's continue in a moment."
+            return {
+                "message": error_message,
+                "data": {"error": str(e)},
+                "action": "show_error"
+            }
+
+        assistant_message = response.choices[0].message.content
+
+        async def save_assistant_message():
+            await save_user_message
+            await self.context.aadd_message(role="assistant", content=assistant_message)
+
+        # Off the response path: the user doesn't wait on this UPDATE
+        self._track_write(save_assistant_message())
+
+        return {
+            "message": assistant_message,
+            "data": {},
+            "action": None
+        }
+
+    def _lookup_cached_reply(self) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Semantic cache lookup for the conversation so far.
+
+        Returns:
+            (cached reply or None, query for SemanticCache.store())
+        """
+        if self.semantic_cache is None:
+            return None, None
+
+        return self.semantic_cache.lookup(self.context.conversation_history)
+
+    def _build_chat_messages(self, conversation_history: list) -> list:
+        """
+        Nora system prompt followed by the given history, as chat messages.
+
+        The system prompt is always first and static, so the request prefix
+        stays identical across turns for OpenAI prompt caching.
+        """
+        messages = [nora_system_message()]
+
+        for msg in conversation_history:
+            messages.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+
+        return messages
+
     def start_onboarding(self) -> Dict:
         """
         Start the onboarding process with AI-First pattern (F-002.3).
@@ -738,11 +1342,10 @@ CRITICAL: Use null (not "null" string) for missing data.
                 "state": str (optional)
             }
         """
-        import logging
-        logger = logging.getLogger(__name__)
 
         try:
-            response = self.client.chat.completions.create(
+            response = create_chat_completion(
+                self.client,
                 model="gpt-4o",
                 messages=[
                     {
@@ -756,11 +1359,12 @@ CRITICAL: Use null (not "null" string) for missing data.
                 ],
                 temperature=0.1,
                 max_tokens=200,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                prompt_cache_key=self._prompt_cache_key
             )
 
             content = response.choices[0].message.content.strip()
-            result = json.loads(content) if isinstance(content, str) else content
+            result = json_loads(content) if isinstance(content, str) else content
 
             logger.info(f"Extracted identity: {result}")
             return result
@@ -781,8 +1385,6 @@ CRITICAL: Use null (not "null" string) for missing data.
 
         Returns response dict with research results and validation action.
         """
-        import logging
-        logger = logging.getLogger(__name__)
 
         hotel_name = self.context.task_state.get('hotel_name')
         city = self.context.task_state.get('city')
@@ -807,7 +1409,6 @@ CRITICAL: Use null (not "null" string) for missing data.
         progress_message += "This will take about 15-20 seconds..."
 
         # Store progress message (use sync_to_async for Django ORM)
-        from asgiref.sync import sync_to_async
         await sync_to_async(self.context.add_message)(role="assistant", content=progress_message)
 
         logger.info(f"🔍 Starting auto-research for {hotel_name}, {city}, {state}")
@@ -916,9 +1517,6 @@ CRITICAL: Use null (not "null" string) for missing data.
 
         Returns response dict.
         """
-        import logging
-        import json
-        logger = logging.getLogger(__name__)
 
         # Add user message to context
         self.context.add_message(role="user", content=user_message)
@@ -948,7 +1546,6 @@ CRITICAL: Use null (not "null" string) for missing data.
 
                 # Trigger AI research (async)
                 # Use Django's async-safe approach
-                from asgiref.sync import async_to_sync
                 return async_to_sync(self._start_auto_research)()
             else:
                 # Need more info
@@ -3,16 +3,83 @@ OpenAI API configuration for Nora
 """
 
 import os
-from openai import OpenAI
+import json
+import hashlib
+import functools
+import importlib.util
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Final
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from django.conf import settings
 
-# Initialize OpenAI client
+try:
+    import tiktoken
+except ImportError:  # optional; token counts fall back to a chars/4 estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Initialize OpenAI clients
 client = None
+async_client = None
+shared_http_client = None
+token_encoding = None
+token_encoding_failed_at = None
+
+# tiktoken downloads its encoding on first use; after a failed download,
+# token counts use the chars/4 estimate for this long before trying again
+TOKEN_ENCODING_RETRY_INTERVAL = 300
+
+# Chat completion requests in flight, by request hash (see create_chat_completion)
+inflight_completions: Dict[str, Future] = {}
+inflight_lock = threading.Lock()
+
+# Keep idle connections to OpenAI open between turns so follow-up requests
+# skip the TCP/TLS handshake (the SDK default drops them after 5s)
+OPENAI_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=64,
+    keepalive_expiry=60,
+)
+
+# Multiplex concurrent requests over one TLS connection when the optional
+# h2 package is installed; HTTP/1.1 keep-alive otherwise
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def build_http_client() -> DefaultHttpxClient:
+    """HTTP client for an OpenAI-compatible API client (pooled, HTTP/2 if available)."""
+    return DefaultHttpxClient(limits=OPENAI_CONNECTION_LIMITS, http2=HTTP2_AVAILABLE)
+
+
+def get_shared_http_client() -> DefaultHttpxClient:
+    """
+    Get or create the process-wide connection pool for sync OpenAI-compatible clients.
+
+    The OpenAI and Perplexity clients share it: one pool, one TLS context
+    and one set of keep-alive limits for every provider in the process,
+    instead of one per client.
+    """
+    global shared_http_client
+
+    if shared_http_client is None:
+        shared_http_client = build_http_client()
+
+    return shared_http_client
+
+
+def build_async_http_client() -> DefaultAsyncHttpxClient:
+    """Async counterpart of build_http_client(), for AsyncOpenAI-style clients."""
+    return DefaultAsyncHttpxClient(limits=OPENAI_CONNECTION_LIMITS, http2=HTTP2_AVAILABLE)
 
 
 def get_openai_client() -> OpenAI:
     """
-    Get or create OpenAI client instance.
+    Get or create the process-wide OpenAI client instance.
 
     Uses API key from environment variable OPENAI_API_KEY.
     For development, you can use a trial key.
@@ -29,13 +96,131 @@ def get_openai_client() -> OpenAI:
                 "Please set it in your .env file or environment."
             )
 
-        client = OpenAI(api_key=api_key)
+        client = OpenAI(
+            api_key=api_key,
+            http_client=get_shared_http_client(),
+        )
 
     return client
 
 
-# System prompt for Nora
-NORA_SYSTEM_PROMPT = """
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get or create the AsyncOpenAI client instance.
+
+    Same key handling as get_openai_client(); used by coroutine code paths
+    (e.g. NoraAgent.aprocess_message) so requests don't block the event loop.
+    """
+    global async_client
+
+    if async_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+
+        if not api_key:
+            raise ValueError(
+                "OPENAI_API_KEY environment variable not set. "
+                "Please set it in your .env file or environment."
+            )
+
+        async_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=build_async_http_client(),
+        )
+
+    return async_client
+
+
+def completion_key(api_client, request: Dict) -> str:
+    """Hash of a chat completion request (endpoint + every parameter)"""
+    payload = json.dumps([str(api_client.base_url), request], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def create_chat_completion(api_client, **request):
+    """
+    api_client.chat.completions.create(**request), coalescing duplicates.
+
+    Identical requests already in flight (a double submit, two users of an
+    organization on the same onboarding step) wait for that call and share
+    its response, or its exception, instead of making their own. Not for
+    stream=True requests; the response is shared, so treat it as read-only.
+    """
+    key = completion_key(api_client, request)
+
+    with inflight_lock:
+        future = inflight_completions.get(key)
+        leader = future is None
+        if leader:
+            future = inflight_completions[key] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        response = api_client.chat.completions.create(**request)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(response)
+        return response
+    finally:
+        with inflight_lock:
+            inflight_completions.pop(key, None)
+
+
+def get_classifier_model() -> str:
+    """
+    Model for Nora's short classification/extraction calls.
+
+    Defaults to gpt-4o-mini; set NORA_CLASSIFIER_MODEL to roll back to gpt-4o.
+    General chat keeps GPT4O_CONFIG["model"].
+    """
+    return getattr(settings, "NORA_CLASSIFIER_MODEL", "gpt-4o-mini")
+
+
+def get_token_encoding():
+    """
+    Get the GPT-4o tiktoken encoding.
+
+    Returns None if tiktoken isn't installed or its encoding file couldn't
+    be loaded, so callers fall back to estimates instead of failing the turn.
+    """
+    global token_encoding, token_encoding_failed_at
+
+    if token_encoding is not None or tiktoken is None:
+        return token_encoding
+
+    if token_encoding_failed_at is not None and time.monotonic() - token_encoding_failed_at < TOKEN_ENCODING_RETRY_INTERVAL:
+        return None
+
+    try:
+        token_encoding = tiktoken.encoding_for_model("gpt-4o")
+    except Exception as e:
+        token_encoding_failed_at = time.monotonic()
+        logger.warning(f"⚠️ tiktoken encoding unavailable, estimating tokens: {str(e)}")
+
+    return token_encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Count GPT-4o tokens in text.
+
+    Exact with tiktoken installed, otherwise ~4 characters per token.
+    """
+    encoding = get_token_encoding()
+
+    if encoding is None:
+        return len(text) // 4 + 1
+
+    return len(encoding.encode(text))
+
+
+# System prompt for Nora. Sent first on every general-conversation call, so it
+# is the prefix OpenAI caches server-side: any edit (even whitespace)
+# invalidates that cache for all organizations, so batch prompt changes.
+NORA_SYSTEM_PROMPT: Final[str] = """
 You are Nora, an enthusiastic AI co-worker helping hotel owners
 set up and manage their properties on Stayfull.
 
@@ -66,6 +251,49 @@ Remember:
 """
 
 
+@functools.lru_cache(maxsize=1)
+def nora_system_message() -> Dict[str, str]:
+    """
+    The Nora system prompt as a chat message.
+
+    Built once and shared by every request; callers must not mutate it.
+    """
+    return {"role": "system", "content": NORA_SYSTEM_PROMPT}
+
+
+# System prompt for onboarding data extraction. Static, so it is an identical
+# request prefix on every call; the step, missing fields and message go in
+# the user turn.
+EXTRACTION_SYSTEM_PROMPT = """You are a precise data extraction assistant. Extract emails and data accurately. Respond with valid JSON.
+
+Extract hotel information from the user message. Extract any relevant data and return as JSON. Focus especially on the missing fields.
+
+Important:
+- For emails: Look for any email address pattern (user@domain.com)
+- For phone: Look for any phone number pattern
+- For addresses: Extract city, state/province, and country separately
+- State codes like "NH", "CA", "NY" are US states, not countries
+- If user provides just an email, extract it as contact_email
+- If user provides just a phone, extract it as phone
+- Always include the field even if it seems short (e.g., just "john@hotel.com")
+
+Return JSON with these possible fields:
+{
+    "hotel_name": "name if mentioned or null",
+    "city": "city if mentioned or null",
+    "state": "state or province if mentioned or null",
+    "country": "country if mentioned or null",
+    "contact_email": "email if mentioned or null",
+    "phone": "phone if mentioned or null",
+    "website": "website URL if mentioned or null"
+}
+
+CRITICAL: If the message contains an email address, you MUST extract it as contact_email.
+CRITICAL: Do NOT confuse US states (NH, NY, CA, etc.) with countries. Extract them as "state".
+CRITICAL: Use null (not "null" string) for missing data.
+"""
+
+
 # Voice configuration
 VOICE_CONFIG = {
     "model": "whisper-1",  # For speech-to-text
@@ -80,6 +308,7 @@ GPT4O_CONFIG = {
     "model": "gpt-4o",
     "temperature": 0.7,  # Some creativity for content generation
     "max_tokens": 1000,  # Limit response length
+    "history_token_budget": 4096,  # Conversation history sent per request
 }
 
 
@@ -6,13 +6,244 @@ amenities, unique features, and current details.
 """
 
 import os
+import re
 import json
-from openai import OpenAI
-from typing import Dict, Optional
+import asyncio
+import functools
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from typing import Dict, Iterator, List, Optional
 import logging
+from django.conf import settings
+from django.core.cache import cache
+from .openai_config import build_async_http_client, get_openai_client, get_shared_http_client
+from .rate_limiter import RateLimiter
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+HOTEL_INFO_CACHE_TIMEOUT = 86400  # 24 hours
+HOTEL_INFO_ERROR_CACHE_TIMEOUT = 60  # brief, so transient failures aren't retried in a tight loop
+# Research complete enough to onboard from is kept for a month: a hotel's
+# address, rooms and contact details rarely change
+CONFIDENT_RESEARCH_CACHE_TIMEOUT = 30 * 86400  # 30 days
+CONFIDENT_RESEARCH_THRESHOLD = 0.8
+DESCRIPTION_CACHE_TIMEOUT = 7 * 86400  # 7 days
+
+# Output caps sized to real responses: decode time grows with every token
+# the model is allowed to write
+HOTEL_INFO_MAX_TOKENS = 600
+RESEARCH_MAX_TOKENS = 1200
+
+# Transient failures (connection errors, timeouts, 408/409/429/5xx) are
+# retried inside the SDK with jittered exponential backoff, honoring
+# Retry-After; parse errors and other 4xx are not. A web search that hasn't
+# answered in 30s is stuck, so retry it rather than wait out the SDK's
+# 10-minute default.
+PERPLEXITY_MAX_RETRIES = 3
+PERPLEXITY_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Default cap on concurrent requests for batch research (Perplexity rate limits)
+BATCH_MAX_CONCURRENCY = 10
+
+# Descriptions are copywriting over already-researched facts, so they don't
+# need a web-grounded model
+DESCRIPTION_MODEL = "gpt-4o-mini"
+
+DESCRIPTION_LENGTHS = {
+    "short": "1-2 engaging sentences",
+    "medium": "3-4 well-crafted sentences",
+    "long": "A full paragraph (5-6 sentences)"
+}
+
+DESCRIPTION_MAX_TOKENS = {
+    "short": 120,
+    "medium": 240,
+    "long": 400
+}
+
+# Prompts are static templates, filled in with str.format() per request;
+# system messages are built once and shared by every request.
+# They are kept short: the response_format schemas already fix the JSON
+# structure, so prompts only say what each field should contain.
+HOTEL_INFO_SYSTEM_PROMPT = "You are a hotel research assistant. Provide accurate, factual information about hotels based on web search results. Always respond with valid JSON."
+HOTEL_INFO_SYSTEM_MESSAGE = {"role": "system", "content": HOTEL_INFO_SYSTEM_PROMPT}
+
+HOTEL_INFO_PROMPT = """Research the hotel "{query}". Return JSON with:
+"general_info" (2-3 sentences on style and atmosphere), "amenities" (key amenities),
+"unique_features", "target_audience", "price_range" (Budget/Mid-range/Upscale/Luxury),
+"hotel_style" (Boutique/Chain/Resort/Business/Historic/Modern/...), "notable_facts" (awards, recognition).
+Use current, factual information; null for anything you can't find."""
+
+RESEARCH_SYSTEM_PROMPT = "You are a hotel research specialist. Search the web thoroughly and provide accurate, comprehensive information in JSON format."
+RESEARCH_SYSTEM_MESSAGE = {"role": "system", "content": RESEARCH_SYSTEM_PROMPT}
+
+RESEARCH_PROMPT = """Research the hotel "{hotel_name}" in {location} across multiple web sources. Return JSON with:
+"description" (2-3 paragraphs: style, atmosphere, location, who it suits, what makes it special),
+"amenities" (property, room and services), "room_types" (every category: exact "name", "beds"
+e.g. "1 King", max guest "capacity", short "description"), "website", "address" (street and zip),
+"phone", "total_rooms", "check_in_time" and "check_out_time" (e.g. "3:00 PM"),
+"policies" ("cancellation", "payment", "pets").
+Use null for anything you can't find."""
+
+DESCRIPTION_SYSTEM_PROMPT = "You are an expert hotel copywriter. Write compelling, accurate descriptions from the research provided."
+DESCRIPTION_SYSTEM_MESSAGE = {"role": "system", "content": DESCRIPTION_SYSTEM_PROMPT}
+
+DESCRIPTION_PROMPT = """Write a compelling, guest-facing description for "{query}" from these researched facts:
+{facts}
+
+Requirements:
+- Length: {length}
+- Tone: Enthusiastic but professional
+- Focus: Highlight what makes this hotel special
+- Include: Key amenities, atmosphere, location benefits
+- Avoid: Generic phrases, over-promises, anything not supported by the facts
+
+Write the description as plain text (not JSON)."""
+
+# (field, weight, test) for research confidence: critical fields count 0.30,
+# important ones 0.10
+CONFIDENCE_RULES = (
+    ("address", 0.30, bool),
+    ("room_types", 0.30, bool),
+    ("description", 0.10, lambda value: bool(value) and len(value) > 50),
+    ("amenities", 0.10, lambda value: bool(value) and len(value) > 3),
+    ("website", 0.10, bool),
+    ("phone", 0.10, bool),
+)
+
+NULLABLE_STRING = {"type": ["string", "null"]}
+
+# Schemas are closed (every field required, no extra keys) so constrained
+# decoding returns exactly the fields callers read, nothing more to generate
+
+# Structured output schema for get_hotel_information (mirrors its prompt)
+HOTEL_INFO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "general_info": NULLABLE_STRING,
+        "amenities": {"type": "array", "items": {"type": "string"}},
+        "unique_features": NULLABLE_STRING,
+        "target_audience": NULLABLE_STRING,
+        "price_range": NULLABLE_STRING,
+        "hotel_style": NULLABLE_STRING,
+        "notable_facts": NULLABLE_STRING,
+    },
+    "required": [
+        "general_info", "amenities", "unique_features", "target_audience",
+        "price_range", "hotel_style", "notable_facts",
+    ],
+    "additionalProperties": False,
+}
+
+# Structured output schema for research_hotel (mirrors its prompt)
+RESEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": NULLABLE_STRING,
+        "amenities": {"type": "array", "items": {"type": "string"}},
+        "room_types": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "beds": NULLABLE_STRING,
+                    "capacity": {"type": ["integer", "null"]},
+                    "description": NULLABLE_STRING,
+                },
+                "required": ["name", "beds", "capacity", "description"],
+                "additionalProperties": False,
+            },
+        },
+        "website": NULLABLE_STRING,
+        "address": NULLABLE_STRING,
+        "phone": NULLABLE_STRING,
+        "total_rooms": {"type": ["integer", "null"]},
+        "check_in_time": NULLABLE_STRING,
+        "check_out_time": NULLABLE_STRING,
+        "policies": {
+            "type": "object",
+            "properties": {
+                "cancellation": NULLABLE_STRING,
+                "payment": NULLABLE_STRING,
+                "pets": NULLABLE_STRING,
+            },
+            "required": ["cancellation", "payment", "pets"],
+            "additionalProperties": False,
+        },
+    },
+    "required": [
+        "description", "amenities", "room_types", "website", "address", "phone",
+        "total_rooms", "check_in_time", "check_out_time", "policies",
+    ],
+    "additionalProperties": False,
+}
+
+# response_format arguments, built once per schema
+HOTEL_INFO_RESPONSE_FORMAT = {"type": "json_schema", "json_schema": {"schema": HOTEL_INFO_SCHEMA}}
+RESEARCH_RESPONSE_FORMAT = {"type": "json_schema", "json_schema": {"schema": RESEARCH_SCHEMA}}
+
+
+# Opening ```/```json and closing ``` of a markdown code block
+CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+
+def strip_code_fences(content: str) -> str:
+    """Remove a markdown code fence wrapped around a reply"""
+    return CODE_FENCE_RE.sub('', content).strip()
+
+
+def parse_json_content(content: str) -> Dict:
+    """
+    Parse a JSON reply.
+
+    Structured-output replies parse directly; markdown code fences are only
+    stripped as a fallback for replies that ignored response_format.
+    """
+    content = content.strip()
+
+    try:
+        return json_loads(content)
+    except json.JSONDecodeError:
+        pass
+
+    return json_loads(strip_code_fences(content))
+
+
+perplexity_rate_limiter = None
+
+# Research in flight, by cache key (see PerplexityService._memoized) and by
+# (event loop, cache key) for the async path (see aresearch_hotel)
+inflight_research: Dict[str, Future] = {}
+inflight_lock = threading.Lock()
+ainflight_research: Dict[tuple, asyncio.Task] = {}
+
+
+def get_perplexity_rate_limiter() -> RateLimiter:
+    """
+    Get or create the process-wide Perplexity rate limiter.
+
+    Shared by every PerplexityService, sync and async, so all requests
+    from the process are paced against the same limits.
+    """
+    global perplexity_rate_limiter
+
+    if perplexity_rate_limiter is None:
+        perplexity_rate_limiter = RateLimiter(
+            requests_per_minute=getattr(settings, "PERPLEXITY_REQUESTS_PER_MINUTE", 50),
+            tokens_per_minute=getattr(settings, "PERPLEXITY_TOKENS_PER_MINUTE", 0) or None,
+        )
+
+    return perplexity_rate_limiter
+
 
 class PerplexityService:
     """
@@ -23,18 +254,44 @@ class PerplexityService:
     """
 
     def __init__(self):
-        """Initialize Perplexity client (uses OpenAI-compatible API)"""
-        api_key = os.getenv("PERPLEXITY_API_KEY")
+        """Read the Perplexity API key (clients are built on first use)"""
+        self.api_key = os.getenv("PERPLEXITY_API_KEY")
 
-        if not api_key:
+        if not self.api_key:
             logger.warning("PERPLEXITY_API_KEY not found in environment")
-            self.client = None
-        else:
-            # Perplexity uses OpenAI-compatible API
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.perplexity.ai"
-            )
+
+    @functools.cached_property
+    def client(self) -> Optional[OpenAI]:
+        """Sync Perplexity client (OpenAI-compatible API), or None without a key"""
+        if not self.api_key:
+            return None
+
+        return OpenAI(
+            api_key=self.api_key,
+            base_url="https://api.perplexity.ai",
+            max_retries=PERPLEXITY_MAX_RETRIES,
+            timeout=PERPLEXITY_TIMEOUT,
+            http_client=get_shared_http_client()
+        )
+
+    @functools.cached_property
+    def aclient(self) -> Optional[AsyncOpenAI]:
+        """
+        Async client for coroutine callers (aresearch_hotel, research_hotels_batch).
+
+        Built separately on first use, so sync-only processes never open
+        its connection pool.
+        """
+        if not self.api_key:
+            return None
+
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url="https://api.perplexity.ai",
+            max_retries=PERPLEXITY_MAX_RETRIES,
+            timeout=PERPLEXITY_TIMEOUT,
+            http_client=build_async_http_client()
+        )
 
     def get_hotel_information(
         self,
@@ -63,76 +320,45 @@ class PerplexityService:
             logger.warning("Perplexity client not initialized")
             return {"error": "Perplexity API not configured"}
 
-        try:
-            # Build search query
-            query = f"{hotel_name}"
-            if location:
-                query += f" in {location}"
-
-            # Prompt for structured hotel information
-            prompt = f"""Research the hotel "{query}" and provide detailed information in the following JSON format:
-
-{{
-    "general_info": "2-3 sentence description of the hotel, its style, and atmosphere",
-    "amenities": ["list of key amenities like pool, spa, restaurant, gym, etc."],
-    "unique_features": "What makes this hotel special or different from competitors",
-    "target_audience": "Who is this hotel best suited for (business travelers, families, couples, luxury seekers, etc.)",
-    "price_range": "Budget/Mid-range/Upscale/Luxury",
-    "hotel_style": "Boutique/Chain/Resort/Business/Historic/Modern/etc.",
-    "notable_facts": "Any interesting facts, awards, or recognition"
-}}
-
-Focus on factual, current information. If you can't find specific information, use null."""
-
-            logger.info(f"🔍 Researching hotel with Perplexity: {query}")
-
-            # Call Perplexity API (using sonar model for web search)
-            response = self.client.chat.completions.create(
-                model="sonar",  # Web-grounded model (new unified Sonar)
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a hotel research assistant. Provide accurate, factual information about hotels based on web search results. Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.2,  # Low temperature for factual responses
-                max_tokens=1000
-            )
-
-            # Parse response (strip markdown code fences if present)
-            content = response.choices[0].message.content.strip()
-
-            # Remove markdown code fences if present
-            if content.startswith('```json'):
-                content = content[7:]  # Remove ```json
-            elif content.startswith('```'):
-                content = content[3:]  # Remove ```
+        # Build search query
+        query = f"{hotel_name}"
+        if location:
+            query += f" in {location}"
 
-            if content.endswith('```'):
-                content = content[:-3]  # Remove trailing ```
+        return self._memoized(
+            self._cache_key("pplx:info", f"{hotel_name}|{location or ''}"),
+            lambda: self._fetch_hotel_information(hotel_name, query)
+        )
 
-            content = content.strip()
+    def _fetch_hotel_information(self, hotel_name: str, query: str) -> Dict:
+        """Uncached get_hotel_information() call"""
+        content = None
+        try:
+            logger.debug("🔍 Researching hotel with Perplexity: %s", query)
 
-            result = json.loads(content)
+            content = self._chat(self._sonar_request(
+                HOTEL_INFO_SYSTEM_MESSAGE,
+                HOTEL_INFO_PROMPT.format(query=query),
+                response_format=HOTEL_INFO_RESPONSE_FORMAT,
+                max_tokens=HOTEL_INFO_MAX_TOKENS,
+                temperature=0.2  # Low temperature for factual responses
+            ))
+            result = parse_json_content(content)
 
-            logger.info(f"✅ Perplexity research complete for {hotel_name}")
-            logger.info(f"   General info: {result.get('general_info', 'N/A')[:100]}...")
+            logger.info("✅ Perplexity research complete for %s", hotel_name)
+            logger.debug("   General info: %.100s...", result.get('general_info') or 'N/A')
 
             return result
 
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Failed to parse Perplexity JSON response: {e}")
-            logger.error(f"   Raw response: {response.choices[0].message.content if 'response' in locals() else 'N/A'}")
+            logger.error("❌ Failed to parse Perplexity JSON response: %s", e)
+            logger.error("   Raw response: %s", content)
             return {
                 "error": "Failed to parse response",
-                "raw_response": response.choices[0].message.content if 'response' in locals() else None
+                "raw_response": content
             }
         except Exception as e:
-            logger.error(f"❌ Perplexity API error: {str(e)}", exc_info=True)
+            logger.error("❌ Perplexity API error: %s", e, exc_info=True)
             return {"error": str(e)}
 
     def research_hotel(
@@ -182,132 +408,242 @@ Focus on factual, current information. If you can't find specific information, u
             logger.warning("Perplexity client not initialized")
             return {"error": "Perplexity API not configured", "confidence": 0.0}
 
-        try:
-            # Build location string
-            location = f"{city}, {state}" if state else city
-            query = f"{hotel_name} in {location}"
-
-            # Comprehensive research prompt
-            prompt = f"""Research the hotel "{hotel_name}" in {location} and provide COMPLETE information.
-
-Search the web thoroughly and extract:
-
-1. **Description**: Write a detailed 2-3 paragraph description covering:
-   - Hotel style and atmosphere
-   - Location advantages
-   - Target audience
-   - What makes it special
-
-2. **Room Types**: List ALL room categories with:
-   - Exact room type name (e.g., "Standard Queen", "Deluxe King")
-   - Bed configuration (e.g., "1 Queen", "2 Twins", "1 King")
-   - Maximum capacity (number of guests)
-   - Brief description of the room
-
-3. **Amenities**: Complete list including:
-   - Property amenities (pool, gym, spa, restaurant, bar, parking)
-   - Room amenities (WiFi, TV, coffee maker)
-   - Services (breakfast, room service, concierge)
-
-4. **Contact & Logistics**:
-   - Full street address with zip code
-   - Phone number
-   - Website URL
-   - Total number of rooms/units
-   - Check-in time
-   - Check-out time
-
-5. **Policies**:
-   - Cancellation policy
-   - Payment policy
-   - Pet policy (if applicable)
-
-Respond in this EXACT JSON format:
-{{
-  "description": "Multi-paragraph description...",
-  "amenities": ["WiFi", "Pool", "Parking", "Restaurant", ...],
-  "room_types": [
-    {{
-      "name": "Standard Queen",
-      "beds": "1 Queen",
-      "capacity": 2,
-      "description": "Cozy room with..."
-    }}
-  ],
-  "website": "https://...",
-  "address": "123 Main St, City, ST 12345",
-  "phone": "(xxx) xxx-xxxx",
-  "total_rooms": 17,
-  "check_in_time": "3:00 PM",
-  "check_out_time": "11:00 AM",
-  "policies": {{
-    "cancellation": "...",
-    "payment": "..."
-  }}
-}}
-
-IMPORTANT: Use null for fields you cannot find. Be thorough - search multiple sources."""
-
-            logger.info(f"🔍 Comprehensive research: {query}")
-
-            # Call Perplexity with sonar model
-            response = self.client.chat.completions.create(
-                model="sonar",  # Web-grounded search
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a hotel research specialist. Search the web thoroughly and provide accurate, comprehensive information in JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,  # Very low for factual data
-                max_tokens=2500
+        return self._memoized(
+            self._cache_key("pplx:research", f"{hotel_name}|{city}|{state or ''}"),
+            lambda: self._research_hotel(hotel_name, city, state)
+        )
+
+    async def aresearch_hotel(
+        self,
+        hotel_name: str,
+        city: str,
+        state: str = None
+    ) -> Dict:
+        """
+        Async research_hotel(), sharing its cache.
+
+        Awaits the API call on the async client, so an event loop can run
+        many of these at once (see research_hotels_batch).
+        """
+        if not self.aclient:
+            logger.warning("Perplexity client not initialized")
+            return {"error": "Perplexity API not configured", "confidence": 0.0}
+
+        cache_key = self._cache_key("pplx:research", f"{hotel_name}|{city}|{state or ''}")
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+        # Coalesce with an identical lookup already running on this loop.
+        # Shielded, so one caller being cancelled doesn't cancel the others.
+        key = (asyncio.get_running_loop(), cache_key)
+        task = ainflight_research.get(key)
+        if task is None:
+            task = ainflight_research[key] = asyncio.ensure_future(
+                self._aresearch_hotel(hotel_name, city, state, cache_key)
             )
+            task.add_done_callback(lambda _: ainflight_research.pop(key, None))
 
-            # Parse response
-            content = response.choices[0].message.content.strip()
+        return await asyncio.shield(task)
 
-            # Remove markdown code fences
-            if content.startswith('```json'):
-                content = content[7:]
-            elif content.startswith('```'):
-                content = content[3:]
-            if content.endswith('```'):
-                content = content[:-3]
+    async def _aresearch_hotel(self, hotel_name: str, city: str, state: Optional[str], cache_key: str) -> Dict:
+        """Uncached aresearch_hotel() call, caching its result"""
+        content = None
+        try:
+            content = await self._achat(self._research_request(hotel_name, city, state))
+            result = self._research_result(hotel_name, content)
+        except Exception as e:
+            result = self._research_error(e, content)
 
-            content = content.strip()
-            result = json.loads(content)
+        await cache.aset(cache_key, result, self._cache_timeout(result))
+        return result
+
+    async def research_hotels_batch(
+        self,
+        items: List[Dict],
+        max_concurrency: int = BATCH_MAX_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Research many hotels concurrently.
 
-            # Calculate confidence based on data completeness
-            confidence = self._calculate_confidence(result)
-            result['confidence'] = confidence
-            result['_source'] = 'perplexity'
+        Args:
+            items: research_hotel() arguments per hotel
+                ({"hotel_name": ..., "city": ..., "state": ...})
+            max_concurrency: Maximum requests in flight at once
 
-            # Log results
-            amenities = result.get('amenities') or []
-            room_types = result.get('room_types') or []
+        Returns:
+            One research_hotel()-style result per item, in order. Failures
+            are {"error": ..., "confidence": 0.0} entries, not exceptions.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            logger.info(f"✅ Perplexity research complete:")
-            logger.info(f"   Hotel: {hotel_name}")
-            logger.info(f"   Address: {result.get('address', 'NOT FOUND')}")
-            logger.info(f"   Amenities: {len(amenities)} found")
-            logger.info(f"   Room types: {len(room_types)} found")
-            logger.info(f"   Confidence: {confidence:.0%}")
+        async def research(item: Dict) -> Dict:
+            async with semaphore:
+                return await self.aresearch_hotel(**item)
 
-            return result
+        results = await asyncio.gather(*(research(item) for item in items), return_exceptions=True)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ JSON parse error: {str(e)}")
-            if 'response' in locals():
-                logger.error(f"   Raw: {response.choices[0].message.content[:200]}")
-            return {"error": "Failed to parse response", "confidence": 0.0}
+        return [
+            {"error": str(result), "confidence": 0.0} if isinstance(result, Exception) else result
+            for result in results
+        ]
 
+    def research_hotels(
+        self,
+        items: List[Dict],
+        max_concurrency: int = BATCH_MAX_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        research_hotels_batch() for synchronous callers.
+
+        Runs research_hotel() on a bounded thread pool rather than an event
+        loop, so the shared sync client's connection pool is reused.
+        """
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as pool:
+            return list(pool.map(lambda item: self.research_hotel(**item), items))
+
+    def _research_hotel(self, hotel_name: str, city: str, state: Optional[str]) -> Dict:
+        """Uncached research_hotel() call"""
+        content = None
+        try:
+            content = self._chat(self._research_request(hotel_name, city, state))
+            return self._research_result(hotel_name, content)
         except Exception as e:
-            logger.error(f"❌ Perplexity research failed: {str(e)}", exc_info=True)
-            return {"error": str(e), "confidence": 0.0}
+            return self._research_error(e, content)
+
+    def _research_request(self, hotel_name: str, city: str, state: Optional[str]) -> Dict:
+        """Chat completion arguments for comprehensive hotel research"""
+        # Build location string
+        location = f"{city}, {state}" if state else city
+        query = f"{hotel_name} in {location}"
+
+        logger.debug("🔍 Comprehensive research: %s", query)
+
+        return self._sonar_request(
+            RESEARCH_SYSTEM_MESSAGE,
+            RESEARCH_PROMPT.format(hotel_name=hotel_name, location=location),
+            response_format=RESEARCH_RESPONSE_FORMAT,
+            max_tokens=RESEARCH_MAX_TOKENS,
+            temperature=0.1  # Very low for factual data
+        )
+
+    @staticmethod
+    def _sonar_request(
+        system_message: Dict, prompt: str, *, response_format: Dict, max_tokens: int, temperature: float
+    ) -> Dict:
+        """Chat completion arguments for a web-grounded query answered as structured JSON"""
+        return {
+            "model": "sonar",  # Web-grounded model (new unified Sonar)
+            "messages": [system_message, {"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format
+        }
+
+    def _chat(self, request: Dict) -> str:
+        """
+        Send a Perplexity request and return the reply text.
+
+        The one place sync Perplexity calls go out: paced by the shared rate
+        limiter, retried by the client on transient errors.
+        """
+        get_perplexity_rate_limiter().acquire(tokens=request["max_tokens"])
+        response = self.client.chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    async def _achat(self, request: Dict) -> str:
+        """_chat() on the async client"""
+        await get_perplexity_rate_limiter().aacquire(tokens=request["max_tokens"])
+        response = await self.aclient.chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    def _research_result(self, hotel_name: str, content: str) -> Dict:
+        """Parse a research reply and score it (raises JSONDecodeError)"""
+        result = parse_json_content(content)
+
+        # Calculate confidence based on data completeness
+        confidence = self._calculate_confidence(result)
+        result['confidence'] = confidence
+        result['_source'] = 'perplexity'
+
+        # One summary line per call; details only when debugging
+        logger.info("✅ Perplexity research complete: %s (confidence %.0f%%)", hotel_name, confidence * 100)
+        logger.debug(
+            "   Address: %s, amenities: %d, room types: %d",
+            result.get('address') or 'NOT FOUND',
+            len(result.get('amenities') or []),
+            len(result.get('room_types') or [])
+        )
+
+        return result
+
+    def _research_error(self, error: Exception, content: Optional[str] = None) -> Dict:
+        """Log a failed research call and build its error result"""
+        if isinstance(error, json.JSONDecodeError):
+            logger.error("❌ JSON parse error: %s", error)
+            if content is not None:
+                logger.error("   Raw: %.200s", content)
+            return {"error": "Failed to parse response", "confidence": 0.0}
+
+        logger.error("❌ Perplexity research failed: %s", error, exc_info=error)
+        return {"error": str(error), "confidence": 0.0}
+
+    @staticmethod
+    def _cache_key(prefix: str, query: str) -> str:
+        """Cache key for a hotel query (case-insensitive)"""
+        return f"{prefix}:" + hashlib.sha256(query.lower().encode()).hexdigest()
+
+    @staticmethod
+    def _memoized(cache_key: str, fetch) -> Dict:
+        """
+        Cached result of fetch(), calling it on a miss.
+
+        Web research changes slowly, so one result serves every onboarding
+        of the same hotel. Error results are cached briefly too, so a
+        transient failure isn't retried on every message. Concurrent misses
+        for the same key (two onboarding pages loading at once) share one
+        fetch() instead of each calling the API.
+        """
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with inflight_lock:
+            future = inflight_research.get(cache_key)
+            leader = future is None
+            if leader:
+                future = inflight_research[cache_key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            # A lookup that finished since our miss has already cached its result
+            result = cache.get(cache_key)
+            if result is None:
+                result = fetch()
+                cache.set(cache_key, result, PerplexityService._cache_timeout(result))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with inflight_lock:
+                inflight_research.pop(cache_key, None)
+
+    @staticmethod
+    def _cache_timeout(result: Dict) -> int:
+        """How long to cache a research result (errors only briefly, confident results longest)"""
+        if "error" in result:
+            return HOTEL_INFO_ERROR_CACHE_TIMEOUT
+        if result.get("confidence", 0.0) >= CONFIDENT_RESEARCH_THRESHOLD:
+            return CONFIDENT_RESEARCH_CACHE_TIMEOUT
+        return HOTEL_INFO_CACHE_TIMEOUT
 
     def _calculate_confidence(self, data: Dict) -> float:
         """
@@ -315,24 +651,7 @@ IMPORTANT: Use null for fields you cannot find. Be thorough - search multiple so
 
         Returns 0.0 to 1.0
         """
-        score = 0.0
-
-        # Critical fields (30 points each)
-        if data.get('address'):
-            score += 0.30
-        if data.get('room_types') and len(data['room_types']) > 0:
-            score += 0.30
-
-        # Important fields (10 points each)
-        if data.get('description') and len(data['description']) > 50:
-            score += 0.10
-        if data.get('amenities') and len(data['amenities']) > 3:
-            score += 0.10
-        if data.get('website'):
-            score += 0.10
-        if data.get('phone'):
-            score += 0.10
-
+        score = sum(weight for field, weight, present in CONFIDENCE_RULES if present(data.get(field)))
         return min(score, 1.0)
 
     def get_hotel_description(
@@ -352,54 +671,124 @@ IMPORTANT: Use null for fields you cannot find. Be thorough - search multiple so
         Returns:
             Formatted description suitable for guest-facing content
         """
-        if not self.client:
+        if not self.api_key:
             return f"{hotel_name} - A quality hotel providing comfortable accommodations."
 
+        cache_key = self._cache_key("pplx:desc", f"{hotel_name}|{location or ''}|{target_length}")
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            query = f"{hotel_name}"
-            if location:
-                query += f" in {location}"
-
-            length_instructions = {
-                "short": "1-2 engaging sentences",
-                "medium": "3-4 well-crafted sentences",
-                "long": "A full paragraph (5-6 sentences)"
-            }
+            response = get_openai_client().chat.completions.create(
+                **self._description_request(hotel_name, location, target_length)
+            )
 
-            prompt = f"""Write a compelling, guest-facing description for "{query}".
+            description = response.choices[0].message.content.strip()
+            logger.debug("✅ Description generated: %.100s...", description)
 
-Requirements:
-- Length: {length_instructions.get(target_length, 'medium')}
-- Tone: Enthusiastic but professional
-- Focus: Highlight what makes this hotel special
-- Include: Key amenities, atmosphere, location benefits
-- Avoid: Generic phrases, over-promises
+            cache.set(cache_key, description, DESCRIPTION_CACHE_TIMEOUT)
+            return description
 
-Write the description as plain text (not JSON)."""
+        except Exception as e:
+            logger.error("❌ Error generating description: %s", e)
+            return self._fallback_description(hotel_name, location)
 
-            logger.info(f"📝 Generating description for {hotel_name}")
+    def stream_hotel_description(
+        self,
+        hotel_name: str,
+        location: Optional[str] = None,
+        target_length: str = "medium"
+    ) -> Iterator[str]:
+        """
+        get_hotel_description(), yielded as text chunks while it is written.
 
-            response = self.client.chat.completions.create(
-                model="sonar",  # Web-grounded model (new unified Sonar)
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert hotel copywriter. Write compelling, accurate descriptions based on web research."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,  # Slightly higher for creative writing
-                max_tokens=500
-            )
+        For UIs that render the description progressively: the first words
+        arrive after the research lookup plus time-to-first-token, not after
+        the whole description. Shares get_hotel_description's cache (a hit
+        is yielded as one chunk) and fallbacks.
+        """
+        if not self.api_key:
+            yield f"{hotel_name} - A quality hotel providing comfortable accommodations."
+            return
 
-            description = response.choices[0].message.content.strip()
-            logger.info(f"✅ Description generated: {description[:100]}...")
+        cache_key = self._cache_key("pplx:desc", f"{hotel_name}|{location or ''}|{target_length}")
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
 
-            return description
+        parts = []
+        try:
+            stream = get_openai_client().chat.completions.create(
+                **self._description_request(hotel_name, location, target_length),
+                stream=True
+            )
+
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
 
         except Exception as e:
-            logger.error(f"❌ Error generating description: {str(e)}")
-            return f"{hotel_name} offers comfortable accommodations and quality service in {location or 'a prime location'}."
+            logger.error("❌ Error streaming description: %s", e)
+            if not parts:
+                yield self._fallback_description(hotel_name, location)
+            return
+
+        description = "".join(parts).strip()
+        if description:
+            cache.set(cache_key, description, DESCRIPTION_CACHE_TIMEOUT)
+
+    def _description_request(self, hotel_name: str, location: Optional[str], target_length: str) -> Dict:
+        """
+        Chat completion arguments for writing a description.
+
+        Retrieval (web-grounded) and writing are separate steps: only the
+        research needs sonar, and it is cached for other callers. Raises
+        ValueError if the research failed.
+        """
+        hotel_info = self.get_hotel_information(hotel_name, location)
+        if "error" in hotel_info:
+            raise ValueError(hotel_info["error"])
+
+        query = f"{hotel_name}"
+        if location:
+            query += f" in {location}"
+
+        length = DESCRIPTION_LENGTHS.get(target_length, DESCRIPTION_LENGTHS["medium"])
+
+        prompt = DESCRIPTION_PROMPT.format(query=query, facts=json.dumps(hotel_info), length=length)
+
+        logger.debug("📝 Generating description for %s", hotel_name)
+
+        return {
+            "model": DESCRIPTION_MODEL,
+            "messages": [DESCRIPTION_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            "temperature": 0.7,  # Slightly higher for creative writing
+            "max_tokens": DESCRIPTION_MAX_TOKENS.get(target_length, DESCRIPTION_MAX_TOKENS["medium"])
+        }
+
+    @staticmethod
+    def _fallback_description(hotel_name: str, location: Optional[str]) -> str:
+        """Generic description when research or writing fails"""
+        return f"{hotel_name} offers comfortable accommodations and quality service in {location or 'a prime location'}."
+
+
+shared_perplexity_service = None
+
+
+def get_perplexity_service() -> PerplexityService:
+    """
+    Get or create the process-wide PerplexityService.
+
+    Shares one Perplexity client (and its connection pool) across requests
+    instead of reading the key and building a client per instance.
+    """
+    global shared_perplexity_service
+
+    if shared_perplexity_service is None:
+        shared_perplexity_service = PerplexityService()
+
+    return shared_perplexity_service
@@ -0,0 +1,81 @@
+"""
+Client-side rate limiting for AI provider APIs
+
+Paces requests to just under a provider's published limits, so bursts wait
+a few hundred milliseconds here instead of getting 429s and the SDK's
+multi-second exponential backoff.
+
+Buckets hand out reservations: a caller takes its tokens immediately (the
+bucket may go into debt) and sleeps off the deficit. That keeps the lock
+held only for arithmetic, and works the same for threads and coroutines.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Bucket refilling `capacity` tokens evenly over `period` seconds"""
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Take `amount` tokens now.
+
+        Returns:
+            Seconds the caller must wait before using them (0.0 if available)
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # A single request larger than the bucket waits for a full bucket
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and (optionally) tokens-per-minute limits.
+
+    Each request is charged one request plus its token estimate (usually
+    max_tokens) before it is sent.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request (and `tokens` tokens); returns seconds to wait"""
+        wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+
+        if wait:
+            logger.info("Rate limit: pacing request by %.2fs", wait)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a request of `tokens` tokens may be sent"""
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """acquire() without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
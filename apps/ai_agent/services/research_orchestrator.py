@@ -13,18 +13,166 @@ Aggregates data from 6 sources and makes best decisions through consensus.
 """
 
 import asyncio
+import functools
+import hashlib
 import logging
 import os
 import json
-from typing import Dict, List, Optional
-from openai import OpenAI
-from anthropic import Anthropic
-from .perplexity_service import PerplexityService
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient as AnthropicAsyncHttpxClient
+from django.conf import settings
+from django.core.cache import cache
+from openai import AsyncOpenAI
+from .openai_config import HTTP2_AVAILABLE, OPENAI_CONNECTION_LIMITS, build_async_http_client
+from .perplexity_service import get_perplexity_service, parse_json_content
 from .google_places_service import GooglePlacesService
-from .data_extractor import DataExtractor
+from .data_extractor import get_data_extractor
+from .rate_limiter import RateLimiter
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Research prompt shared by the OpenAI and Anthropic sources, parsed once at
+# import and filled in per run (literal braces are doubled)
+AI_RESEARCH_PROMPT = """Research the hotel "{hotel_name}" in {location} and provide comprehensive information.
+
+Extract:
+1. Full description (2-3 paragraphs)
+2. Complete amenities list
+3. All room types with bed configuration and capacity
+4. Contact info (address, phone, website)
+5. Total rooms, check-in/out times, policies
+
+Respond in JSON format:
+{{
+  "description": "...",
+  "amenities": ["WiFi", "Pool", ...],
+  "room_types": [{{"name": "...", "beds": "...", "capacity": 2}}],
+  "address": "...",
+  "phone": "...",
+  "website": "...",
+  "total_rooms": 17,
+  "check_in_time": "3:00 PM",
+  "check_out_time": "11:00 AM"
+}}
+
+Use null for unknown fields."""
+
+AI_RESEARCH_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a hotel research assistant. Provide accurate information in JSON format."
+}
+
+# Output cap for the OpenAI and Anthropic research calls
+AI_RESEARCH_MAX_TOKENS = 2000
+
+# Research calls are always synchronous requests, never the providers'
+# discounted Batch APIs: every run is interactive (Nora onboarding waits up
+# to 90s with a progress UI), while batches complete within 24 hours. A
+# bulk onboarding job, if one is added, is where batching would pay off.
+
+# OpenAI/Anthropic research results are cached like Perplexity's, so
+# re-running research for a hotel (retries, re-onboarding) costs no calls.
+# Perplexity and Google Places cache their own results.
+AI_RESEARCH_CACHE_TIMEOUT = 86400  # 24 hours
+
+# Default research requests per minute per provider (entry-tier account
+# limits); override with <PROVIDER>_RESEARCH_REQUESTS_PER_MINUTE
+DEFAULT_RESEARCH_REQUESTS_PER_MINUTE = {"openai": 500, "anthropic": 50}
+provider_rate_limiters: Dict[str, RateLimiter] = {}
+
+# Fields settled by agreement between sources: field -> (source, key) pairs
+# in authority order. The value most sources agree on wins; ties, and
+# fields no two sources agree on, go to the earliest source listed.
+CONSENSUS_FIELDS = {
+    # Google Places as tiebreaker
+    'hotel_name': (
+        ('Google Places', 'name'), ('Perplexity', 'hotel_name'), ('OpenAI', 'hotel_name'),
+        ('Anthropic', 'hotel_name'), ('Gemini', 'hotel_name'), ('Website', 'hotel_name'),
+    ),
+    # Google Places is most authoritative
+    'address': (
+        ('Google Places', 'address'), ('Perplexity', 'address'), ('Anthropic', 'address'),
+        ('OpenAI', 'address'), ('Website', 'address'), ('Gemini', 'address'),
+    ),
+    'phone': (
+        ('Google Places', 'phone'), ('Perplexity', 'phone'), ('Anthropic', 'phone'),
+        ('OpenAI', 'phone'), ('Website', 'phone'), ('Gemini', 'phone'),
+    ),
+    # Perplexity first: the only AI source with web search
+    'website': (
+        ('Perplexity', 'website'), ('Google Places', 'website'), ('Anthropic', 'website'),
+        ('OpenAI', 'website'), ('Website', 'website'), ('Gemini', 'website'),
+    ),
+    'check_in_time': (
+        ('Perplexity', 'check_in_time'), ('OpenAI', 'check_in_time'),
+        ('Anthropic', 'check_in_time'), ('Gemini', 'check_in_time'),
+    ),
+    'check_out_time': (
+        ('Perplexity', 'check_out_time'), ('OpenAI', 'check_out_time'),
+        ('Anthropic', 'check_out_time'), ('Gemini', 'check_out_time'),
+    ),
+}
+
+# Source progress updates are saved in batches, this long after the first
+# unsaved update (the progress UI polls about once a second)
+PROGRESS_SAVE_DELAY = 0.25
+
+# Sources researched concurrently, in _launch_parallel_research order
+SOURCE_IDS = ('perplexity', 'openai', 'anthropic', 'gemini', 'google_places')
+
+# Runs the blocking source clients (Perplexity, Places, website scraping) off
+# the event loop. Shared and bounded, sized for a few research runs at once,
+# so a burst of onboardings queues here instead of crowding the loop's
+# default executor.
+source_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="nora-sources")
+
+
+def get_provider_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get or create the process-wide research rate limiter for "openai" or "anthropic".
+
+    Shared by every orchestrator, so a burst of onboardings is paced as one
+    stream of requests under the provider's limits instead of each run
+    firing at once and collecting 429s. Works across event loops and threads,
+    unlike an asyncio.Semaphore.
+    """
+    limiter = provider_rate_limiters.get(provider)
+
+    if limiter is None:
+        prefix = f"{provider.upper()}_RESEARCH"
+        limiter = provider_rate_limiters.setdefault(provider, RateLimiter(
+            requests_per_minute=getattr(
+                settings, f"{prefix}_REQUESTS_PER_MINUTE", DEFAULT_RESEARCH_REQUESTS_PER_MINUTE[provider]
+            ),
+            tokens_per_minute=getattr(settings, f"{prefix}_TOKENS_PER_MINUTE", 0) or None,
+        ))
+
+    return limiter
+
+
+def research_cache_key(source: str, hotel_name: str, city: str, state: Optional[str]) -> str:
+    """Cache key for one source's research on a hotel (case- and whitespace-insensitive)"""
+    query = "|".join((part or "").strip().lower() for part in (hotel_name, city, state))
+    return f"research:{source}:" + hashlib.sha256(query.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=128)
+def ai_research_prompt(hotel_name: str, city: str, state: Optional[str]) -> str:
+    """AI_RESEARCH_PROMPT for a hotel, built once and shared by the OpenAI and Anthropic sources"""
+    location = f"{city}, {state}" if state else city
+    return AI_RESEARCH_PROMPT.format_map({"hotel_name": hotel_name, "location": location})
+
+
+async def run_blocking(func, *args):
+    """Await func(*args) on the source executor without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(source_executor, functools.partial(func, *args))
+
 
 class ResearchOrchestrator:
     """
@@ -47,18 +195,35 @@ class ResearchOrchestrator:
     """
 
     def __init__(self, context=None):
-        self.perplexity = PerplexityService()
+        self.perplexity = get_perplexity_service()
         self.google_places = GooglePlacesService()
-        self.data_extractor = DataExtractor()
+        self.data_extractor = get_data_extractor()
         self.context = context  # F-002.3 Phase 4.2: For progress tracking
 
-        # Initialize OpenAI for research
+        # Source progress is updated in memory and saved in batches (see
+        # _update_source_progress); the lock keeps updates out of a save
+        self._progress_lock = asyncio.Lock()
+        self._progress_dirty = False
+        self._progress_flush = None
+        self._progress_tasks = set()
+
+        # Async OpenAI and Anthropic clients for research. Async connection
+        # pools are bound to the event loop that opened them, and each
+        # research run may get its own loop (async_to_sync), so the clients
+        # belong to this orchestrator and are closed (aclose) when its run
+        # finishes. Anthropic's SDK brings its own HTTP stack, so it can't
+        # share OpenAI's pool.
         openai_key = os.getenv("OPENAI_API_KEY")
-        self.openai_client = OpenAI(api_key=openai_key) if openai_key else None
+        self.openai_client = AsyncOpenAI(
+            api_key=openai_key,
+            http_client=build_async_http_client()
+        ) if openai_key else None
 
-        # Initialize Anthropic for research
         anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-        self.anthropic_client = Anthropic(api_key=anthropic_key) if anthropic_key else None
+        self.anthropic_client = AsyncAnthropic(
+            api_key=anthropic_key,
+            http_client=AnthropicAsyncHttpxClient(limits=OPENAI_CONNECTION_LIMITS, http2=HTTP2_AVAILABLE)
+        ) if anthropic_key else None
 
         # Initialize Gemini (would need setup)
         self.gemini_client = None  # TODO: Add Gemini API when available
@@ -131,17 +296,33 @@ class ResearchOrchestrator:
 
         await sync_to_async(save_progress)()
 
+    def _report_progress(self, source_id: str, status: str, data_found: list = None, error_message: str = None):
+        """
+        Update a source's progress in the background.
+
+        Progress is advisory UI data, so sources don't wait on it (an update
+        can queue behind a batched save); research_hotel waits for pending
+        updates before its final save.
+        """
+        if not self.context:
+            return
+
+        task = asyncio.ensure_future(self._update_source_progress(source_id, status, data_found, error_message))
+        self._progress_tasks.add(task)
+        task.add_done_callback(self._progress_tasks.discard)
+
     async def _update_source_progress(self, source_id: str, status: str, data_found: list = None, error_message: str = None):
         """
         F-002.3 Phase 4.2: Update progress for a specific source.
+
+        Updates are applied in memory and saved together PROGRESS_SAVE_DELAY
+        later: sources start and finish in bursts, so one write covers
+        several transitions instead of one write each.
         """
         if not self.context:
             return
 
-        # Use sync_to_async for Django ORM operations
-        from asgiref.sync import sync_to_async
-
-        def update_and_save():
+        async with self._progress_lock:
             progress = self.context.task_state.get('_research_progress', {})
             sources = progress.get('sources', [])
 
@@ -155,9 +336,26 @@ class ResearchOrchestrator:
                     break
 
             self.context.task_state['_research_progress'] = progress
-            self.context.save()
+            self._progress_dirty = True
+
+        if self._progress_flush is None:
+            self._progress_flush = asyncio.ensure_future(self._save_progress_later())
+
+    async def _save_progress_later(self):
+        """Save buffered progress after PROGRESS_SAVE_DELAY"""
+        await asyncio.sleep(PROGRESS_SAVE_DELAY)
+        self._progress_flush = None
+        await self._save_progress()
 
-        await sync_to_async(update_and_save)()
+    async def _save_progress(self):
+        """Save buffered progress updates, if any"""
+        # Use sync_to_async for Django ORM operations
+        from asgiref.sync import sync_to_async
+
+        async with self._progress_lock:
+            if self._progress_dirty:
+                self._progress_dirty = False
+                await sync_to_async(self.context.save)()
 
     async def research_hotel(
         self,
@@ -182,6 +380,21 @@ class ResearchOrchestrator:
             - Confidence scores
             - Data completeness metrics
         """
+        try:
+            return await self._research_hotel(hotel_name, city, state)
+        finally:
+            await self.aclose()
+
+            # Final save of buffered progress, now rather than after the delay
+            if self.context:
+                await asyncio.gather(*self._progress_tasks, return_exceptions=True)
+                if self._progress_flush is not None:
+                    self._progress_flush.cancel()
+                    self._progress_flush = None
+                await self._save_progress()
+
+    async def _research_hotel(self, hotel_name: str, city: str, state: Optional[str]) -> Dict:
+        """research_hotel() body; the caller closes the API clients afterwards"""
         logger.info(f"🔍 Starting comprehensive research: {hotel_name}, {city}")
 
         # F-002.3 Phase 4.2: Initialize progress tracking
@@ -211,9 +424,10 @@ class ResearchOrchestrator:
             website_data
         )
 
-        # Phase 3: Apply intelligent defaults for gaps
+        # Phase 3: Apply intelligent defaults for gaps (may call the
+        # Google Timezone API, so off the event loop)
         logger.info("   Applying smart defaults...")
-        complete = self._apply_defaults(merged, city, state)
+        complete = await run_blocking(self._apply_defaults, merged, city, state)
 
         # Phase 4: Calculate overall confidence
         confidence = self._calculate_overall_confidence(complete, results)
@@ -230,19 +444,22 @@ class ResearchOrchestrator:
         logger.info(f"   Sources: {', '.join(complete['_sources_used'])}")
         logger.info(f"   Fields: {self._count_fields(complete)}/20")
 
-        # F-002.3 Phase 4.2: Mark research as complete
+        # F-002.3 Phase 4.2: Mark research as complete (saved with the
+        # final progress by research_hotel)
         if self.context:
-            from asgiref.sync import sync_to_async
-
-            def mark_complete():
+            async with self._progress_lock:
                 self.context.task_state['_research_in_progress'] = False
-                self.context.save()
-
-            await sync_to_async(mark_complete)()
+                self._progress_dirty = True
 
         return complete
 
-    def _research_with_openai(self, hotel_name: str, city: str, state: str) -> Dict:
+    async def aclose(self):
+        """Close the async API clients' connection pools"""
+        for api_client in (self.openai_client, self.anthropic_client):
+            if api_client is not None:
+                await api_client.close()
+
+    async def _research_with_openai(self, hotel_name: str, city: str, state: str) -> Dict:
         """
         Research hotel using OpenAI GPT-4o.
 
@@ -252,53 +469,21 @@ class ResearchOrchestrator:
             return {"error": "OpenAI not configured"}
 
         try:
-            location = f"{city}, {state}" if state else city
-
-            prompt = f"""Research the hotel "{hotel_name}" in {location} and provide comprehensive information.
-
-Extract:
-1. Full description (2-3 paragraphs)
-2. Complete amenities list
-3. All room types with bed configuration and capacity
-4. Contact info (address, phone, website)
-5. Total rooms, check-in/out times, policies
-
-Respond in JSON format:
-{{
-  "description": "...",
-  "amenities": ["WiFi", "Pool", ...],
-  "room_types": [{{"name": "...", "beds": "...", "capacity": 2}}],
-  "address": "...",
-  "phone": "...",
-  "website": "...",
-  "total_rooms": 17,
-  "check_in_time": "3:00 PM",
-  "check_out_time": "11:00 AM"
-}}
-
-Use null for unknown fields."""
+            prompt = ai_research_prompt(hotel_name, city, state)
 
             logger.info(f"   → OpenAI research: {hotel_name}")
 
-            response = self.openai_client.chat.completions.create(
+            await get_provider_rate_limiter("openai").aacquire(tokens=AI_RESEARCH_MAX_TOKENS)
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a hotel research assistant. Provide accurate information in JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=[AI_RESEARCH_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
                 temperature=0.1,
-                max_tokens=2000,
+                max_tokens=AI_RESEARCH_MAX_TOKENS,
                 response_format={"type": "json_object"}
             )
 
             content = response.choices[0].message.content.strip()
-            result = json.loads(content)
+            result = json_loads(content)
             result['_source'] = 'openai'
 
             logger.info(f"   ✓ OpenAI: Research complete")
@@ -308,7 +493,7 @@ Use null for unknown fields."""
             logger.warning(f"   ✗ OpenAI failed: {str(e)}")
             return {"error": str(e)}
 
-    def _research_with_anthropic(self, hotel_name: str, city: str, state: str) -> Dict:
+    async def _research_with_anthropic(self, hotel_name: str, city: str, state: str) -> Dict:
         """
         Research hotel using Anthropic Claude.
 
@@ -318,37 +503,14 @@ Use null for unknown fields."""
             return {"error": "Anthropic not configured"}
 
         try:
-            location = f"{city}, {state}" if state else city
-
-            prompt = f"""Research the hotel "{hotel_name}" in {location} and provide comprehensive information.
-
-Extract:
-1. Full description (2-3 paragraphs)
-2. Complete amenities list
-3. All room types with bed configuration and capacity
-4. Contact info (address, phone, website)
-5. Total rooms, check-in/out times, policies
-
-Respond in JSON format:
-{{
-  "description": "...",
-  "amenities": ["WiFi", "Pool", ...],
-  "room_types": [{{"name": "...", "beds": "...", "capacity": 2}}],
-  "address": "...",
-  "phone": "...",
-  "website": "...",
-  "total_rooms": 17,
-  "check_in_time": "3:00 PM",
-  "check_out_time": "11:00 AM"
-}}
-
-Use null for unknown fields."""
+            prompt = ai_research_prompt(hotel_name, city, state)
 
             logger.info(f"   → Anthropic research: {hotel_name}")
 
-            response = self.anthropic_client.messages.create(
+            await get_provider_rate_limiter("anthropic").aacquire(tokens=AI_RESEARCH_MAX_TOKENS)
+            response = await self.anthropic_client.messages.create(
                 model="claude-sonnet-4-20250514",
-                max_tokens=2000,
+                max_tokens=AI_RESEARCH_MAX_TOKENS,
                 temperature=0.1,
                 messages=[
                     {
@@ -358,19 +520,8 @@ Use null for unknown fields."""
                 ]
             )
 
-            # Parse JSON from response
-            content = response.content[0].text.strip()
-
-            # Remove markdown code fences if present
-            if content.startswith('```json'):
-                content = content[7:]
-            elif content.startswith('```'):
-                content = content[3:]
-            if content.endswith('```'):
-                content = content[:-3]
-
-            content = content.strip()
-            result = json.loads(content)
+            # Parse JSON from response (removing markdown code fences if present)
+            result = parse_json_content(response.content[0].text)
             result['_source'] = 'anthropic'
 
             logger.info(f"   ✓ Anthropic: Research complete")
@@ -402,110 +553,154 @@ Use null for unknown fields."""
         """
         Launch all research sources in parallel for speed.
 
+        The five independent sources run concurrently (OpenAI and Anthropic
+        on their async clients, the rest on the source executor), so the wait is the slowest source instead
+        of the sum of all of them. Website scraping runs afterwards, also in a
+        worker thread, because it needs the URL that Perplexity or Google
+        Places found.
+
         Returns dict with results from each source.
         """
+        sources = await asyncio.gather(
+            self._run_perplexity(hotel_name, city, state),
+            self._run_openai(hotel_name, city, state),
+            self._run_anthropic(hotel_name, city, state),
+            self._run_gemini(hotel_name, city, state),
+            self._run_google_places(hotel_name, city, state),
+            return_exceptions=True
+        )
+
         results = {}
+        for source_id, source in zip(SOURCE_IDS, sources):
+            # Each runner handles its own errors; this only catches the unexpected
+            if isinstance(source, Exception):
+                logger.warning(f"   ✗ {source_id} failed: {str(source)}")
+                source = {"error": str(source)}
+            results[source_id] = source
+
+        # If Perplexity found website, scrape it
+        website_url = (
+            results.get('perplexity', {}).get('website') or
+            results.get('google_places', {}).get('website')
+        )
+
+        if website_url:
+            try:
+                self._report_progress('website', 'in_progress')
+                logger.info(f"   → Scraping website: {website_url}")
+                website_data = await run_blocking(self.data_extractor.extract_from_website, website_url)
+                results['website'] = website_data
+                if 'error' not in website_data:
+                    logger.info(f"   ✓ Website: {website_data.get('confidence', 0):.0%} confidence")
+                    data_found = ['Photos', 'Description', 'Contact']
+                    self._report_progress('website', 'completed', data_found=data_found)
+                else:
+                    logger.warning(f"   ✗ Website scraping failed")
+                    self._report_progress('website', 'error', error_message=website_data.get('error', 'Failed'))
+            except Exception as e:
+                logger.warning(f"   ✗ Website scraping error: {str(e)}")
+                results['website'] = {"error": str(e)}
+                self._report_progress('website', 'error', error_message=str(e))
+        else:
+            logger.info("   → No website found, skipping scraping")
+            results['website'] = {}
+            self._report_progress('website', 'error', error_message='No website URL found')
+
+        return results
 
-        # Launch Perplexity research
+    async def _cached(self, source: str, research, hotel_name: str, city: str, state: str) -> Dict:
+        """
+        Cached result of await research(hotel_name, city, state).
+
+        Only successful results are cached, so a failed source is retried on
+        the next run.
+        """
+        cache_key = research_cache_key(source, hotel_name, city, state)
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logger.info(f"   ✓ {source}: cached research")
+            return cached
+
+        result = await research(hotel_name, city, state)
+        if result and 'error' not in result:
+            await cache.aset(cache_key, result, AI_RESEARCH_CACHE_TIMEOUT)
+        return result
+
+    async def _run_perplexity(self, hotel_name: str, city: str, state: str) -> Dict:
+        """Perplexity research with progress updates"""
         try:
-            await self._update_source_progress('perplexity', 'in_progress')
+            self._report_progress('perplexity', 'in_progress')
             logger.info("   → Perplexity research...")
-            perplexity_data = self.perplexity.research_hotel(hotel_name, city, state)
-            results['perplexity'] = perplexity_data
+            perplexity_data = await run_blocking(self.perplexity.research_hotel, hotel_name, city, state)
             logger.info(f"   ✓ Perplexity: {perplexity_data.get('confidence', 0):.0%} confidence")
             data_found = ['Description', 'Amenities', 'Room Types'] if not perplexity_data.get('error') else []
-            await self._update_source_progress('perplexity', 'completed', data_found=data_found)
+            self._report_progress('perplexity', 'completed', data_found=data_found)
+            return perplexity_data
         except Exception as e:
             logger.warning(f"   ✗ Perplexity failed: {str(e)}")
-            results['perplexity'] = {"error": str(e)}
-            await self._update_source_progress('perplexity', 'error', error_message=str(e))
+            self._report_progress('perplexity', 'error', error_message=str(e))
+            return {"error": str(e)}
 
-        # Launch OpenAI research
+    async def _run_openai(self, hotel_name: str, city: str, state: str) -> Dict:
+        """OpenAI research with progress updates"""
         try:
-            await self._update_source_progress('openai', 'in_progress')
-            openai_data = self._research_with_openai(hotel_name, city, state)
-            results['openai'] = openai_data
+            self._report_progress('openai', 'in_progress')
+            openai_data = await self._cached('openai', self._research_with_openai, hotel_name, city, state)
             data_found = ['Description', 'Room Types', 'Policies'] if not openai_data.get('error') else []
-            await self._update_source_progress('openai', 'completed', data_found=data_found)
+            self._report_progress('openai', 'completed', data_found=data_found)
+            return openai_data
         except Exception as e:
             logger.warning(f"   ✗ OpenAI failed: {str(e)}")
-            results['openai'] = {"error": str(e)}
-            await self._update_source_progress('openai', 'error', error_message=str(e))
+            self._report_progress('openai', 'error', error_message=str(e))
+            return {"error": str(e)}
 
-        # Launch Anthropic research
+    async def _run_anthropic(self, hotel_name: str, city: str, state: str) -> Dict:
+        """Anthropic research with progress updates"""
         try:
-            await self._update_source_progress('anthropic', 'in_progress')
-            anthropic_data = self._research_with_anthropic(hotel_name, city, state)
-            results['anthropic'] = anthropic_data
+            self._report_progress('anthropic', 'in_progress')
+            anthropic_data = await self._cached('anthropic', self._research_with_anthropic, hotel_name, city, state)
             data_found = ['Description', 'Amenities', 'Contact'] if not anthropic_data.get('error') else []
-            await self._update_source_progress('anthropic', 'completed', data_found=data_found)
+            self._report_progress('anthropic', 'completed', data_found=data_found)
+            return anthropic_data
         except Exception as e:
             logger.warning(f"   ✗ Anthropic failed: {str(e)}")
-            results['anthropic'] = {"error": str(e)}
-            await self._update_source_progress('anthropic', 'error', error_message=str(e))
+            self._report_progress('anthropic', 'error', error_message=str(e))
+            return {"error": str(e)}
 
-        # Launch Gemini research (placeholder)
+    async def _run_gemini(self, hotel_name: str, city: str, state: str) -> Dict:
+        """Gemini research (placeholder) with progress updates"""
         try:
-            await self._update_source_progress('gemini', 'in_progress')
+            self._report_progress('gemini', 'in_progress')
             gemini_data = self._research_with_gemini(hotel_name, city, state)
-            results['gemini'] = gemini_data
             if gemini_data.get('error'):
-                await self._update_source_progress('gemini', 'error', error_message=gemini_data.get('error'))
+                self._report_progress('gemini', 'error', error_message=gemini_data.get('error'))
             else:
                 data_found = ['Search Results']
-                await self._update_source_progress('gemini', 'completed', data_found=data_found)
+                self._report_progress('gemini', 'completed', data_found=data_found)
+            return gemini_data
         except Exception as e:
             logger.warning(f"   ✗ Gemini failed: {str(e)}")
-            results['gemini'] = {"error": str(e)}
-            await self._update_source_progress('gemini', 'error', error_message=str(e))
+            self._report_progress('gemini', 'error', error_message=str(e))
+            return {"error": str(e)}
 
-        # Launch Google Places search
+    async def _run_google_places(self, hotel_name: str, city: str, state: str) -> Dict:
+        """Google Places lookup with progress updates"""
         try:
-            await self._update_source_progress('google_places', 'in_progress')
+            self._report_progress('google_places', 'in_progress')
             logger.info("   → Google Places lookup...")
-            places_data = self.google_places.search_hotel(hotel_name, city, state)
-            results['google_places'] = places_data or {}
+            places_data = await run_blocking(self.google_places.search_hotel, hotel_name, city, state)
             if places_data:
                 logger.info(f"   ✓ Google Places: Found {places_data.get('name')}")
                 data_found = ['Address', 'Phone', 'Location', 'Photos']
-                await self._update_source_progress('google_places', 'completed', data_found=data_found)
+                self._report_progress('google_places', 'completed', data_found=data_found)
             else:
                 logger.warning("   ✗ Google Places: Not found")
-                await self._update_source_progress('google_places', 'error', error_message='Hotel not found')
+                self._report_progress('google_places', 'error', error_message='Hotel not found')
+            return places_data or {}
         except Exception as e:
             logger.warning(f"   ✗ Google Places failed: {str(e)}")
-            results['google_places'] = {"error": str(e)}
-            await self._update_source_progress('google_places', 'error', error_message=str(e))
-
-        # If Perplexity found website, scrape it
-        website_url = (
-            results.get('perplexity', {}).get('website') or
-            results.get('google_places', {}).get('website')
-        )
-
-        if website_url:
-            try:
-                await self._update_source_progress('website', 'in_progress')
-                logger.info(f"   → Scraping website: {website_url}")
-                website_data = self.data_extractor.extract_from_website(website_url)
-                results['website'] = website_data
-                if 'error' not in website_data:
-                    logger.info(f"   ✓ Website: {website_data.get('confidence', 0):.0%} confidence")
-                    data_found = ['Photos', 'Description', 'Contact']
-                    await self._update_source_progress('website', 'completed', data_found=data_found)
-                else:
-                    logger.warning(f"   ✗ Website scraping failed")
-                    await self._update_source_progress('website', 'error', error_message=website_data.get('error', 'Failed'))
-            except Exception as e:
-                logger.warning(f"   ✗ Website scraping error: {str(e)}")
-                results['website'] = {"error": str(e)}
-                await self._update_source_progress('website', 'error', error_message=str(e))
-        else:
-            logger.info("   → No website found, skipping scraping")
-            results['website'] = {}
-            await self._update_source_progress('website', 'error', error_message='No website URL found')
-
-        return results
+            self._report_progress('google_places', 'error', error_message=str(e))
+            return {"error": str(e)}
 
     def _merge_data_multi_source(
         self,
@@ -527,57 +722,21 @@ Use null for unknown fields."""
         """
         merged = {}
 
-        # Hotel name: Consensus with Google Places as tiebreaker
-        merged['hotel_name'] = self._consensus_vote([
-            google_places.get('name'),
-            perplexity.get('hotel_name'),
-            openai.get('hotel_name'),
-            anthropic.get('hotel_name'),
-            gemini.get('hotel_name'),
-            website.get('hotel_name')
-        ], prefer='google_places')
-
-        # Address: Google Places is most authoritative
-        merged['address'] = self._choose_best_with_consensus(
-            field='address',
-            sources={
-                'Google Places': google_places.get('address'),
-                'Perplexity': perplexity.get('address'),
-                'OpenAI': openai.get('address'),
-                'Anthropic': anthropic.get('address'),
-                'Gemini': gemini.get('address'),
-                'Website': website.get('address')
-            },
-            authority_order=['Google Places', 'Perplexity', 'Anthropic', 'OpenAI', 'Website']
-        )
-
-        # Phone: Google Places > AI consensus
-        merged['phone'] = self._choose_best_with_consensus(
-            field='phone',
-            sources={
-                'Google Places': google_places.get('phone'),
-                'Perplexity': perplexity.get('phone'),
-                'OpenAI': openai.get('phone'),
-                'Anthropic': anthropic.get('phone'),
-                'Gemini': gemini.get('phone'),
-                'Website': website.get('phone')
-            },
-            authority_order=['Google Places', 'Perplexity', 'Anthropic', 'OpenAI', 'Website']
-        )
-
-        # Website URL: Consensus from all sources
-        merged['website'] = self._choose_best_with_consensus(
-            field='website',
-            sources={
-                'Perplexity': perplexity.get('website'),
-                'OpenAI': openai.get('website'),
-                'Anthropic': anthropic.get('website'),
-                'Gemini': gemini.get('website'),
-                'Google Places': google_places.get('website'),
-                'Website': website.get('website')
-            },
-            authority_order=['Perplexity', 'Google Places', 'Anthropic', 'OpenAI', 'Website']
-        )
+        # Consensus fields (name, address, phone, website, check-in/out):
+        # one scan per field over its sources in authority order
+        fields_by_source = {
+            'Google Places': google_places,
+            'Perplexity': perplexity,
+            'OpenAI': openai,
+            'Anthropic': anthropic,
+            'Gemini': gemini,
+            'Website': website,
+        }
+        for field, candidates in CONSENSUS_FIELDS.items():
+            merged[field] = self._resolve_consensus(
+                field,
+                [fields_by_source[source].get(key) for source, key in candidates]
+            )
 
         # Description: Aggregate best from AI sources (longest, most detailed)
         descriptions = [
@@ -607,14 +766,19 @@ Use null for unknown fields."""
             ])
             merged['_source_room_types'] = 'AI aggregation (fallback)'
 
-        # Amenities: Union from ALL sources
-        all_amenities = []
-        for source_data in [perplexity, openai, anthropic, gemini, google_places, website]:
-            amenities = source_data.get('amenities') or []
-            all_amenities.extend(amenities)
+        # Amenities: Union from ALL sources, in first-seen order, ignoring
+        # case and spacing ("WiFi" and "wifi " are one amenity)
+        amenities = {}
+        amenity_sources = 0
+        for source_data in (perplexity, openai, anthropic, gemini, google_places, website):
+            source_amenities = source_data.get('amenities') or []
+            if source_amenities:
+                amenity_sources += 1
+            for amenity in source_amenities:
+                amenities.setdefault(str(amenity).strip().lower(), amenity)
 
-        merged['amenities'] = list(set(all_amenities))  # Deduplicate
-        merged['_source_amenities'] = f'Aggregated from {len([s for s in [perplexity, openai, anthropic, gemini, website] if s.get("amenities")])} sources'
+        merged['amenities'] = list(amenities.values())
+        merged['_source_amenities'] = f'Aggregated from {amenity_sources} sources'
 
         # GPS: Always Google Places (most accurate)
         if google_places.get('location'):
@@ -636,21 +800,6 @@ Use null for unknown fields."""
             gemini.get('total_rooms')
         ])
 
-        # Check-in/out times: Consensus
-        merged['check_in_time'] = self._consensus_vote([
-            perplexity.get('check_in_time'),
-            openai.get('check_in_time'),
-            anthropic.get('check_in_time'),
-            gemini.get('check_in_time')
-        ])
-
-        merged['check_out_time'] = self._consensus_vote([
-            perplexity.get('check_out_time'),
-            openai.get('check_out_time'),
-            anthropic.get('check_out_time'),
-            gemini.get('check_out_time')
-        ])
-
         # Policies: Best from AI sources
         merged['policies'] = (
             perplexity.get('policies') or
@@ -662,61 +811,27 @@ Use null for unknown fields."""
 
         return merged
 
-    def _consensus_vote(self, values: list, prefer: str = None) -> Optional[str]:
+    def _resolve_consensus(self, field: str, values: List[Any]) -> Optional[Any]:
         """
-        Choose value that appears most frequently (consensus).
+        Choose the value most sources agree on, else the most authoritative.
 
-        If tie, use preferred source if specified.
+        `values` are in authority order, so counting them in one pass leaves
+        ties (and the no-agreement case) with the most authoritative value.
+        Empty values are ignored.
         """
-        # Filter out None and empty values
-        valid_values = [v for v in values if v and v != ""]
-
-        if not valid_values:
-            return None
-
-        # Count occurrences
-        from collections import Counter
-        counts = Counter(valid_values)
-
-        # Return most common
-        most_common = counts.most_common(1)[0][0]
-        return most_common
-
-    def _choose_best_with_consensus(
-        self,
-        field: str,
-        sources: Dict[str, any],
-        authority_order: List[str]
-    ) -> Optional[str]:
-        """
-        Choose best value using both consensus and authority hierarchy.
-
-        1. First check if multiple sources agree (consensus)
-        2. If no consensus, use authority order
-        """
-        # Get all non-None values
-        values = {source: val for source, val in sources.items() if val}
+        counts = {}
+        for value in values:
+            if value:
+                counts[value] = counts.get(value, 0) + 1
 
-        if not values:
+        if not counts:
             return None
 
-        # Check for consensus (2+ sources with same value)
-        from collections import Counter
-        value_counts = Counter(values.values())
-
-        for value, count in value_counts.most_common():
-            if count >= 2:  # At least 2 sources agree
-                logger.debug(f"   Consensus for {field}: {count} sources agree")
-                return value
-
-        # No consensus: Use authority order
-        for authority in authority_order:
-            if authority in values:
-                logger.debug(f"   Using {authority} for {field} (authority)")
-                return values[authority]
-
-        # Fallback: First available
-        return next(iter(values.values()))
+        # max() keeps the first of equal counts: the most authoritative
+        best = max(counts, key=counts.get)
+        if counts[best] >= 2:
+            logger.debug(f"   Consensus for {field}: {counts[best]} sources agree")
+        return best
 
     def _choose_longest_description(self, descriptions: List[str]) -> Optional[str]:
         """Choose the longest, most detailed description."""
@@ -0,0 +1,129 @@
+"""
+Semantic response cache for Nora's general conversation
+
+Near-duplicate questions (same meaning, different wording) reuse a previous
+GPT-4o reply instead of making a new call. Each entry stores:
+- an L2-normalized embedding of the last few turns
+- a hash of the turns before the newest message (the "context chain")
+- the assistant reply
+
+A hit needs cosine similarity >= SIMILARITY_THRESHOLD *and* an identical
+context chain, so "what about the second one?" after different
+conversations never shares an answer.
+"""
+
+import hashlib
+import logging
+import math
+import operator
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from .openai_config import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 256  # shortened embeddings keep the pure-Python scan cheap
+SIMILARITY_THRESHOLD = 0.92
+WINDOW_TURNS = 3
+MAX_ENTRIES = 200
+SEMANTIC_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def semantic_cache_enabled() -> bool:
+    """Whether general conversation replies go through the semantic cache"""
+    return getattr(settings, "NORA_SEMANTIC_CACHE_ENABLED", True)
+
+
+def context_chain_hash(system_prompt: str, turns: List[Dict]) -> str:
+    """Hash of the system prompt and the (role, content) turns before the newest message"""
+    digest = hashlib.sha256(system_prompt.encode())
+    for turn in turns:
+        digest.update(f"\x1e{turn['role']}\x1f{turn['content']}".encode())
+    return digest.hexdigest()
+
+
+def normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length, so dot product is cosine similarity"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+def best_match(entries: List[Dict], embedding: List[float], context_hash: str) -> Tuple[Optional[Dict], float]:
+    """
+    Most similar entry with the same context chain.
+
+    Returns:
+        (entry or None, cosine similarity)
+    """
+    best, best_score = None, 0.0
+    for entry in entries:
+        if entry["context_hash"] != context_hash:
+            continue
+        score = sum(map(operator.mul, entry["embedding"], embedding))
+        if score > best_score:
+            best, best_score = entry, score
+    return best, best_score
+
+
+class SemanticCache:
+    """
+    Per-organization semantic cache of general conversation replies.
+
+    Entries live in the Django cache, so with a shared backend (Redis,
+    memcached) hits are shared between workers.
+    """
+
+    def __init__(self, organization_id, system_prompt: str):
+        self.cache_key = f"nora:semantic_cache:{organization_id}"
+        self.system_prompt = system_prompt
+
+    def lookup(self, history: List[Dict]) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Find a cached reply for the conversation ending in a user message.
+
+        Returns:
+            (cached reply or None, query to pass to store() on a miss).
+            The query is None if the embedding call failed.
+        """
+        window = history[-WINDOW_TURNS:]
+        if not window:
+            return None, None
+
+        try:
+            embedding = self._embed(window)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {str(e)}")
+            return None, None
+
+        query = {
+            "embedding": embedding,
+            "context_hash": context_chain_hash(self.system_prompt, window[:-1]),
+        }
+
+        entry, score = best_match(cache.get(self.cache_key, []), embedding, query["context_hash"])
+        if entry is not None and score >= SIMILARITY_THRESHOLD:
+            logger.info(f"Semantic cache hit (similarity {score:.3f})")
+            return entry["response"], query
+
+        return None, query
+
+    def store(self, query: Optional[Dict], response: str) -> None:
+        """Save a fresh reply under the query returned by lookup()"""
+        if query is None or not response:
+            return
+
+        entries = cache.get(self.cache_key, [])
+        entries.append({**query, "response": response})
+        cache.set(self.cache_key, entries[-MAX_ENTRIES:], SEMANTIC_CACHE_TIMEOUT)
+
+    def _embed(self, turns: List[Dict]) -> List[float]:
+        """Embed the (role, content) turns as one normalized vector"""
+        text = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        response = get_openai_client().embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=text,
+            dimensions=EMBEDDING_DIMENSIONS,
+        )
+        return normalize(response.data[0].embedding)
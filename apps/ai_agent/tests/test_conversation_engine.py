@@ -0,0 +1,53 @@
+"""
+Tests for Conversation Engine - onboarding state machine
+"""
+
+from apps.ai_agent.services.conversation_engine import OnboardingEngine
+
+
+class TestNextQuestion:
+    """Test the canned question for the next missing field"""
+
+    def test_first_missing_field(self):
+        """Test the question targets the first missing field of the state"""
+        engine = OnboardingEngine({"hotel_name": "Sunset Villa"})
+
+        assert engine.get_next_question_text() == OnboardingEngine.FIELD_QUESTIONS["city"]
+
+    def test_later_state(self):
+        """Test questions follow the current state"""
+        engine = OnboardingEngine({"step": "room_types"})
+
+        assert engine.get_next_question_text() == OnboardingEngine.FIELD_QUESTIONS["room_types"]
+
+    def test_nothing_missing(self):
+        """Test None once the current state is complete"""
+        engine = OnboardingEngine({
+            "hotel_name": "Sunset Villa",
+            "city": "Miami",
+            "country": "United States",
+            "contact_email": "info@sunsetvilla.com",
+        })
+
+        assert engine.get_next_question_text() is None
+
+
+class TestUpdateFields:
+    """Test batched task_state updates"""
+
+    def test_merges_fields_and_reports_completion(self):
+        """Test fields are merged in one call and completion is reported"""
+        engine = OnboardingEngine({"hotel_name": "Sunset Villa"})
+
+        assert not engine.update_fields({"city": "Miami"})
+        assert engine.update_fields({"country": "United States", "contact_email": "info@sunsetvilla.com"})
+        assert engine.task_state["city"] == "Miami"
+        assert "last_update_at" in engine.task_state
+
+    def test_empty_update_leaves_state_untouched(self):
+        """Test an empty dict doesn't bump last_update_at"""
+        engine = OnboardingEngine({"hotel_name": "Sunset Villa"})
+
+        engine.update_fields({})
+
+        assert "last_update_at" not in engine.task_state
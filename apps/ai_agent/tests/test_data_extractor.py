@@ -0,0 +1,72 @@
+"""
+Tests for Data Extractor - HTML text and sub-page extraction (no network or GPT calls)
+"""
+
+from apps.ai_agent.services.data_extractor import extract_clean_text, find_subpage_urls, parse_html
+
+
+class TestExtractCleanText:
+    """Test readable text extraction from website HTML"""
+
+    def test_drops_non_content_tags_and_comments(self):
+        """Test scripts, styles, noscript and comments never reach the prompt"""
+        html = (
+            "<html><head><title>Sunset Villa</title><style>p {}</style></head>"
+            "<body><!-- nav --><h1>Sunset Villa Resort</h1>"
+            "<script>var a = 1;</script>after script<noscript>enable js</noscript></body></html>"
+        )
+
+        assert extract_clean_text(html) == "Sunset Villa\nSunset Villa Resort\nafter script"
+
+    def test_one_stripped_line_per_line_of_text(self):
+        """Test multi-line text nodes are split and whitespace-only lines dropped"""
+        html = "<p>123 Ocean Drive,<br>Miami Beach, FL\n   33139</p><p>   </p>"
+
+        assert extract_clean_text(html) == "123 Ocean Drive,\nMiami Beach, FL\n33139"
+
+    def test_xml_declaration(self):
+        """Test XHTML pages with an encoding declaration still parse"""
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>Café</p></body></html>'
+
+        assert extract_clean_text(html) == "Café"
+
+    def test_empty_document(self):
+        """Test blank pages return no text instead of raising"""
+        assert extract_clean_text("   ") == ""
+
+    def test_truncates_long_text(self):
+        """Test text over the limit is cut and marked"""
+        text = extract_clean_text("<p>" + "a" * 50 + "</p>", max_chars=10)
+
+        assert text == "a" * 10 + "\n\n[Content truncated...]"
+
+
+class TestFindSubpageUrls:
+    """Test discovery of same-site pages likely to hold hotel details"""
+
+    def _urls(self, body, page_url="https://sunsetvilla.com/", **kwargs):
+        return find_subpage_urls(parse_html(f"<html><body>{body}</body></html>"), page_url, **kwargs)
+
+    def test_matches_path_or_link_text(self):
+        """Test relative links resolve and match on path or visible text"""
+        body = '<a href="/about-us">Our story</a><a href="/p/42">Contact</a><a href="/blog">Blog</a>'
+
+        assert self._urls(body) == ["https://sunsetvilla.com/about-us", "https://sunsetvilla.com/p/42"]
+
+    def test_same_site_only(self):
+        """Test other domains and non-web links are skipped; www is the same site"""
+        body = (
+            '<a href="https://booking.com/rooms">Rooms</a><a href="mailto:info@sunsetvilla.com">Contact</a>'
+            '<a href="https://www.sunsetvilla.com/rooms">Rooms</a>'
+        )
+
+        assert self._urls(body) == ["https://www.sunsetvilla.com/rooms"]
+
+    def test_deduplicates_and_limits(self):
+        """Test repeated links (and fragments) count once, up to the limit"""
+        body = (
+            '<a href="/">Home</a><a href="/rooms">Rooms</a><a href="/rooms/#suites">Suites</a>'
+            '<a href="/contact">Contact</a><a href="/location">Location</a>'
+        )
+
+        assert self._urls(body, limit=2) == ["https://sunsetvilla.com/rooms", "https://sunsetvilla.com/contact"]
@@ -19,7 +19,7 @@ User = get_user_model()
 class TestDataGenerator:
     """Test hotel generation from onboarding data"""
 
-    def test_generate_hotel_from_onboarding_basic(self):
+    def test_generate_hotel_from_onboarding_basic(self, django_capture_on_commit_callbacks):
         """Test basic hotel creation from onboarding data"""
         # Setup
         user = User.objects.create_user(
@@ -99,9 +99,10 @@ class TestDataGenerator:
             }
         )
 
-        # Execute
+        # Execute (context completion is deferred to transaction commit)
         generator = DataGenerator(user=user, organization=org)
-        result = generator.generate_hotel_from_onboarding(context)
+        with django_capture_on_commit_callbacks(execute=True):
+            result = generator.generate_hotel_from_onboarding(context)
 
         # Debug: Print result if failed
         if not result['success']:
@@ -209,6 +210,33 @@ class TestDataGenerator:
         hotel = result['hotel']
         assert hotel.slug == 'sunset-villa-1'  # Auto-incremented
 
+    def test_generate_hotel_malformed_room_data_fail(self, monkeypatch):
+        """Test that malformed onboarding data returns errors instead of raising"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")  # fails before any GPT call
+        user = User.objects.create_user(username="owner3", email="owner3@test.com")
+        org = Organization.objects.create(name="Org 3", slug="org-3")
+
+        context = NoraContext.objects.create(
+            user=user,
+            organization=org,
+            active_task='onboarding',
+            task_state={
+                'state': 'COMPLETE',
+                'field_values': {
+                    'hotel_name': 'Sunset Villa',
+                    'description': 'A quiet beachfront villa with twelve sea-view rooms.',
+                    'num_room_types': 'two',  # Not a number
+                }
+            }
+        )
+
+        generator = DataGenerator(user=user, organization=org)
+        result = generator.generate_hotel_from_onboarding(context)
+
+        assert result['success'] is False
+        assert result['errors'] == ["invalid literal for int() with base 10: 'two'"]
+        assert not Hotel.objects.filter(organization=org).exists()
+
     def test_generate_hotel_missing_context_fail(self):
         """Test that generation fails if context is not in onboarding state"""
         user = User.objects.create_user(username="owner2", email="owner2@test.com")
@@ -0,0 +1,114 @@
+"""
+Tests for Intent Detector - pattern-based fast path
+
+These tests cover _pattern_match only; GPT classification is never reached.
+"""
+
+import pytest
+from apps.ai_agent.services.intent_detector import IntentDetector, Intent
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    """IntentDetector with a dummy OpenAI key (no API calls are made)"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return IntentDetector(gpt_fallback_enabled=False)
+
+
+class TestIntentPatternMatching:
+    """Test fast pattern matching and its precedence order"""
+
+    @pytest.mark.parametrize("message,expected", [
+        ("https://sunsetvilla.com", Intent.PROVIDE_URL),
+        ("HTTPS://SunsetVilla.com", Intent.PROVIDE_URL),
+        ("www.sunsetvilla.com", Intent.PROVIDE_URL),
+        ("yes", Intent.CONFIRM),
+        ("Yeah, that's right!", Intent.CONFIRM),
+        ("Sounds good", Intent.CONFIRM),
+        ("Perfect", Intent.CONFIRM),
+        ("✓", Intent.CONFIRM),
+        ("no", Intent.REJECT),
+        ("NO", Intent.REJECT),
+        ("Nope, that's wrong", Intent.REJECT),
+        ("❌", Intent.REJECT),
+        ("What does this mean", Intent.ASK_QUESTION),
+        ("Is breakfast included?", Intent.ASK_QUESTION),
+        ("Can you do that for me", Intent.ASK_QUESTION),
+        ("I want to change the name", Intent.EDIT_REQUEST),
+        ("go back", Intent.EDIT_REQUEST),
+        ("I'm stuck", Intent.REQUEST_HELP),
+        ("I don't understand", Intent.REQUEST_HELP),
+    ])
+    def test_pattern_match_intents(self, detector, message, expected):
+        """Test each intent category is detected from obvious messages"""
+        intent, confidence = detector.detect_intent(message)
+
+        assert intent == expected
+        assert confidence >= 0.85
+
+    def test_url_takes_precedence(self, detector):
+        """Test URL detection wins over other patterns"""
+        intent, _ = detector.detect_intent("yes, it's https://sunsetvilla.com")
+
+        assert intent == Intent.PROVIDE_URL
+
+    def test_confirm_takes_precedence_over_question(self, detector):
+        """Test confirmation is checked before questions"""
+        intent, _ = detector.detect_intent("ok, what next?")
+
+        assert intent == Intent.CONFIRM
+
+    @pytest.mark.parametrize("message,expected", [
+        ("👍 looks good", Intent.CONFIRM),
+        ("✓", Intent.CONFIRM),
+        ("👎", Intent.REJECT),
+        ("✗ that's not it", Intent.REJECT),
+    ])
+    def test_leading_emoji_replies(self, detector, message, expected):
+        """Test leading confirm/reject emoji are detected with high confidence"""
+        assert detector.detect_intent(message) == (expected, 0.95)
+
+    def test_bare_domain_in_email_is_not_url(self, detector):
+        """Test only scheme or www. addresses count as URLs, not email domains"""
+        assert detector.extract_url_from_message("info@sunsetvilla.com") is None
+
+    def test_word_boundaries_respected(self, detector):
+        """Test partial words don't trigger patterns ("know" is not "no")"""
+        assert detector._pattern_match("i know the street name") is None
+
+    def test_no_match_returns_none(self, detector):
+        """Test plain data falls through to GPT classification"""
+        assert detector._pattern_match("sunset villa") is None
+
+    @pytest.mark.parametrize("message", [
+        "123 Ocean Drive, Miami",
+        "+1 305-555-1234",
+        "info@sunsetvilla.com",
+    ])
+    def test_data_heuristic_skips_gpt(self, detector, message):
+        """Test short data-looking replies classify as PROVIDE_DATA without GPT"""
+        assert detector.detect_intent(message) == (Intent.PROVIDE_DATA, 0.7)
+
+    def test_data_heuristic_ignores_questions_and_long_text(self, detector):
+        """Test the heuristic doesn't claim questions or long free text"""
+        assert not detector._looks_like_data("is it 3 pm?")
+        assert not detector._looks_like_data("we have 45 rooms, " + "a" * 80)
+
+    def test_gpt_fallback_disabled_defaults_to_data(self, detector):
+        """Test unmatched messages default to PROVIDE_DATA when GPT is disabled"""
+        assert detector.detect_intent("sunset villa") == (Intent.PROVIDE_DATA, 0.5)
+
+    def test_extract_url_from_message(self, detector):
+        """Test URL extraction from surrounding text"""
+        url = detector.extract_url_from_message("Our site is https://sunsetvilla.com/rooms thanks")
+
+        assert url == "https://sunsetvilla.com/rooms"
+
+    def test_needs_gpt(self, monkeypatch):
+        """Test only messages the fast path can't resolve report needing GPT"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        detector = IntentDetector()
+
+        assert detector.needs_gpt("sunset villa")
+        assert not detector.needs_gpt("yes")
+        assert not IntentDetector(gpt_fallback_enabled=False).needs_gpt("sunset villa")
@@ -2,8 +2,9 @@
 Tests for Nora AI Agent models
 """
 
+import tempfile
 from datetime import datetime, timedelta
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db import IntegrityError
@@ -269,6 +270,76 @@ class NoraContextModelTests(TestCase):
         self.assertEqual(context.recent_actions[0]["action"], "completed_onboarding")
         self.assertEqual(context.recent_actions[0]["details"]["step"], "HOTEL_BASICS")
 
+    def test_complete_task_single_update(self):
+        """Test complete_task() writes the action log and cleared task in one UPDATE"""
+        context = NoraContext.objects.create(
+            user=self.user,
+            organization=self.organization,
+            active_task="onboarding",
+            task_state={"step": "HOTEL_BASICS"}
+        )
+
+        with self.assertNumQueries(1):
+            context.complete_task()
+
+    def test_batch_saves(self):
+        """Test batch_saves() collapses saves into one UPDATE on exit"""
+        context = NoraContext.objects.create(
+            user=self.user,
+            organization=self.organization
+        )
+
+        with self.assertNumQueries(1):
+            with context.batch_saves():
+                context.add_message(role="user", content="Hello")
+                context.update_task_state({"step": "ROOM_TYPES"})
+                context.add_message(role="assistant", content="Hi!")
+
+        context.refresh_from_db()
+        self.assertEqual(len(context.conversation_history), 2)
+        self.assertEqual(context.task_state["step"], "ROOM_TYPES")
+
+    def test_batch_saves_flushes_on_error(self):
+        """Test batched changes are still written if the block raises"""
+        context = NoraContext.objects.create(
+            user=self.user,
+            organization=self.organization
+        )
+
+        with self.assertRaises(ValueError):
+            with context.batch_saves():
+                context.add_message(role="user", content="Hello")
+                raise ValueError("handler failed")
+
+        context.refresh_from_db()
+        self.assertEqual(len(context.conversation_history), 1)
+
+    def test_get_cached_without_shared_cache(self):
+        """Test get_cached() reads the DB when the cache is process-local"""
+        context = NoraContext.get_cached(self.user, self.organization)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(NoraContext.get_cached(self.user, self.organization).id, context.id)
+
+    def test_get_cached_with_shared_cache(self):
+        """Test get_cached() serves hits from a shared cache and saves write through"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            shared_cache = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir,
+                }
+            }
+            with override_settings(CACHES=shared_cache):
+                context = NoraContext.get_cached(self.user, self.organization)
+                context.update_task_state({"step": "ROOM_TYPES"})
+
+                with self.assertNumQueries(0):
+                    cached = NoraContext.get_cached(self.user, self.organization)
+
+                self.assertEqual(cached.id, context.id)
+                self.assertEqual(cached.task_state["step"], "ROOM_TYPES")
+
     def test_string_representation(self):
         """Test __str__() method"""
         context = NoraContext.objects.create(
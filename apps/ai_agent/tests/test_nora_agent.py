@@ -0,0 +1,192 @@
+"""
+Tests for Nora Agent - local (non-GPT) helpers
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from apps.ai_agent.services import nora_agent
+from apps.ai_agent.services.nora_agent import (
+    EXTRACT_TOOL, address_label_logit_bias, classify_address_reply, extract_contact_fields, missing_fields_message,
+    present_fields, research_cache_key, trim_history_to_budget
+)
+from apps.ai_agent.services.openai_config import estimate_tokens
+
+
+class TestAddressReplyClassification:
+    """Test keyword classification of address confirmation replies"""
+
+    @pytest.mark.parametrize("message,expected", [
+        ("yes", "CONFIRM"),
+        ("Yep, that's right", "CONFIRM"),
+        ("OK", "CONFIRM"),
+        ("no", "DENY"),
+        ("Nope", "DENY"),
+        ("that's not right", "DENY"),
+        ("It's incorrect", "DENY"),
+    ])
+    def test_obvious_replies(self, message, expected):
+        """Test common confirm/deny replies are classified locally"""
+        assert classify_address_reply(message) == expected
+
+    def test_ambiguous_reply_returns_none(self):
+        """Test replies without confirm/deny words fall through to GPT"""
+        assert classify_address_reply("it's on the corner of 5th street") is None
+
+    def test_word_boundaries_respected(self):
+        """Test partial words don't match ("know" is not "no", "bright" is not "right")"""
+        assert classify_address_reply("I know, the bright blue building") is None
+
+
+class TestAddressLabelLogitBias:
+    """Test the classifier's label-token logit bias"""
+
+    def test_bias_recovers_once_encoding_loads(self, monkeypatch):
+        """Test a missing encoding isn't remembered; the bias is built once one loads"""
+        monkeypatch.setattr(nora_agent, "address_label_bias", None)
+        monkeypatch.setattr(nora_agent, "get_token_encoding", lambda: None)
+
+        assert address_label_logit_bias() == {}
+
+        # One token per label, keyed by the label's code point
+        encoding = SimpleNamespace(encode=lambda text: [ord(text.strip())])
+        monkeypatch.setattr(nora_agent, "get_token_encoding", lambda: encoding)
+
+        bias = address_label_logit_bias()
+        assert bias == {str(ord(label)): 100 for label in "CDU"}
+        assert address_label_logit_bias() is bias
+
+
+class TestContactFieldExtraction:
+    """Test local parsing of emails, phones, URLs and state codes"""
+
+    def test_email(self):
+        """Test a bare email is extracted as contact_email"""
+        assert extract_contact_fields("john@sunsetvilla.com") == {"contact_email": "john@sunsetvilla.com"}
+
+    def test_phone(self):
+        """Test a formatted phone number is extracted"""
+        assert extract_contact_fields("call us at +1 (305) 555-1234") == {"phone": "+1 (305) 555-1234"}
+
+    def test_website(self):
+        """Test a URL is extracted as website"""
+        assert extract_contact_fields("https://sunsetvilla.com") == {"website": "https://sunsetvilla.com"}
+
+    def test_state_code_only_when_whole_message(self):
+        """Test a state code is only taken from a message that is just the code"""
+        assert extract_contact_fields("nh") == {"state": "NH"}
+        assert extract_contact_fields("or maybe later") == {}
+
+    def test_email_digits_not_read_as_phone(self):
+        """Test digits inside emails/URLs don't produce a phone number"""
+        fields = extract_contact_fields("info1234567@hotel.com, https://hotel.com/rooms/1234567")
+
+        assert "phone" not in fields
+        assert fields["contact_email"] == "info1234567@hotel.com"
+
+    def test_plain_text_extracts_nothing(self):
+        """Test names and cities are left for GPT extraction"""
+        assert extract_contact_fields("Sunset Villa in Miami") == {}
+
+
+class TestExtractTool:
+    """Test the extraction tool schema is valid for strict function calling"""
+
+    def test_strict_schema_requires_every_field(self):
+        """Test strict mode rules: all properties required, no extras, nullable strings"""
+        parameters = EXTRACT_TOOL["function"]["parameters"]
+
+        assert EXTRACT_TOOL["function"]["strict"] is True
+        assert parameters["additionalProperties"] is False
+        assert set(parameters["required"]) == parameters["properties"].keys()
+        assert all(spec["type"] == ["string", "null"] for spec in parameters["properties"].values())
+
+
+class TestPresentFields:
+    """Test filtering of empty extractor output"""
+
+    def test_drops_empty_values(self):
+        """Test None, blank strings and "null" are dropped"""
+        extracted = {"hotel_name": "Sunset Villa", "city": None, "state": "  ", "country": "null"}
+
+        assert present_fields(extracted) == {"hotel_name": "Sunset Villa"}
+
+    def test_keeps_non_string_values(self):
+        """Test numbers and lists pass through untouched"""
+        extracted = {"total_rooms": 0, "room_types": [{"name": "Suite"}]}
+
+        assert present_fields(extracted) == extracted
+
+
+class TestResearchCacheKey:
+    """Test prefetched research keys"""
+
+    def test_key_covers_searched_hotel(self):
+        """Test another hotel or context never shares a key; case and spacing don't matter"""
+        key = research_cache_key(7, "Inn 32", "Woodstock")
+
+        assert key == research_cache_key(7, " inn 32 ", "WOODSTOCK")
+        assert key != research_cache_key(7, "Woodstock Inn", "Woodstock")
+        assert key != research_cache_key(7, "Inn 32", None)
+        assert key != research_cache_key(8, "Inn 32", "Woodstock")
+
+
+class TestHistoryTrimming:
+    """Test the token-budgeted conversation window"""
+
+    def _history(self, count):
+        return [{"role": "user", "content": f"message number {i} " * 20} for i in range(count)]
+
+    def test_keeps_newest_messages_within_budget(self):
+        """Test the window is the newest messages, in order, under the budget"""
+        history = self._history(10)
+        per_message = estimate_tokens(history[0]["content"])
+
+        trimmed = trim_history_to_budget(history, budget=per_message * 3 + 1)
+
+        assert trimmed == history[-3:]
+
+    def test_always_keeps_newest_message(self):
+        """Test a single oversized message is still sent"""
+        history = self._history(3)
+
+        assert trim_history_to_budget(history, budget=1) == history[-1:]
+
+    def test_empty_history(self):
+        """Test an empty conversation stays empty"""
+        assert trim_history_to_budget([], budget=100) == []
+
+    def test_token_counts_stored_on_messages(self):
+        """Test counts are cached on each visited message and reused"""
+        history = self._history(2)
+
+        trim_history_to_budget(history, budget=10_000)
+
+        assert all(msg["tokens"] == estimate_tokens(msg["content"]) for msg in history)
+
+        history[0]["tokens"] = 10_000
+        assert trim_history_to_budget(history, budget=10_000) == history[-1:]
+
+
+class TestMissingFieldsMessage:
+    """Test the follow-up asking for still-missing fields"""
+
+    @pytest.mark.parametrize("missing,updated,expected", [
+        (["contact_email"], True, "Perfect! Last thing - what's your email address?"),
+        (["contact_email"], False, "What's your email address?"),
+        (["phone"], False, "What's your phone number?"),
+        (["city"], True, "Perfect! One more thing - what's the city?"),
+        (["city"], False, "What's the city?"),
+        (["city", "country"], True, "Great! I still need the city and the country. Can you share those with me?"),
+        (
+            ["hotel_name", "city", "country"], True,
+            "Great! I still need your hotel name, the city, and the country. Can you share those with me?",
+        ),
+        (
+            ["city", "country"], False,
+            "I need a few more details: the city, the country. Can you help me with those?",
+        ),
+    ])
+    def test_messages(self, missing, updated, expected):
+        """Test wording for single, special-cased and multiple fields"""
+        assert missing_fields_message(missing, updated) == expected
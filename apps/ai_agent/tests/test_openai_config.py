@@ -0,0 +1,141 @@
+"""
+Tests for OpenAI config - request coalescing and token counting (no API calls)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from apps.ai_agent.services import openai_config
+from apps.ai_agent.services.openai_config import (
+    completion_key, create_chat_completion, estimate_tokens, get_token_encoding, inflight_completions
+)
+
+
+class BlockingCompletions:
+    """Stand-in for client.chat.completions that holds each call until released"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+
+    def create(self, **request):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return object()
+
+
+def make_client(completions, base_url="https://api.openai.com/v1/"):
+    return SimpleNamespace(base_url=base_url, chat=SimpleNamespace(completions=completions))
+
+
+class TestCreateChatCompletion:
+    """Test identical concurrent requests share one call"""
+
+    REQUEST = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hi"}], "temperature": 0.1}
+
+    def _run_pair(self, client):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(create_chat_completion, client, **self.REQUEST)
+            client.chat.completions.entered.wait(5)
+            follower = pool.submit(create_chat_completion, client, **self.REQUEST)
+            time.sleep(0.2)  # let the follower find the in-flight call
+            client.chat.completions.release.set()
+            return leader, follower
+
+    def test_duplicates_share_response(self):
+        """Test a duplicate request waits for the first and gets its response"""
+        client = make_client(BlockingCompletions())
+
+        leader, follower = self._run_pair(client)
+
+        assert leader.result() is follower.result()
+        assert client.chat.completions.calls == 1
+        assert inflight_completions == {}
+
+    def test_duplicates_share_exception(self):
+        """Test a failed call raises in every waiting caller"""
+        client = make_client(BlockingCompletions(error=RuntimeError("rate limited")))
+
+        leader, follower = self._run_pair(client)
+
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="rate limited"):
+                future.result()
+        assert client.chat.completions.calls == 1
+        assert inflight_completions == {}
+
+    def test_key_covers_endpoint_and_parameters(self):
+        """Test different endpoints or parameters never coalesce"""
+        openai = make_client(None)
+        perplexity = make_client(None, base_url="https://api.perplexity.ai")
+
+        key = completion_key(openai, self.REQUEST)
+
+        assert key == completion_key(openai, dict(self.REQUEST))
+        assert key != completion_key(perplexity, self.REQUEST)
+        assert key != completion_key(openai, {**self.REQUEST, "temperature": 0.7})
+
+
+class FakeTiktoken:
+    """Stand-in for the tiktoken module, optionally failing to load its encoding"""
+
+    def __init__(self, error=None):
+        self.loads = 0
+        self.error = error
+
+    def encoding_for_model(self, model):
+        self.loads += 1
+        if self.error:
+            raise self.error
+        return SimpleNamespace(encode=str.split)
+
+
+class TestTokenEncoding:
+    """Test token counting with and without a usable tiktoken encoding"""
+
+    # tiktoken isn't installed in the test environment, so it is faked
+    @pytest.fixture(autouse=True)
+    def reset_encoding(self, monkeypatch):
+        monkeypatch.setattr(openai_config, "token_encoding", None)
+        monkeypatch.setattr(openai_config, "token_encoding_failed_at", None)
+
+    def test_uses_encoding(self, monkeypatch):
+        """Test tokens are counted with the loaded encoding, loaded once"""
+        fake = FakeTiktoken()
+        monkeypatch.setattr(openai_config, "tiktoken", fake)
+
+        assert estimate_tokens("three short words") == 3
+        assert estimate_tokens("two words") == 2
+        assert fake.loads == 1
+
+    def test_failed_download_falls_back_to_estimate(self, monkeypatch):
+        """Test a failed encoding download estimates tokens instead of raising"""
+        fake = FakeTiktoken(error=OSError("could not download o200k_base"))
+        monkeypatch.setattr(openai_config, "tiktoken", fake)
+
+        assert get_token_encoding() is None
+        assert estimate_tokens("a" * 40) == 11
+        assert fake.loads == 1  # not retried on every call
+
+    def test_retries_after_interval(self, monkeypatch):
+        """Test loading is retried once the retry interval has passed"""
+        fake = FakeTiktoken(error=OSError("offline"))
+        monkeypatch.setattr(openai_config, "tiktoken", fake)
+        get_token_encoding()
+
+        fake.error = None
+        monkeypatch.setattr(
+            openai_config, "token_encoding_failed_at",
+            openai_config.token_encoding_failed_at - openai_config.TOKEN_ENCODING_RETRY_INTERVAL
+        )
+
+        assert estimate_tokens("now exact") == 2
+        assert fake.loads == 2
@@ -0,0 +1,288 @@
+"""
+Tests for Perplexity Service - response parsing (no API calls)
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+from django.core.cache import cache
+from apps.ai_agent.services.perplexity_service import (
+    CONFIDENT_RESEARCH_CACHE_TIMEOUT, HOTEL_INFO_CACHE_TIMEOUT, HOTEL_INFO_ERROR_CACHE_TIMEOUT,
+    HOTEL_INFO_PROMPT, HOTEL_INFO_SCHEMA, RESEARCH_PROMPT, RESEARCH_SCHEMA, PerplexityService, parse_json_content,
+    ainflight_research, inflight_research, strip_code_fences
+)
+
+
+class TestParseJsonContent:
+    """Test structured-output parsing with the code-fence fallback"""
+
+    @pytest.mark.parametrize("content", [
+        '{"general_info": "Boutique hotel"}',
+        '```json\n{"general_info": "Boutique hotel"}\n```',
+        '```\n{"general_info": "Boutique hotel"}\n```',
+        '  ```JSON {"general_info": "Boutique hotel"}```  ',
+    ])
+    def test_plain_and_fenced_json(self, content):
+        """Test structured replies and fenced fallbacks parse the same"""
+        assert parse_json_content(content) == {"general_info": "Boutique hotel"}
+
+    def test_strip_code_fences_keeps_inner_backticks(self):
+        """Test only the wrapping fence is removed"""
+        assert strip_code_fences('```json\n{"note": "use `code`"}\n```') == '{"note": "use `code`"}'
+
+    def test_invalid_json_raises(self):
+        """Test unparseable replies still raise JSONDecodeError for the caller"""
+        with pytest.raises(json.JSONDecodeError):
+            parse_json_content("Sorry, I couldn't find that hotel.")
+
+
+class TestSchemas:
+    """Test structured-output schemas are closed at every level"""
+
+    def _objects(self, schema):
+        if schema.get("type") == "object":
+            yield schema
+        children = list(schema.get("properties", {}).values())
+        if "items" in schema:
+            children.append(schema["items"])
+        for child in children:
+            yield from self._objects(child)
+
+    @pytest.mark.parametrize("schema", [HOTEL_INFO_SCHEMA, RESEARCH_SCHEMA])
+    def test_all_fields_required(self, schema):
+        """Test the model must return (possibly null) values for every field, and no others"""
+        objects = list(self._objects(schema))
+
+        assert len(objects) == (1 if schema is HOTEL_INFO_SCHEMA else 3)
+        for obj in objects:
+            assert set(obj["required"]) == obj["properties"].keys()
+            assert obj["additionalProperties"] is False
+
+
+class TestPrompts:
+    """Test the prompt templates format and describe every schema field"""
+
+    @pytest.mark.parametrize("template,schema", [
+        (HOTEL_INFO_PROMPT.format(query="Inn 32 in Woodstock"), HOTEL_INFO_SCHEMA),
+        (RESEARCH_PROMPT.format(hotel_name="Inn 32", location="Woodstock, NH"), RESEARCH_SCHEMA),
+    ])
+    def test_fields_named_in_prompt(self, template, schema):
+        """Test every field the schema requires appears in the formatted prompt"""
+        assert "Inn 32" in template
+        assert all(f'"{field}"' in template for field in schema["required"])
+
+
+class TestCalculateConfidence:
+    """Test research confidence scoring from field completeness"""
+
+    def _score(self, data):
+        return PerplexityService.__new__(PerplexityService)._calculate_confidence(data)
+
+    def test_complete_result(self):
+        """Test a result with every field scores 1.0"""
+        data = {
+            "address": "123 Main St", "room_types": [{"name": "Suite"}], "description": "x" * 51,
+            "amenities": ["WiFi", "Pool", "Gym", "Spa"], "website": "https://inn32.com", "phone": "603-555-0100",
+        }
+
+        assert self._score(data) == pytest.approx(1.0)
+
+    def test_thresholds(self):
+        """Test short descriptions and short amenity lists don't count"""
+        data = {"address": "123 Main St", "description": "x" * 50, "amenities": ["WiFi", "Pool", "Gym"]}
+
+        assert self._score(data) == pytest.approx(0.30)
+
+    def test_empty_and_null_fields(self):
+        """Test missing, null and empty values score nothing"""
+        assert self._score({"address": None, "room_types": [], "website": ""}) == 0.0
+
+
+class TestCacheKey:
+    """Test cache keys for research and description results"""
+
+    def test_case_insensitive(self):
+        """Test differently-cased queries share a cache entry"""
+        assert PerplexityService._cache_key("pplx:info", "Sunset Villa in Miami") == \
+            PerplexityService._cache_key("pplx:info", "sunset villa in MIAMI")
+
+    def test_prefix_separates_kinds(self):
+        """Test research and descriptions for the same hotel never collide"""
+        assert PerplexityService._cache_key("pplx:info", "Sunset Villa") != \
+            PerplexityService._cache_key("pplx:desc", "Sunset Villa")
+
+
+class TestMemoized:
+    """Test the cache in front of Perplexity research calls"""
+
+    def test_fetches_once(self):
+        """Test a cached result is returned without calling the API again"""
+        key = f"test:{uuid.uuid4()}"
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"general_info": "Boutique hotel"}
+
+        assert PerplexityService._memoized(key, fetch) == {"general_info": "Boutique hotel"}
+        assert PerplexityService._memoized(key, fetch) == {"general_info": "Boutique hotel"}
+        assert len(calls) == 1
+
+    def test_errors_cached(self):
+        """Test error results are cached (briefly) instead of retried immediately"""
+        key = f"test:{uuid.uuid4()}"
+
+        PerplexityService._memoized(key, lambda: {"error": "timeout"})
+
+        assert cache.get(key) == {"error": "timeout"}
+
+    def test_concurrent_misses_share_fetch(self):
+        """Test a second lookup of a key being fetched waits for that fetch"""
+        key = f"test:{uuid.uuid4()}"
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            entered.set()
+            release.wait(5)
+            return {"general_info": "Boutique hotel"}
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(PerplexityService._memoized, key, fetch)
+            entered.wait(5)
+            follower = pool.submit(PerplexityService._memoized, key, fetch)
+            time.sleep(0.2)  # let the follower find the in-flight fetch
+            release.set()
+
+        assert leader.result() is follower.result()
+        assert len(calls) == 1
+        assert inflight_research == {}
+
+
+class TestAresearchHotel:
+    """Test async research coalescing"""
+
+    class CountingService(PerplexityService):
+        """Service whose uncached research sleeps instead of calling the API"""
+
+        def __init__(self):
+            self.aclient = object()
+            self.calls = 0
+
+        async def _aresearch_hotel(self, hotel_name, city, state, cache_key):
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return {"hotel": hotel_name}
+
+    def test_concurrent_calls_share_request(self):
+        """Test identical concurrent lookups make one request and share its result"""
+        service = self.CountingService()
+        hotel_name = f"Inn {uuid.uuid4()}"
+
+        async def research_twice():
+            return await asyncio.gather(
+                service.aresearch_hotel(hotel_name, "Woodstock", "NH"),
+                service.aresearch_hotel(hotel_name, "Woodstock", "NH"),
+            )
+
+        first, second = asyncio.run(research_twice())
+
+        assert first is second
+        assert service.calls == 1
+        assert ainflight_research == {}
+
+
+class TestSonarCalls:
+    """Test Perplexity calls share one request/reply path"""
+
+    class ReplyingService(PerplexityService):
+        """Service whose client returns a fixed reply and records requests"""
+
+        def __init__(self, content):
+            self.requests = []
+
+            def create(**request):
+                self.requests.append(request)
+                return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+            self.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def test_research_reply_parsed_and_scored(self):
+        """Test a research reply is parsed, scored and sent with its schema"""
+        service = self.ReplyingService(json.dumps({"address": "1 Main St", "room_types": []}))
+
+        result = service._research_hotel("Inn 32", "Woodstock", "NH")
+
+        assert result["confidence"] == pytest.approx(0.30)
+        assert service.requests[0]["response_format"]["json_schema"]["schema"] is RESEARCH_SCHEMA
+
+    def test_unparseable_replies_become_errors(self):
+        """Test non-JSON replies return error results, with the raw reply where useful"""
+        service = self.ReplyingService("Sorry, I couldn't find that hotel.")
+
+        assert service._research_hotel("Inn 32", "Woodstock", "NH") == {
+            "error": "Failed to parse response", "confidence": 0.0
+        }
+        assert service._fetch_hotel_information("Inn 32", "Inn 32 in Woodstock") == {
+            "error": "Failed to parse response", "raw_response": "Sorry, I couldn't find that hotel."
+        }
+        assert service.requests[1]["response_format"]["json_schema"]["schema"] is HOTEL_INFO_SCHEMA
+
+
+class TestCacheTimeout:
+    """Test how long research results are cached"""
+
+    @pytest.mark.parametrize("result,timeout", [
+        ({"error": "timeout", "confidence": 0.0}, HOTEL_INFO_ERROR_CACHE_TIMEOUT),
+        ({"address": "1 Main St", "confidence": 0.3}, HOTEL_INFO_CACHE_TIMEOUT),
+        ({"general_info": "Boutique hotel"}, HOTEL_INFO_CACHE_TIMEOUT),
+        ({"address": "1 Main St", "confidence": 0.8}, CONFIDENT_RESEARCH_CACHE_TIMEOUT),
+    ])
+    def test_timeouts(self, result, timeout):
+        """Test errors expire quickly and confident research is kept longest"""
+        assert PerplexityService._cache_timeout(result) == timeout
+
+
+class TestResearchHotelsBatch:
+    """Test concurrent batch research"""
+
+    class SlowService(PerplexityService):
+        """Service whose research sleeps instead of calling the API"""
+
+        def __init__(self):
+            self.in_flight = 0
+            self.peak = 0
+
+        async def aresearch_hotel(self, hotel_name, city, state=None):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if hotel_name == "broken":
+                raise RuntimeError("boom")
+            return {"hotel": hotel_name}
+
+    def test_results_in_order_with_bounded_concurrency(self):
+        """Test results keep item order and never exceed max_concurrency in flight"""
+        service = self.SlowService()
+        items = [{"hotel_name": f"Hotel {i}", "city": "Miami"} for i in range(6)]
+
+        results = asyncio.run(service.research_hotels_batch(items, max_concurrency=2))
+
+        assert results == [{"hotel": f"Hotel {i}"} for i in range(6)]
+        assert service.peak == 2
+
+    def test_exceptions_become_error_results(self):
+        """Test one failing hotel doesn't fail the batch"""
+        service = self.SlowService()
+        items = [{"hotel_name": "broken", "city": "Miami"}, {"hotel_name": "Inn 32", "city": "Woodstock"}]
+
+        results = asyncio.run(service.research_hotels_batch(items))
+
+        assert results == [{"error": "boom", "confidence": 0.0}, {"hotel": "Inn 32"}]
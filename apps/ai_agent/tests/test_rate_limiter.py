@@ -0,0 +1,48 @@
+"""
+Tests for the client-side rate limiter (no API calls)
+"""
+
+import pytest
+from apps.ai_agent.services.rate_limiter import RateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Test reservations against a refilling bucket"""
+
+    def test_burst_up_to_capacity_is_free(self):
+        """Test a full bucket serves `capacity` requests without waiting"""
+        bucket = TokenBucket(capacity=3, period=60)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_over_capacity_waits_for_refill(self):
+        """Test each request past capacity waits one more refill interval"""
+        bucket = TokenBucket(capacity=2, period=60)  # one token every 30s
+        bucket.reserve(2)
+
+        assert bucket.reserve() == pytest.approx(30, abs=0.1)
+        assert bucket.reserve() == pytest.approx(60, abs=0.1)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """Test a request larger than capacity is charged the whole bucket, not more"""
+        bucket = TokenBucket(capacity=100, period=60)
+        bucket.reserve(100)
+
+        assert bucket.reserve(500) == pytest.approx(60, abs=0.1)
+
+
+class TestRateLimiter:
+    """Test combined request and token limits"""
+
+    def test_token_limit_paces_large_requests(self):
+        """Test the token bucket can be the binding limit"""
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+
+        assert limiter.reserve(tokens=1000) == 0.0
+        assert limiter.reserve(tokens=500) == pytest.approx(30, abs=0.1)
+
+    def test_tokens_unlimited_by_default(self):
+        """Test only requests are counted without a tokens-per-minute limit"""
+        limiter = RateLimiter(requests_per_minute=100)
+
+        assert limiter.reserve(tokens=10**6) == 0.0
@@ -0,0 +1,244 @@
+"""
+Tests for Research Orchestrator - source fan-out, caching, progress and merging (no API calls)
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+from apps.ai_agent.services.research_orchestrator import PROGRESS_SAVE_DELAY, SOURCE_IDS, ResearchOrchestrator, ai_research_prompt
+
+SOURCE_DELAY = 0.2
+
+
+def slow(result):
+    """Blocking stand-in for a source client call"""
+    def call(*args, **kwargs):
+        time.sleep(SOURCE_DELAY)
+        return result
+    return call
+
+
+def aslow(result):
+    """Async stand-in for a source client call"""
+    async def call(*args, **kwargs):
+        await asyncio.sleep(SOURCE_DELAY)
+        return result
+    return call
+
+
+class SlowOrchestrator(ResearchOrchestrator):
+    """Orchestrator whose sources wait SOURCE_DELAY instead of calling APIs"""
+
+    def __init__(self, website_data=None, context=None):
+        self.context = context
+        self._progress_lock = asyncio.Lock()
+        self._progress_dirty = False
+        self._progress_flush = None
+        self._progress_tasks = set()
+        self.gemini_client = None
+        self.perplexity = SimpleNamespace(
+            research_hotel=slow({"website": "https://inn32.com", "confidence": 0.9})
+        )
+        self.google_places = SimpleNamespace(search_hotel=slow({"name": "Inn 32"}))
+        self.data_extractor = SimpleNamespace(extract_from_website=slow(website_data or {"confidence": 0.5}))
+        self._research_with_openai = aslow({"description": "Boutique inn"})
+        self._research_with_anthropic = aslow({"error": "Anthropic not configured"})
+
+
+class TestLaunchParallelResearch:
+    """Test independent sources run concurrently"""
+
+    def test_sources_overlap(self):
+        """Test the five sources take about one source's time, not the sum"""
+        orchestrator = SlowOrchestrator()
+
+        started = time.monotonic()
+        results = asyncio.run(orchestrator._launch_parallel_research("Inn 32", "Woodstock", "NH"))
+        elapsed = time.monotonic() - started
+
+        # Sources in parallel, then the website scrape: two delays, not five
+        assert elapsed < SOURCE_DELAY * 4
+        assert results["perplexity"]["confidence"] == 0.9
+        assert results["openai"] == {"description": "Boutique inn"}
+        assert results["anthropic"] == {"error": "Anthropic not configured"}
+        assert results["gemini"] == {"error": "Gemini not configured"}
+        assert results["google_places"] == {"name": "Inn 32"}
+        assert results["website"] == {"confidence": 0.5}
+
+    def test_failing_source_becomes_error_result(self):
+        """Test an exception in one source doesn't fail the others"""
+        orchestrator = SlowOrchestrator()
+
+        def broken(*args):
+            raise RuntimeError("quota exceeded")
+
+        orchestrator.google_places = SimpleNamespace(search_hotel=broken)
+
+        results = asyncio.run(orchestrator._launch_parallel_research("Inn 32", "Woodstock", "NH"))
+
+        assert results["google_places"] == {"error": "quota exceeded"}
+        assert results["openai"] == {"description": "Boutique inn"}
+
+
+class TestCached:
+    """Test per-source research caching"""
+
+    def _research(self, result):
+        calls = []
+
+        async def research(hotel_name, city, state):
+            calls.append(hotel_name)
+            return result
+
+        return research, calls
+
+    def test_repeat_lookup_served_from_cache(self):
+        """Test a hotel is researched once, whatever its capitalization and spacing"""
+        orchestrator = SlowOrchestrator()
+        research, calls = self._research({"description": "Boutique inn"})
+        hotel_name = f"Inn {uuid.uuid4()}"
+
+        first = asyncio.run(orchestrator._cached("openai", research, hotel_name, "Woodstock", "NH"))
+        second = asyncio.run(orchestrator._cached("openai", research, f" {hotel_name.upper()} ", "woodstock", "nh"))
+
+        assert first == second == {"description": "Boutique inn"}
+        assert len(calls) == 1
+
+    def test_errors_not_cached(self):
+        """Test a failed source is retried on the next run"""
+        orchestrator = SlowOrchestrator()
+        research, calls = self._research({"error": "rate limited"})
+        hotel_name = f"Inn {uuid.uuid4()}"
+
+        for _ in range(2):
+            asyncio.run(orchestrator._cached("anthropic", research, hotel_name, "Woodstock", "NH"))
+
+        assert len(calls) == 2
+
+
+class CountingContext:
+    """Stand-in for a NoraContext that counts saves"""
+
+    def __init__(self):
+        self.saves = 0
+        self.task_state = {
+            "_research_in_progress": True,
+            "_research_progress": {"sources": [{"id": source_id, "status": "pending"} for source_id in SOURCE_IDS]},
+        }
+
+    def save(self):
+        self.saves += 1
+
+
+class TestProgressSaving:
+    """Test source progress updates are saved in batches"""
+
+    def test_burst_saved_once(self):
+        """Test every source starting at once costs one save, not five"""
+        context = CountingContext()
+        orchestrator = SlowOrchestrator(context=context)
+
+        async def start_all():
+            for source_id in SOURCE_IDS:
+                await orchestrator._update_source_progress(source_id, "in_progress")
+            await asyncio.sleep(PROGRESS_SAVE_DELAY * 2)
+
+        asyncio.run(start_all())
+
+        assert context.saves == 1
+        assert all(source["status"] == "in_progress" for source in context.task_state["_research_progress"]["sources"])
+
+    def test_research_ends_with_final_save(self):
+        """Test pending progress and completion are saved before research_hotel returns"""
+        context = CountingContext()
+        orchestrator = SlowOrchestrator(context=context)
+
+        async def research(hotel_name, city, state):
+            orchestrator._report_progress("openai", "complete", data_found=["description"])
+            context.task_state["_research_in_progress"] = False
+            orchestrator._progress_dirty = True
+            return {}
+
+        async def aclose():
+            pass
+
+        orchestrator._research_hotel = research
+        orchestrator.aclose = aclose
+
+        asyncio.run(orchestrator.research_hotel("Inn 32", "Woodstock", "NH"))
+
+        assert context.saves == 1
+        assert context.task_state["_research_in_progress"] is False
+        assert orchestrator._progress_flush is None
+
+
+class TestMergeConsensus:
+    """Test consensus fields in the multi-source merge"""
+
+    def _merge(self, **sources):
+        sources = {name: sources.get(name, {}) for name in ("perplexity", "openai", "anthropic", "gemini", "google_places", "website")}
+        return SlowOrchestrator()._merge_data_multi_source(**sources)
+
+    def test_agreement_beats_authority(self):
+        """Test a value two sources agree on wins over Google Places alone"""
+        merged = self._merge(
+            google_places={"phone": "603-555-0100"},
+            openai={"phone": "603-555-0199"},
+            gemini={"phone": "603-555-0199"},
+        )
+
+        assert merged["phone"] == "603-555-0199"
+
+    def test_no_agreement_uses_authority_order(self):
+        """Test each field falls back to its own most authoritative source"""
+        merged = self._merge(
+            google_places={"name": "Inn 32", "address": "32 Main St", "website": "https://maps.example/inn32"},
+            perplexity={"hotel_name": "Inn 32 Hotel", "address": "32 Main Street", "website": "https://inn32.com"},
+            gemini={"address": "", "check_in_time": "15:00"},
+        )
+
+        assert merged["hotel_name"] == "Inn 32"
+        assert merged["address"] == "32 Main St"
+        assert merged["website"] == "https://inn32.com"
+        assert merged["check_in_time"] == "15:00"
+        assert merged["phone"] is None
+
+    def test_tie_goes_to_authority(self):
+        """Test equal agreement is settled by the more authoritative source"""
+        merged = self._merge(
+            openai={"check_out_time": "11:00"},
+            gemini={"check_out_time": "11:00"},
+            perplexity={"check_out_time": "10:00"},
+            anthropic={"check_out_time": "10:00"},
+        )
+
+        assert merged["check_out_time"] == "10:00"
+
+    def test_amenities_deduplicated_in_order(self):
+        """Test amenities from every source merge case-insensitively, first spelling kept"""
+        merged = self._merge(
+            perplexity={"amenities": ["Pool", "WiFi"]},
+            google_places={"amenities": ["wifi ", "Parking"]},
+            website={"amenities": ["pool", "Spa"]},
+        )
+
+        assert merged["amenities"] == ["Pool", "WiFi", "Parking", "Spa"]
+        assert merged["_source_amenities"] == "Aggregated from 3 sources"
+
+
+class TestAiResearchPrompt:
+    """Test the shared OpenAI/Anthropic research prompt"""
+
+    def test_fills_hotel_and_location(self):
+        """Test the hotel and location are filled in and JSON braces survive"""
+        prompt = ai_research_prompt("Inn 32", "Woodstock", "NH")
+
+        assert prompt.startswith('Research the hotel "Inn 32" in Woodstock, NH and')
+        assert '"room_types": [{"name": "...", "beds": "...", "capacity": 2}]' in prompt
+        assert ai_research_prompt("Inn 32", "Woodstock", "NH") is prompt
+
+    def test_location_without_state(self):
+        """Test a missing state leaves just the city"""
+        assert "in Lisbon and provide" in ai_research_prompt("Casa Azul", "Lisbon", None)
@@ -0,0 +1,52 @@
+"""
+Tests for the semantic response cache - matching helpers (no embedding calls)
+"""
+
+import pytest
+from apps.ai_agent.services.semantic_cache import best_match, context_chain_hash, normalize
+
+
+class TestContextChainHash:
+    """Test the hash of the turns before the newest message"""
+
+    def test_same_turns_same_hash(self):
+        """Test equal prompts and turns hash equally"""
+        turns = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}]
+
+        assert context_chain_hash("prompt", turns) == context_chain_hash("prompt", list(turns))
+
+    @pytest.mark.parametrize("prompt,turns", [
+        ("other prompt", [{"role": "user", "content": "Hi"}]),
+        ("prompt", [{"role": "assistant", "content": "Hi"}]),
+        ("prompt", [{"role": "user", "content": "Hi there"}]),
+        ("prompt", []),
+    ])
+    def test_any_difference_changes_hash(self, prompt, turns):
+        """Test prompt, role and content all feed the hash"""
+        assert context_chain_hash(prompt, turns) != context_chain_hash("prompt", [{"role": "user", "content": "Hi"}])
+
+
+class TestBestMatch:
+    """Test cosine nearest-neighbor search gated on the context chain"""
+
+    def test_picks_most_similar_entry(self):
+        """Test the highest-cosine entry with a matching context wins"""
+        entries = [
+            {"embedding": normalize([1.0, 0.0]), "context_hash": "a", "response": "first"},
+            {"embedding": normalize([1.0, 1.0]), "context_hash": "a", "response": "second"},
+        ]
+
+        entry, score = best_match(entries, normalize([1.0, 0.9]), "a")
+
+        assert entry["response"] == "second"
+        assert score == pytest.approx(0.9986, abs=1e-3)
+
+    def test_context_mismatch_never_matches(self):
+        """Test an identical vector under a different context chain is ignored"""
+        entries = [{"embedding": normalize([1.0, 0.0]), "context_hash": "a", "response": "first"}]
+
+        assert best_match(entries, normalize([1.0, 0.0]), "b") == (None, 0.0)
+
+    def test_normalize_zero_vector(self):
+        """Test a zero vector is returned unchanged instead of dividing by zero"""
+        assert normalize([0.0, 0.0]) == [0.0, 0.0]
@@ -16,6 +16,7 @@ urlpatterns = [
 
     # API endpoints - Text
     path("api/message/", views.send_message, name="send_message"),
+    path("api/message/stream/", views.send_message_stream, name="send_message_stream"),
     path("api/start-onboarding/", views.start_onboarding, name="start_onboarding"),
     path("api/process-hotel-search/", views.process_hotel_search, name="process_hotel_search"),
     path("api/accept-hotel-details/", views.accept_hotel_details, name="accept_hotel_details"),
@@ -14,6 +14,17 @@ from apps.ai_agent.services.nora_agent import NoraAgent
 from apps.ai_agent.services.voice_handler import VoiceHandler
 from apps.ai_agent.services.data_generator import DataGenerator
 
+try:
+    import orjson
+
+    json_loads = orjson.loads  # parses request.body bytes without decoding first
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 
 @login_required
 def chat_view(request):
@@ -75,7 +86,7 @@ def send_message(request):
 
     try:
         # Parse request
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         user_message = data.get("message", "").strip()
 
         if not user_message:
@@ -117,6 +128,50 @@ def send_message(request):
         )
 
 
+@login_required
+@require_http_methods(["POST"])
+def send_message_stream(request):
+    """
+    Streaming variant of send_message (Server-Sent Events).
+
+    Request:
+        {
+            "message": "User's message text"
+        }
+
+    Response (text/event-stream), one JSON object per event:
+        data: {"type": "delta", "content": "Nora's resp"}
+        data: {"type": "delta", "content": "onse"}
+        data: {"type": "done", "message": "Nora's response", "data": {...}, "action": "..."}
+    """
+    # Get user's organization
+    if not hasattr(request.user, "staff_positions") or not request.user.staff_positions.exists():
+        return JsonResponse({"error": "No organization associated with user"}, status=403)
+
+    staff = request.user.staff_positions.first()
+    organization = staff.organization
+
+    try:
+        data = json_loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    user_message = data.get("message", "").strip()
+    if not user_message:
+        return JsonResponse({"error": "Message cannot be empty"}, status=400)
+
+    agent = NoraAgent(user=request.user, organization=organization)
+    events = (
+        f"data: {json_dumps(event)}\n\n"
+        for event in agent.process_message_stream(user_message)
+    )
+
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Don't let nginx buffer the stream
+    return response
+
+
 @login_required
 @require_http_methods(["POST"])
 def start_onboarding(request):
@@ -156,8 +211,9 @@ def process_hotel_search(request):
     Process initial hotel search from Google Places + Perplexity research.
 
     This endpoint is called immediately after Google Places finds the hotel.
-    It saves the data and calls Perplexity, then returns a conversational
-    address confirmation message.
+    It saves the data and starts Perplexity research in the background, then
+    returns a conversational address confirmation message. The research is
+    collected when the user confirms the address.
 
     Request body:
         {
@@ -169,8 +225,7 @@ def process_hotel_search(request):
 
     Response:
         {
-            "address_message": "Got it, I have that address as...",
-            "perplexity_data": {...}
+            "address_message": "Got it, I have that address as..."
         }
     """
     if not hasattr(request.user, "staff_positions") or not request.user.staff_positions.exists():
@@ -180,13 +235,11 @@ def process_hotel_search(request):
     organization = staff.organization
 
     try:
-        import json
-        data = json.loads(request.body)
+        data = json_loads(request.body)
 
         # Initialize Nora agent
         agent = NoraAgent(user=request.user, organization=organization)
         from apps.ai_agent.services.conversation_engine import OnboardingEngine
-        from apps.ai_agent.services.perplexity_service import PerplexityService
 
         # Save Google Places data to task_state
         update_data = {
@@ -221,30 +274,23 @@ def process_hotel_search(request):
 
         agent.context.task_state.update(update_data)
 
-        # Call Perplexity for hotel research (in parallel conceptually)
-        perplexity = PerplexityService()
-        hotel_info = perplexity.get_hotel_information(
+        # Research the hotel with Perplexity while the user reads the address;
+        # collected when they confirm it
+        agent.prefetch_hotel_information(
             hotel_name=data.get("hotel_name"),
             location=data.get("city")
         )
 
-        # Store Perplexity data temporarily (will be confirmed later)
-        if "error" not in hotel_info:
-            agent.context.task_state["_perplexity_pending"] = hotel_info
-
-        agent.context.save()
-
-        # Log the action
-        agent.context.add_action("google_places_found", data)
-        if "error" not in hotel_info:
-            agent.context.add_action("perplexity_research_pending", hotel_info)
+        # Save the state and its action log in one UPDATE
+        with agent.context.batch_saves():
+            agent.context.save()
+            agent.context.add_action("google_places_found", data)
 
         # Generate conversational address confirmation message
         address_message = f"Got it! I found {data.get('hotel_name')} at {data.get('full_address')}. Is that correct?"
 
         return JsonResponse({
-            "address_message": address_message,
-            "perplexity_data": hotel_info if "error" not in hotel_info else None
+            "address_message": address_message
         })
 
     except Exception as e:
@@ -296,13 +342,11 @@ def accept_hotel_details(request):
     organization = staff.organization
 
     try:
-        import json
-        data = json.loads(request.body)
+        data = json_loads(request.body)
 
         # Initialize Nora agent
         agent = NoraAgent(user=request.user, organization=organization)
-        from apps.ai_agent.services.conversation_engine import OnboardingEngine
-        from apps.ai_agent.services.perplexity_service import PerplexityService
+        from apps.ai_agent.services.perplexity_service import get_perplexity_service
 
         # Update task_state with hotel details from Google Places
         agent.context.task_state.update({
@@ -323,8 +367,7 @@ def accept_hotel_details(request):
         })
 
         # Enrich with Perplexity AI research (web-grounded hotel information)
-        perplexity = PerplexityService()
-        hotel_info = perplexity.get_hotel_information(
+        hotel_info = get_perplexity_service().get_hotel_information(
             hotel_name=data.get("hotel_name"),
             location=data.get("city")
         )
@@ -341,16 +384,15 @@ def accept_hotel_details(request):
                 "notable_facts": hotel_info.get("notable_facts"),
             })
 
-        # Save updated context
-        agent.context.save()
-
-        # Log the action
-        agent.context.add_action("google_places_accepted", data)
-        if "error" not in hotel_info:
-            agent.context.add_action("perplexity_research_complete", hotel_info)
+        # Save updated context and its action logs in one UPDATE
+        with agent.context.batch_saves():
+            agent.context.save()
+            agent.context.add_action("google_places_accepted", data)
+            if "error" not in hotel_info:
+                agent.context.add_action("perplexity_research_complete", hotel_info)
 
         # Check what's still missing
-        engine = OnboardingEngine(agent.context.task_state)
+        engine = agent.get_engine()
         missing = engine.get_missing_fields()
 
         # Generate appropriate message based on what's missing
@@ -489,7 +531,7 @@ def generate_voice(request):
 
     try:
         # Parse request
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         text = data.get("text", "").strip()
 
         if not text:
@@ -647,7 +689,7 @@ def save_payment_policy(request):
     organization = staff.organization
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         deposit_amount = data.get("deposit_amount")
         deposit_timing = data.get("deposit_timing")
         balance_timing = data.get("balance_timing")
@@ -717,7 +759,7 @@ def save_cancellation_policy(request):
     organization = staff.organization
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         policy = data.get("cancellation_policy")
         fee = data.get("cancellation_fee", 0)
 
@@ -784,7 +826,7 @@ def save_checkin_times(request):
     organization = staff.organization
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         checkin = data.get("checkin_time")
         checkout = data.get("checkout_time")
 
@@ -813,7 +855,7 @@ def generate_policy_preview(request):
     Used for real-time updates in edit modals.
     """
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         preview_type = data.get("type")  # 'payment' or 'cancellation'
 
         from apps.ai_agent.services.content_formatter import ContentFormatter
@@ -866,8 +908,7 @@ def get_progress(request):
     agent = NoraAgent(user=request.user, organization=organization)
 
     if agent.context.active_task == 'onboarding':
-        from apps.ai_agent.services.conversation_engine import OnboardingEngine
-        engine = OnboardingEngine(agent.context.task_state)
+        engine = agent.get_engine()
         progress_data = engine.get_progress_data()
 
         return render(request, "ai_agent/partials/progress_tracker.html", {'progress': progress_data})
@@ -895,7 +936,7 @@ def accept_field(request):
     organization = staff.organization
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         field = data.get("field")
         value = data.get("value")
 
@@ -909,10 +950,10 @@ def accept_field(request):
         if field not in agent.context.task_state["_confirmed_fields"]:
             agent.context.task_state["_confirmed_fields"].append(field)
 
-        agent.context.save()
-
-        # Log the action
-        agent.context.add_action("field_accepted", {"field": field, "value": value})
+        # Save the state and its action log in one UPDATE
+        with agent.context.batch_saves():
+            agent.context.save()
+            agent.context.add_action("field_accepted", {"field": field, "value": value})
 
         # Human-friendly field names
         human_friendly = {
@@ -960,7 +1001,7 @@ def update_field(request):
     organization = staff.organization
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         field = data.get("field")
         value = data.get("value")
 
@@ -983,14 +1024,14 @@ def update_field(request):
         if field not in agent.context.task_state["_confirmed_fields"]:
             agent.context.task_state["_confirmed_fields"].append(field)
 
-        agent.context.save()
-
-        # Log the action
-        agent.context.add_action("field_updated", {
-            "field": field,
-            "old_value": old_value,
-            "new_value": value
-        })
+        # Save the state and its action log in one UPDATE
+        with agent.context.batch_saves():
+            agent.context.save()
+            agent.context.add_action("field_updated", {
+                "field": field,
+                "old_value": old_value,
+                "new_value": value
+            })
 
         # Generate friendly field name
         field_name = field.replace('_', ' ').title()
@@ -1060,12 +1101,13 @@ def complete_onboarding(request):
         hotel = result['hotel']
 
         # Mark onboarding as complete (clear task_state now that hotel is generated)
-        agent.context.task_state['hotel_id'] = str(hotel.id)
-        agent.context.task_state['onboarding_completed_at'] = timezone.now().isoformat()
-        agent.context.save()
+        with agent.context.batch_saves():
+            agent.context.task_state['hotel_id'] = str(hotel.id)
+            agent.context.task_state['onboarding_completed_at'] = timezone.now().isoformat()
+            agent.context.save()
 
-        # NOW clear the task (hotel is safely in database)
-        agent.context.complete_task()
+            # NOW clear the task (hotel is safely in database)
+            agent.context.complete_task()
 
         # Construct hotel URL (in production, would use actual domain)
         hotel_url = f"https://{hotel.slug}.stayfull.com"  # Placeholder
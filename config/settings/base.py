@@ -157,3 +157,21 @@ FIELD_ENCRYPTION_KEY = env("FIELD_ENCRYPTION_KEY")
 OPENAI_API_KEY = env("OPENAI_API_KEY", default="")
 GOOGLE_PLACES_API_KEY = env("GOOGLE_PLACES_API_KEY", default="")
 PERPLEXITY_API_KEY = env("PERPLEXITY_API_KEY", default="")
+
+# Model for Nora's address classification and data extraction calls
+NORA_CLASSIFIER_MODEL = env("NORA_CLASSIFIER_MODEL", default="gpt-4o-mini")
+
+# Reuse Nora's general conversation replies for near-duplicate questions
+NORA_SEMANTIC_CACHE_ENABLED = env.bool("NORA_SEMANTIC_CACHE_ENABLED", default=True)
+
+# Client-side pacing for Perplexity, kept just under the account's limits
+# (per process). Tokens per minute is unlimited unless set.
+PERPLEXITY_REQUESTS_PER_MINUTE = env.int("PERPLEXITY_REQUESTS_PER_MINUTE", default=50)
+PERPLEXITY_TOKENS_PER_MINUTE = env.int("PERPLEXITY_TOKENS_PER_MINUTE", default=0)
+
+# The same pacing for the OpenAI and Anthropic calls in multi-source hotel
+# research, shared by concurrent onboardings in a process
+OPENAI_RESEARCH_REQUESTS_PER_MINUTE = env.int("OPENAI_RESEARCH_REQUESTS_PER_MINUTE", default=500)
+OPENAI_RESEARCH_TOKENS_PER_MINUTE = env.int("OPENAI_RESEARCH_TOKENS_PER_MINUTE", default=0)
+ANTHROPIC_RESEARCH_REQUESTS_PER_MINUTE = env.int("ANTHROPIC_RESEARCH_REQUESTS_PER_MINUTE", default=50)
+ANTHROPIC_RESEARCH_TOKENS_PER_MINUTE = env.int("ANTHROPIC_RESEARCH_TOKENS_PER_MINUTE", default=0)